@@ -0,0 +1,297 @@
+# Importando bibliotecas
+import os
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import numpy as np
+
+# Formato do pacote de assets (um único arquivo):
+#   cabeçalho: magic (8 bytes) + versão (uint32) + número de entradas (uint32) + tamanho do índice (uint64)
+#   índice: por entrada, tipo (uint8) + tamanho do nome (uint16) + offset (uint64)
+#           + tamanho (uint64) + hash (16 bytes) + nome em UTF-8
+#   dados: blobs alinhados em ALIGNMENT bytes, lidos sem cópia via mmap
+MAGIC = b"SSPACK01"
+VERSION = 1
+ALIGNMENT = 64
+
+# Pacote aberto por padrão (vazio: apenas arquivos soltos)
+ASSET_PACK = os.environ.get("SOLAR_SYSTEM_ASSET_PACK", "")
+
+_HEADER = struct.Struct("<8sIIQ")
+_ENTRY = struct.Struct("<BHQQ16s")
+_TEXTURE_HEADER = struct.Struct("<II")
+
+ASSET_SHADER = 1    # código-fonte GLSL
+ASSET_TEXTURE = 2   # largura, altura + pixels RGBA já decodificados (de baixo para cima)
+ASSET_VERTICES = 3  # vértices no formato model_vertex_dtype
+ASSET_INDICES = 4   # índices uint32
+ASSET_MODEL = 5     # manifesto JSON do modelo (malhas e texturas)
+
+ASSET_TYPES = {
+    ASSET_SHADER: "shader", ASSET_TEXTURE: "textura", ASSET_VERTICES: "vértices",
+    ASSET_INDICES: "índices", ASSET_MODEL: "modelo",
+}
+
+
+def asset_name(path: str) -> str:
+    """
+    Nome de um arquivo dentro do pacote: caminho relativo ao diretório atual,
+    normalizado com '/' (o mesmo usado pelo construtor).
+    """
+    return os.path.normpath(os.path.relpath(path)).replace(os.sep, "/")
+
+
+def content_hash(data) -> bytes:
+    """Hash de 16 bytes do conteúdo de uma entrada."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class PackEntry:
+    """Entrada do índice do pacote."""
+
+    def __init__(self, kind: int, offset: int, length: int, digest: bytes):
+        self.kind = kind
+        self.offset = offset
+        self.length = length
+        self.digest = digest
+
+
+class AssetPackWriter:
+    """
+    Monta um pacote de assets: os blobs são acumulados e o arquivo é
+    escrito de uma vez em close(), com o índice no começo.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Caminho do pacote gerado.
+        """
+        self.path = path
+        self.entries: list[tuple[str, int, bytes]] = []
+        self.names: set = set()
+
+    def add(self, name: str, kind: int, data):
+        """
+        Adiciona uma entrada.
+
+        :param name: Nome da entrada (ver asset_name).
+        :param kind: Tipo (ASSET_*).
+        :param data: Conteúdo (bytes ou array NumPy contíguo).
+        """
+        if name in self.names:
+            raise ValueError(f"Entrada duplicada no pacote: {name}")
+        self.names.add(name)
+        self.entries.append((name, kind, data.tobytes() if isinstance(data, np.ndarray) else bytes(data)))
+
+    def add_shader(self, path: str):
+        """Adiciona o código-fonte de um shader."""
+        with open(path, "rb") as file:
+            self.add(asset_name(path), ASSET_SHADER, file.read())
+
+    def add_texture(self, path: str):
+        """Decodifica uma imagem uma única vez e guarda os pixels RGBA prontos para o upload."""
+        from PIL import Image
+        with Image.open(path) as image:
+            image = image.convert("RGBA")
+            pixels = image.tobytes("raw", "RGBA", 0, -1)
+            self.add(asset_name(path), ASSET_TEXTURE, _TEXTURE_HEADER.pack(image.width, image.height) + pixels)
+
+    def add_model(self, path: str, meshes: list):
+        """
+        Adiciona as malhas já processadas de um modelo e o manifesto que as liga às texturas.
+
+        :param path: Caminho do arquivo do modelo.
+        :param meshes: Lista de (vértices, índices, [(caminho da textura, tipo)]).
+        """
+        name = asset_name(path)
+        manifest = []
+        for i, (vertices, indices, textures) in enumerate(meshes):
+            self.add(f"{name}#{i}.vertices", ASSET_VERTICES, vertices)
+            self.add(f"{name}#{i}.indices", ASSET_INDICES, indices.astype(np.uint32))
+            for texture, _ in textures:
+                if asset_name(texture) not in self.names:
+                    self.add_texture(texture)
+            manifest.append({
+                "vertices": f"{name}#{i}.vertices",
+                "indices": f"{name}#{i}.indices",
+                "textures": [[asset_name(texture), kind] for texture, kind in textures],
+            })
+        self.add(name, ASSET_MODEL, json.dumps({"meshes": manifest}).encode("utf-8"))
+
+    def close(self) -> int:
+        """
+        Escreve o pacote (em um arquivo temporário renomeado no final).
+
+        :return: Tamanho do arquivo em bytes.
+        """
+        encoded = [(name.encode("utf-8"), kind, data) for name, kind, data in self.entries]
+        index_size = sum(_ENTRY.size + len(name) for name, _, _ in encoded)
+        offset = _align(_HEADER.size + index_size)
+
+        index = bytearray()
+        layout = []
+        for name, kind, data in encoded:
+            index += _ENTRY.pack(kind, len(name), offset, len(data), content_hash(data)) + name
+            layout.append((offset, data))
+            offset = _align(offset + len(data))
+
+        # Nome temporário por processo: duas gerações simultâneas não se sobrepõem
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, len(encoded), index_size))
+            file.write(index)
+            for position, data in layout:
+                file.write(b"\0" * (position - file.tell()))
+                file.write(data)
+        os.replace(temporary, self.path)
+        return os.path.getsize(self.path)
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class AssetPack:
+    """
+    Pacote de assets aberto com mmap: o índice é lido na abertura e cada
+    entrada é exposta como memoryview sobre o mapeamento, sem cópia. As
+    páginas só são lidas do disco quando o conteúdo é usado.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Caminho do pacote.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, count, index_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Pacote de assets inválido: {path}")
+        self.entries: dict[str, PackEntry] = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            kind, name_size, data_offset, length, digest = _ENTRY.unpack_from(self._map, offset)
+            offset += _ENTRY.size
+            name = bytes(self._map[offset:offset + name_size]).decode("utf-8")
+            offset += name_size
+            self.entries[name] = PackEntry(kind, data_offset, length, digest)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def find(self, name: str, kind: int) -> PackEntry:
+        """Retorna a entrada com o nome e o tipo informados, ou None."""
+        entry = self.entries.get(name)
+        return entry if entry is not None and entry.kind == kind else None
+
+    def view(self, entry: PackEntry) -> memoryview:
+        """Conteúdo da entrada, sem cópia."""
+        return self._view[entry.offset:entry.offset + entry.length]
+
+    def verify(self) -> list[str]:
+        """
+        Confere o hash de todas as entradas (lê o pacote inteiro).
+
+        :return: Nomes das entradas corrompidas.
+        """
+        return [name for name, entry in self.entries.items() if content_hash(self.view(entry)) != entry.digest]
+
+    def close(self):
+        """Fecha o mapeamento (os arrays criados a partir dele não podem mais ser usados)."""
+        self._view.release()
+        self._map.close()
+
+
+class AssetSource:
+    """
+    Origem dos assets usada por Shader, utils.load_texture e Model: procura
+    primeiro no pacote aberto e, se não houver pacote ou o arquivo não
+    estiver nele, lê o arquivo solto do disco.
+    """
+
+    def __init__(self):
+        self.pack: AssetPack = None
+        self.hits = {kind: 0 for kind in ASSET_TYPES}
+        self.misses = 0
+        self.bytes_mapped = 0
+
+    def open(self, path: str):
+        """
+        Abre o pacote de assets.
+
+        :param path: Caminho do pacote.
+        """
+        self.pack = AssetPack(path)
+        logging.info("Pacote de assets: %s (%d entradas)", path, len(self.pack.entries))
+
+    def _lookup(self, path: str, kind: int) -> memoryview:
+        if self.pack is None:
+            return None
+        entry = self.pack.find(asset_name(path), kind)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits[kind] += 1
+        self.bytes_mapped += entry.length
+        return self.pack.view(entry)
+
+    def read_text(self, path: str) -> str:
+        """Lê um arquivo de texto (shaders) do pacote ou do disco."""
+        data = self._lookup(path, ASSET_SHADER)
+        if data is not None:
+            return str(data, "utf-8")
+        with open(path, "r") as file:
+            return file.read()
+
+    def texture(self, path: str):
+        """
+        Pixels de uma textura pré-decodificada no pacote.
+
+        :return: Largura, altura e os pixels RGBA (array uint8 sobre o mmap), ou None.
+        """
+        data = self._lookup(path, ASSET_TEXTURE)
+        if data is None:
+            return None
+        width, height = _TEXTURE_HEADER.unpack_from(data, 0)
+        return width, height, np.frombuffer(data, dtype=np.uint8, offset=_TEXTURE_HEADER.size)
+
+    def model(self, path: str, vertex_dtype: np.dtype):
+        """
+        Malhas de um modelo guardado no pacote.
+
+        :param path: Caminho do arquivo do modelo.
+        :param vertex_dtype: Formato dos vértices gravados.
+        :return: Lista de (vértices, índices, [(caminho da textura, tipo)]) com
+                 arrays somente leitura sobre o mmap, ou None.
+        """
+        data = self._lookup(path, ASSET_MODEL)
+        if data is None:
+            return None
+        meshes = []
+        for mesh in json.loads(str(data, "utf-8"))["meshes"]:
+            vertices = self.pack.view(self.pack.find(mesh["vertices"], ASSET_VERTICES))
+            indices = self.pack.view(self.pack.find(mesh["indices"], ASSET_INDICES))
+            self.bytes_mapped += len(vertices) + len(indices)
+            meshes.append((np.frombuffer(vertices, dtype=vertex_dtype),
+                           np.frombuffer(indices, dtype=np.uint32),
+                           [(texture, kind) for texture, kind in mesh["textures"]]))
+        return meshes
+
+    def report(self) -> str:
+        """Entradas lidas do pacote e arquivos que precisaram ser lidos soltos."""
+        if self.pack is None:
+            return "Assets: arquivos soltos (sem pacote)"
+        hits = ", ".join(f"{self.hits[kind]} {name}" for kind, name in ASSET_TYPES.items()
+                         if kind in (ASSET_SHADER, ASSET_TEXTURE, ASSET_MODEL))
+        return (f"Assets: {hits} do pacote {self.pack.path} "
+                f"({self.bytes_mapped / (1024 * 1024):.1f} MB mapeados), {self.misses} arquivos soltos")
+
+
+# Origem de assets compartilhada
+assets = AssetSource()
@@ -21,6 +21,9 @@ class Camera:
     Classe que simula uma câmera para o sistema solar, processando entradas
     do teclado e do mouse e atualizando os vetores de orientação.
     """
+    __slots__ = ("Position", "WorldUp", "Yaw", "Pitch", "Front", "Right", "Up",
+                 "MovementSpeed", "MouseSensitivity", "Zoom")
+
     def __init__(self, 
                  position: glm.vec3 = glm.vec3(0.0, 0.0, 0.0), 
                  up: glm.vec3 = glm.vec3(0.0, 1.0, 0.0), 
@@ -89,6 +92,17 @@ class Camera:
         self.Zoom -= yoffset
         self.Zoom = max(min(self.Zoom, 45.0), 1.0)
 
+    def look_at(self, target: glm.vec3):
+        """
+        Orienta a câmera para um ponto, recalculando Yaw e Pitch.
+
+        :param target: Ponto em coordenadas de mundo.
+        """
+        direction = glm.normalize(target - self.Position)
+        self.Pitch = glm.degrees(glm.asin(max(min(direction.y, 1.0), -1.0)))
+        self.Yaw = glm.degrees(glm.atan(direction.z, direction.x))
+        self.update_camera_vectors()
+
     def update_camera_vectors(self):
         """
         Atualiza os vetores da câmera com base nos ângulos de Euler (Yaw e Pitch).
@@ -0,0 +1,234 @@
+# Importando bibliotecas
+import os
+import time
+import ctypes
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+import numpy as np
+from OpenGL.GL import *
+from asserts.frame_files import CAPTURE_FORMATS, frame_path
+
+
+def _write_frame(shm_name: str, width: int, height: int, path: str, fmt: str) -> str:
+    """
+    Executada nos processos de trabalho: lê o frame da memória compartilhada
+    e grava em disco como PNG ou como dump RGBA bruto.
+    """
+    # O bloco pertence ao processo principal, que é quem faz o unlink no final
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        pixels = np.ndarray((height, width, 4), dtype=np.uint8, buffer=shm.buf)
+        # O OpenGL lê de baixo para cima
+        frame = pixels[::-1]
+        if fmt == "png":
+            from PIL import Image
+            Image.fromarray(frame, "RGBA").save(path, compress_level=1)
+        else:
+            with open(path, "wb") as file:
+                file.write(frame.tobytes())
+        del pixels, frame
+    finally:
+        shm.close()
+    return path
+
+
+class FrameCapture:
+    """
+    Captura os frames renderizados sem travar o pipeline: a leitura é feita
+    de forma assíncrona em um anel de Pixel Buffer Objects protegidos por
+    fences, e a codificação acontece em um pool de processos.
+    """
+
+    def __init__(self, width: int, height: int, output_dir: str, fmt: str = "png",
+                 ring_size: int = 3, workers: int = 2, max_pending: int = 8):
+        """
+        :param width: Largura do frame capturado.
+        :param height: Altura do frame capturado.
+        :param output_dir: Diretório de saída da sequência de frames.
+        :param fmt: Formato de saída ("png" ou "raw").
+        :param ring_size: Número de PBOs no anel de leitura.
+        :param workers: Número de processos de codificação.
+        :param max_pending: Frames aguardando gravação antes de descartar (back-pressure).
+        """
+        if fmt not in CAPTURE_FORMATS:
+            raise ValueError(f"Formato de captura inválido: {fmt}")
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.ring_size = ring_size
+        self.max_pending = max_pending
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Anel de PBOs; in_flight guarda (pbo, índice do frame, fence) das leituras pendentes
+        self.pbos = []
+        self.in_flight: deque = deque()
+        self.next_pbo = 0
+        # Blocos de memória compartilhada entregues aos processos de codificação;
+        # generation invalida devoluções de blocos de um tamanho de frame anterior
+        self.slots = []
+        self.slot_views = []
+        self.free_slots: deque = deque()
+        self.pending: set = set()
+        self.generation = 0
+        self._allocate(width, height)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+
+        # Estatísticas
+        self.captured = 0
+        self.written = 0
+        self.dropped_gpu = 0       # anel de PBOs cheio: a GPU ainda não terminou a leitura
+        self.dropped_encoder = 0   # codificadores atrasados: nenhum bloco livre
+        self.dropped_resize = 0    # framebuffer vazio: janela minimizada
+        self.overhead: list[float] = []
+
+    def _allocate(self, width: int, height: int):
+        """
+        Cria os PBOs e os blocos de memória compartilhada para frames do tamanho dado.
+        """
+        self.width = width
+        self.height = height
+        self.frame_bytes = width * height * 4
+        for _ in range(self.ring_size):
+            pbo = glGenBuffers(1)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.frame_bytes, None, GL_STREAM_READ)
+            self.pbos.append(pbo)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.next_pbo = 0
+
+        self.slots = [shared_memory.SharedMemory(create=True, size=self.frame_bytes)
+                      for _ in range(self.max_pending)]
+        self.slot_views = [np.ndarray((self.frame_bytes,), dtype=np.uint8, buffer=shm.buf)
+                           for shm in self.slots]
+        self.free_slots = deque(range(self.max_pending))
+
+    def _release(self):
+        """
+        Termina as leituras e gravações pendentes e libera os PBOs e os blocos
+        de memória compartilhada do tamanho atual.
+        """
+        # Espera a GPU terminar as leituras pendentes (até 1 s por fence)
+        while self.in_flight:
+            antes = len(self.in_flight)
+            self._harvest(timeout_ns=1_000_000_000)
+            if len(self.in_flight) == antes:
+                _, _, fence = self.in_flight.popleft()
+                glDeleteSync(fence)
+                self.dropped_gpu += 1
+        # Os blocos só podem ser desfeitos depois que os codificadores os leram
+        wait(list(self.pending))
+        self.generation += 1
+        self.slot_views = []
+        for shm in self.slots:
+            shm.close()
+            shm.unlink()
+        self.slots = []
+        self.free_slots = deque()
+        glDeleteBuffers(len(self.pbos), self.pbos)
+        self.pbos = []
+
+    def capture(self, frame_index: int, width: int, height: int):
+        """
+        Agenda a leitura do back buffer atual e entrega os frames já prontos
+        aos codificadores. Deve ser chamada antes de swap_buffers.
+
+        :param frame_index: Número do frame (usado no nome do arquivo).
+        :param width: Largura atual do framebuffer.
+        :param height: Altura atual do framebuffer.
+        """
+        inicio = time.perf_counter()
+        if (width, height) != (self.width, self.height):
+            # A janela mudou de tamanho: os frames já lidos são gravados no
+            # tamanho antigo e o anel é refeito para o novo
+            if width <= 0 or height <= 0:
+                self.dropped_resize += 1
+                self.overhead.append(time.perf_counter() - inicio)
+                return
+            logging.info("Captura: framebuffer %dx%d -> %dx%d", self.width, self.height, width, height)
+            self._release()
+            self._allocate(width, height)
+        self._harvest()
+
+        if len(self.in_flight) == len(self.pbos):
+            self.dropped_gpu += 1
+        else:
+            pbo = self.pbos[self.next_pbo]
+            self.next_pbo = (self.next_pbo + 1) % len(self.pbos)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glReadBuffer(GL_BACK)
+            glPixelStorei(GL_PACK_ALIGNMENT, 1)
+            glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+            fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+            self.in_flight.append((pbo, frame_index, fence))
+            self.captured += 1
+
+        self.overhead.append(time.perf_counter() - inicio)
+
+    def _harvest(self, timeout_ns: int = 0):
+        """
+        Copia para a memória compartilhada os PBOs cujas fences já sinalizaram.
+
+        :param timeout_ns: Tempo máximo de espera por fence (0 = não bloqueia).
+        """
+        while self.in_flight:
+            pbo, frame_index, fence = self.in_flight[0]
+            status = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, timeout_ns)
+            if status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                return
+            self.in_flight.popleft()
+            glDeleteSync(fence)
+
+            if not self.free_slots:
+                self.dropped_encoder += 1
+                continue
+            slot = self.free_slots.popleft()
+
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            ptr = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self.frame_bytes, GL_MAP_READ_BIT)
+            if ptr:
+                ctypes.memmove(self.slot_views[slot].ctypes.data, ptr, self.frame_bytes)
+                glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+            if not ptr:
+                self.free_slots.append(slot)
+                self.dropped_encoder += 1
+                continue
+
+            path = frame_path(self.output_dir, frame_index, self.fmt)
+            future = self.executor.submit(_write_frame, self.slots[slot].name,
+                                          self.width, self.height, path, self.fmt)
+            # Só a thread de render mexe no conjunto; os concluídos saem aqui
+            self.pending = {f for f in self.pending if not f.done()}
+            self.pending.add(future)
+            future.add_done_callback(lambda f, s=slot, g=self.generation: self._on_written(f, s, g))
+
+    def _on_written(self, future, slot: int, generation: int):
+        """Devolve o bloco de memória ao anel quando o frame foi gravado."""
+        # Blocos de antes de uma troca de tamanho já foram desfeitos
+        if generation == self.generation:
+            self.free_slots.append(slot)
+        if future.exception() is None:
+            self.written += 1
+        else:
+            logging.error("Falha ao gravar frame: %s", future.exception())
+
+    def close(self):
+        """
+        Aguarda as leituras pendentes, finaliza os codificadores e libera os recursos.
+        """
+        self._release()
+        self.executor.shutdown(wait=True)
+
+    def report(self) -> str:
+        """
+        Gera um resumo da captura: frames gravados, descartados e custo na thread de render.
+        """
+        overhead = np.array(self.overhead or [0.0]) * 1000.0
+        return (f"Captura: {self.written} frames gravados em {self.output_dir} "
+                f"({self.captured} lidos, {self.dropped_gpu} descartados por GPU ocupada, "
+                f"{self.dropped_encoder} descartados por back-pressure, "
+                f"{self.dropped_resize} descartados com a janela minimizada), "
+                f"custo na thread de render: média {overhead.mean():.3f} ms, "
+                f"p95 {np.percentile(overhead, 95):.3f} ms, máx {overhead.max():.3f} ms")
@@ -0,0 +1,20 @@
+# Importando bibliotecas
+import os
+
+# Nada de OpenGL aqui: o render farm usa estes nomes antes de escolher a plataforma
+CAPTURE_FORMATS = ("png", "raw")
+
+# O formato "raw" é gravado como dump RGBA de 8 bits por canal
+_EXTENSIONS = {"png": "png", "raw": "rgba"}
+
+
+def frame_path(directory: str, frame_index: int, fmt: str) -> str:
+    """
+    Caminho do arquivo de um frame, o mesmo na captura interativa e no render farm.
+
+    :param directory: Diretório da sequência de frames.
+    :param frame_index: Número do frame.
+    :param fmt: Formato de saída ("png" ou "raw").
+    :return: Caminho do arquivo.
+    """
+    return os.path.join(directory, f"frame_{frame_index:06d}.{_EXTENSIONS[fmt]}")
@@ -0,0 +1,93 @@
+# Importando bibliotecas
+import os
+import ctypes
+
+
+def configure_headless_environment(software_threads: int = 1):
+    """
+    Configura as variáveis de ambiente para um contexto OpenGL sem janela
+    (EGL sem superfície, com o llvmpipe do Mesa quando não há GPU).
+    Precisa ser chamada antes do primeiro import de OpenGL no processo.
+
+    :param software_threads: Threads de rasterização do llvmpipe por processo
+                             (1 para escalar com vários processos).
+    """
+    os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+    os.environ.setdefault("LP_NUM_THREADS", str(software_threads))
+
+
+class HeadlessContext:
+    """
+    Contexto OpenGL 3.3 core sem janela (EGL) com um framebuffer próprio do
+    tamanho pedido, usado na renderização offline.
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        :param width: Largura do framebuffer.
+        :param height: Altura do framebuffer.
+        """
+        from OpenGL import EGL
+        from OpenGL.GL import (glGenFramebuffers, glBindFramebuffer, glGenRenderbuffers,
+                               glBindRenderbuffer, glRenderbufferStorage, glFramebufferRenderbuffer,
+                               glCheckFramebufferStatus, GL_FRAMEBUFFER, GL_RENDERBUFFER, GL_RGBA8,
+                               GL_DEPTH_COMPONENT24, GL_COLOR_ATTACHMENT0, GL_DEPTH_ATTACHMENT,
+                               GL_FRAMEBUFFER_COMPLETE)
+
+        self.width = width
+        self.height = height
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("Falha ao inicializar o EGL")
+
+        attributes = (EGL.EGLint * 7)(EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                                      EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+                                      EGL.EGL_DEPTH_SIZE, 24, EGL.EGL_NONE)
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        if not EGL.eglChooseConfig(self.display, attributes, ctypes.pointer(config), 1,
+                                   ctypes.pointer(count)) or count.value == 0:
+            raise RuntimeError("Nenhuma configuração EGL compatível com OpenGL")
+
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context_attributes = (EGL.EGLint * 7)(
+            EGL.EGL_CONTEXT_MAJOR_VERSION, 3, EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+            EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT, EGL.EGL_NONE)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, context_attributes)
+        if not self.context:
+            raise RuntimeError("Falha ao criar o contexto OpenGL 3.3 via EGL")
+        if not EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, self.context):
+            raise RuntimeError("Falha ao ativar o contexto EGL sem superfície")
+
+        # Framebuffer de cor e profundidade no lugar da janela
+        self.fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        self.color, self.depth = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("Framebuffer offline incompleto")
+
+    def read_pixels(self):
+        """
+        Lê o framebuffer como array (altura, largura, 4), de cima para baixo.
+        """
+        import numpy as np
+        from OpenGL.GL import glReadPixels, glPixelStorei, GL_PACK_ALIGNMENT, GL_RGBA, GL_UNSIGNED_BYTE
+
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE)
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 4)[::-1]
+
+    def release(self):
+        """Destrói o contexto."""
+        from OpenGL import EGL
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglTerminate(self.display)
@@ -0,0 +1,55 @@
+# Importando bibliotecas
+import os
+import gc
+
+
+def resident_set_size() -> int:
+    """
+    Memória residente (RSS) do processo em bytes. Lê /proc/self/statm no
+    Linux; nos demais sistemas usa o pico de getrusage, que é só uma aproximação.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss vem em bytes no macOS e em KB nos demais
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryReport:
+    """
+    Marcações da memória residente em pontos da execução (por exemplo,
+    antes e depois de carregar a cena inteira).
+    """
+
+    def __init__(self):
+        self.marks: list[tuple[str, int]] = []
+
+    def mark(self, label: str) -> int:
+        """
+        Registra o RSS atual, depois de uma coleta de lixo para não contar
+        objetos que já não são usados.
+
+        :param label: Nome do ponto da execução.
+        :return: RSS em bytes.
+        """
+        gc.collect()
+        rss = resident_set_size()
+        self.marks.append((label, rss))
+        return rss
+
+    def report(self) -> str:
+        """RSS em cada marcação e a diferença entre a primeira e a última."""
+        mb = 1024.0 * 1024.0
+        if not self.marks:
+            return "Memória: nenhuma marcação"
+        parts = [f"{label} {rss / mb:.1f} MB" for label, rss in self.marks]
+        growth = self.marks[-1][1] - self.marks[0][1]
+        return f"Memória residente: {', '.join(parts)} (variação {growth / mb:+.1f} MB)"
+
+
+# Relatório compartilhado pelo programa principal e pelos benchmarks
+memory_report = MemoryReport()
@@ -1,7 +1,14 @@
 # Importando bibliotecas
+import os
 import numpy as np
 import ctypes
 from OpenGL.GL import *
+from asserts.startup import startup_profiler
+from asserts.resources import gpu_resources
+
+# Modo de pouca memória: depois do upload, as malhas descartam as cópias dos
+# vértices e índices na CPU e guardam só contagens e limites
+LOW_MEMORY = os.environ.get("SOLAR_SYSTEM_LOW_MEMORY", "0") == "1"
 
 # Define a estrutura de cada vértice da malha
 vertex_dtype = np.dtype([
@@ -14,19 +21,86 @@ vertex_dtype = np.dtype([
     ('Weights', np.float32, 4) 
 ])
 
+# Estrutura dos vértices produzidos pelos carregadores de modelo
+model_vertex_dtype = np.dtype([
+    ('Position', np.float32, 3),
+    ('Normal', np.float32, 3),
+    ('TexCoords', np.float32, 2),
+    ('Tangent', np.float32, 3),
+    ('Bitangent', np.float32, 3),
+])
+
+class Texture:
+    """
+    Textura usada por uma malha: o recurso na GPU, o tipo (nome do sampler
+    no shader) e o caminho do arquivo.
+    """
+    __slots__ = ("resource", "type", "path")
+
+    def __init__(self, resource, type: str, path: str):
+        """
+        :param resource: GpuResource da textura.
+        :param type: Tipo da textura (por exemplo, "texture_diffuse").
+        :param path: Caminho do arquivo de imagem.
+        """
+        self.resource = resource
+        self.type = type
+        self.path = path
+
+
 class Mesh:
-    def __init__(self, vertices, indices, textures):
+    __slots__ = ("vertices", "indices", "textures", "mapped", "radius", "index_count", "nbytes",
+                 "resource", "VAO", "VBO", "EBO")
+
+    def __init__(self, vertices, indices, textures, mapped: bool = False):
         """
         :param vertices: Array NumPy estruturado com os campos:
                          'Position', 'Normal', 'TexCoords', 'Tangent', 'Bitangent',
                          'BoneIDs' e 'Weights' (os dois últimos são opcionais).
         :param indices: Array NumPy de índices (np.uint32).
-        :param textures: Lista de dicionários com chaves 'id', 'type' e 'path'.
+        :param textures: Lista de Texture.
+        :param mapped: Se os arrays são vistas sobre o mmap do pacote de assets
+                       (não ocupam memória própria e continuam disponíveis
+                       para recriar os buffers no modo de pouca memória).
         """
         self.vertices = vertices
         self.indices = indices
         self.textures = textures
+        self.mapped = mapped
+        # Raio da esfera envolvente centrada na origem do modelo
+        self.radius = float(np.sqrt((vertices['Position'] ** 2).sum(axis=1).max())) if len(vertices) else 0.0
+        self.index_count = len(indices)
+        self.nbytes = vertices.nbytes + indices.nbytes
+        self.VAO = self.VBO = self.EBO = None
+        # Os buffers pertencem ao gerenciador de recursos, que pode despejá-los
+        # e recriá-los a partir dos arrays acima. No modo de pouca memória os
+        # arrays são descartados depois do upload, então a malha só pode ser
+        # despejada se eles vierem do mmap; as demais voltam à GPU relendo o
+        # modelo (LazyModel.release seguido de um novo load)
+        with startup_profiler.section("upload"):
+            self.resource = gpu_resources.acquire("mesh", ("mesh", id(self)),
+                                                  self._create_buffers, self._delete_buffers,
+                                                  evictable=mapped or not LOW_MEMORY)
+
+    def _create_buffers(self):
+        """Cria os buffers na GPU e retorna (handles, bytes ocupados)."""
         self.setup_mesh()
+        if LOW_MEMORY and not self.mapped:
+            self.vertices = self.indices = None
+        return (self.VAO, self.VBO, self.EBO), self.nbytes
+
+    @staticmethod
+    def _delete_buffers(handles):
+        """Apaga o VAO e os buffers criados por setup_mesh."""
+        vao, vbo, ebo = handles
+        glDeleteVertexArrays(1, [vao])
+        glDeleteBuffers(2, [vbo, ebo])
+
+    def release(self):
+        """
+        Libera a referência aos buffers da malha (as texturas são do Model).
+        """
+        gpu_resources.release(self.resource)
 
     def setup_mesh(self):
         # Gera os buffers e o Vertex Array Object (VAO)
@@ -86,6 +160,20 @@ class Mesh:
         """
         Renderiza a malha utilizando o shader fornecido.
         
+        :param shader: Objeto shader com atributo 'ID' (identificador do programa OpenGL).
+        """
+        self.bind_textures(shader)
+        self.bind()
+        self.draw_elements()
+        glBindVertexArray(0)
+
+        # Reseta o slot de textura ativa
+        glActiveTexture(GL_TEXTURE0)
+
+    def bind_textures(self, shader):
+        """
+        Vincula as texturas da malha às unidades de textura e configura os samplers.
+
         :param shader: Objeto shader com atributo 'ID' (identificador do programa OpenGL).
         """
         diffuse_nr  = 1
@@ -96,7 +184,7 @@ class Mesh:
         # Ativa e configura as texturas de acordo com seu tipo
         for i, tex in enumerate(self.textures):
             glActiveTexture(GL_TEXTURE0 + i)
-            name = tex['type']
+            name = tex.type
 
             # Define o número da textura baseado no tipo
             if name == "texture_diffuse":
@@ -117,12 +205,18 @@ class Mesh:
             # Forma o nome do uniform, por exemplo, "texture_diffuse1"
             uniform_name = (name + number).encode('utf-8')
             glUniform1i(glGetUniformLocation(shader.ID, uniform_name), i)
-            glBindTexture(GL_TEXTURE_2D, tex['id'])
+            glBindTexture(GL_TEXTURE_2D, gpu_resources.use(tex.resource))
+        glActiveTexture(GL_TEXTURE0)
 
-        # Renderiza os triângulos
+    def bind(self):
+        """
+        Vincula o VAO da malha (recriando os buffers se tiverem sido despejados).
+        """
+        gpu_resources.use(self.resource)
         glBindVertexArray(self.VAO)
-        glDrawElements(GL_TRIANGLES, len(self.indices), GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
 
-        # Reseta o slot de textura ativa
-        glActiveTexture(GL_TEXTURE0)
\ No newline at end of file
+    def draw_elements(self):
+        """
+        Renderiza os triângulos com o VAO já vinculado.
+        """
+        glDrawElements(GL_TRIANGLES, self.index_count, GL_UNSIGNED_INT, None)
@@ -2,35 +2,63 @@
 import os
 import logging
 import numpy as np
-import pyassimp
-from pyassimp.postprocess import (
-    aiProcess_Triangulate,
-    aiProcess_GenSmoothNormals,
-    aiProcess_FlipUVs,
-    aiProcess_CalcTangentSpace,
-)
-from asserts.mesh import Mesh
-from asserts.utils import load_texture
+from asserts.mesh import Mesh, Texture, model_vertex_dtype
+from asserts.obj_loader import load_obj
+from asserts.utils import create_texture, delete_texture
+from asserts.resources import gpu_resources
+from asserts.asset_pack import assets
+from asserts.startup import startup_profiler
 
 logging.basicConfig(level=logging.INFO)
 
+# Carregadores de modelo disponíveis:
+#   "assimp": pyassimp para qualquer formato
+#   "obj":    leitor nativo em NumPy (apenas Wavefront OBJ/MTL)
+#   "auto":   leitor nativo para .obj e pyassimp para os demais formatos
+LOADERS = ("auto", "obj", "assimp")
+DEFAULT_LOADER = os.environ.get("SOLAR_SYSTEM_LOADER", "auto")
+
+def fallback_texture_path(directory: str) -> str:
+    """
+    Textura padrão do diretório de um modelo (<diretório>_texture.png).
+
+    :return: Caminho do arquivo, ou None se ele não existir.
+    """
+    basename = os.path.basename(directory)
+    fallback_path = os.path.join(directory, f"{basename}_texture.png")
+
+    # Verifica se o arquivo de fallback existe
+    return fallback_path if os.path.isfile(fallback_path) else None
+
 class Model:
     """
     Classe que carrega e processa um modelo 3D utilizando pyassimp.
     """
 
-    def __init__(self, path: str, gamma: bool = False):
+    def __init__(self, path: str, gamma: bool = False, loader: str = None):
         """
         Inicializa o modelo e carrega o arquivo especificado.
 
         :param path: Caminho para o arquivo do modelo.
         :param gamma: Habilita correção gama se True.
+        :param loader: Carregador usado ("auto", "obj" ou "assimp"); padrão DEFAULT_LOADER.
         """
         self.gammaCorrection: bool = gamma
         self.meshes: list[Mesh] = []
-        self.textures_loaded: list[dict] = []  # Evita carregamento duplicado de texturas
+        self.textures_loaded: dict[str, Texture] = {}  # Evita carregamento duplicado de texturas
         self.directory: str = ""
-        self.load_model(path)
+        self.loader: str = loader or DEFAULT_LOADER
+        if self.loader not in LOADERS:
+            raise ValueError(f"Carregador de modelo desconhecido: {self.loader}")
+
+        packed = assets.model(path, model_vertex_dtype)
+        if packed is not None:
+            self.load_packed_model(path, packed)
+        elif self.loader == "obj" or (self.loader == "auto" and path.lower().endswith(".obj")):
+            self.load_obj_model(path)
+        else:
+            self.load_model(path)
+        self.radius: float = max((mesh.radius for mesh in self.meshes), default=0.0)
 
     def draw(self, shader):
         """
@@ -41,13 +69,35 @@ class Model:
         for mesh in self.meshes:
             mesh.draw(shader)
 
+    def release(self) -> None:
+        """
+        Devolve ao gerenciador de recursos as malhas e texturas do modelo.
+        Texturas compartilhadas com outros modelos continuam carregadas.
+        """
+        for mesh in self.meshes:
+            mesh.release()
+        for tex in self.textures_loaded.values():
+            gpu_resources.release(tex.resource)
+        self.meshes = []
+        self.textures_loaded = {}
+
     def load_model(self, path: str) -> None:
         """
         Carrega o modelo a partir do arquivo e processa a cena.
 
         :param path: Caminho para o arquivo do modelo.
         """
-        with pyassimp.load(
+        # O pyassimp só é importado no primeiro carregamento de modelo
+        with startup_profiler.section("import"):
+            import pyassimp
+            from pyassimp.postprocess import (
+                aiProcess_Triangulate,
+                aiProcess_GenSmoothNormals,
+                aiProcess_FlipUVs,
+                aiProcess_CalcTangentSpace,
+            )
+
+        with startup_profiler.section("malhas"), pyassimp.load(
             path,
             processing=(
                 aiProcess_Triangulate
@@ -62,6 +112,36 @@ class Model:
             self.directory = os.path.dirname(path)
             self.process_node(scene.rootnode, scene)
 
+    def load_obj_model(self, path: str) -> None:
+        """
+        Carrega um modelo Wavefront OBJ com o leitor nativo em NumPy.
+
+        :param path: Caminho para o arquivo do modelo.
+        """
+        with startup_profiler.section("malhas"):
+            self.directory = os.path.dirname(path)
+            for obj_mesh in load_obj(path):
+                textures = []
+                if obj_mesh.diffuse is not None:
+                    textures.append(self.load_texture_file(obj_mesh.diffuse, "texture_diffuse"))
+                else:
+                    textures.extend(self.fallback_textures("texture_diffuse"))
+                self.meshes.append(Mesh(obj_mesh.vertices, obj_mesh.indices, textures))
+
+    def load_packed_model(self, path: str, meshes: list) -> None:
+        """
+        Cria as malhas a partir do pacote de assets: os vértices e índices já
+        processados são arrays sobre o mmap, enviados à GPU sem cópia.
+
+        :param path: Caminho do arquivo do modelo.
+        :param meshes: Lista de (vértices, índices, [(caminho da textura, tipo)]).
+        """
+        with startup_profiler.section("malhas"):
+            self.directory = os.path.dirname(path)
+            for vertices, indices, textures in meshes:
+                textures = [self.load_texture_file(texture, kind) for texture, kind in textures]
+                self.meshes.append(Mesh(vertices, indices, textures, mapped=True))
+
     def process_node(self, node, scene, visited: set = None) -> None:
         """
         Processa recursivamente cada nó da cena.
@@ -92,9 +172,34 @@ class Model:
         :param scene: Cena carregada.
         :return: Objeto Mesh processado.
         """
+        vertex_array, indices = self.mesh_arrays(mesh)
+        textures = []
+
+        # Processa materiais e texturas
+        if mesh.materialindex < len(scene.materials):
+            material = scene.materials[mesh.materialindex]
+            diffuse_maps = self.load_material_textures(material, "diffuse", "texture_diffuse")
+            textures.extend(diffuse_maps)
+            specular_maps = self.load_material_textures(material, "specular", "texture_specular")
+            textures.extend(specular_maps)
+            normal_maps = self.load_material_textures(material, "normals", "texture_normal")
+            textures.extend(normal_maps)
+            # Adiciona o carregamento dos height maps (ou ambient maps)
+            height_maps = self.load_material_textures(material, "ambient", "texture_height")
+            textures.extend(height_maps)
+
+        return Mesh(vertex_array, indices, textures)
+
+    @staticmethod
+    def mesh_arrays(mesh) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Extrai de uma mesh do pyassimp o array estruturado de vértices e os índices.
+
+        :param mesh: Objeto mesh do pyassimp.
+        :return: Vértices (model_vertex_dtype) e índices (np.uint32).
+        """
         vertices = []
         indices = []
-        textures = []
 
         # Processa vértices
         for i in range(mesh.vertices.shape[0]):
@@ -130,15 +235,6 @@ class Model:
             vertices.append(vertex)
 
         # Converte os vértices para um array NumPy com dtype definido
-        vertex_dtype = np.dtype(
-            [
-                ("Position", np.float32, 3),
-                ("Normal", np.float32, 3),
-                ("TexCoords", np.float32, 2),
-                ("Tangent", np.float32, 3),
-                ("Bitangent", np.float32, 3),
-            ]
-        )
         vertex_array = np.array(
             [
                 (
@@ -150,28 +246,14 @@ class Model:
                 )
                 for v in vertices
             ],
-            dtype=vertex_dtype,
+            dtype=model_vertex_dtype,
         )
 
         # Processa índices a partir de cada face
         for face in mesh.faces:
             indices.extend(face)
         indices = np.array(indices, dtype=np.uint32)
-
-        # Processa materiais e texturas
-        if mesh.materialindex < len(scene.materials):
-            material = scene.materials[mesh.materialindex]
-            diffuse_maps = self.load_material_textures(material, "diffuse", "texture_diffuse")
-            textures.extend(diffuse_maps)
-            specular_maps = self.load_material_textures(material, "specular", "texture_specular")
-            textures.extend(specular_maps)
-            normal_maps = self.load_material_textures(material, "normals", "texture_normal")
-            textures.extend(normal_maps)
-            # Adiciona o carregamento dos height maps (ou ambient maps)
-            height_maps = self.load_material_textures(material, "ambient", "texture_height")
-            textures.extend(height_maps)
-
-        return Mesh(vertex_array, indices, textures)
+        return vertex_array, indices
 
     def load_material_textures(self, material, type_name: str, type_str: str) -> list:
         """
@@ -206,29 +288,98 @@ class Model:
                 # Verifica se a chave corresponde ao tipo de textura
                 if key == f"$tex.file[{type_name}]":
                     full_path = os.path.join(self.directory, data)
-                    already_loaded = next((t for t in self.textures_loaded if t["path"] == full_path), None)
-
-                    # Verifica se a textura ja foi carregada
-                    if already_loaded:
-                        textures.append(already_loaded)
-                    else:
-                        texture_id = load_texture(full_path)
-                        logging.info("Texture carregada: %s (ID: %s)", full_path, texture_id)
-                        tex = {"id": texture_id, "type": type_str, "path": full_path}
-                        textures.append(tex)
-                        self.textures_loaded.append(tex)
+                    textures.append(self.load_texture_file(full_path, type_str))
 
         # Fallback: se for diffuse e nenhuma textura for encontrada, tenta carregar um arquivo padrão
         if type_name == "diffuse" and len(textures) == 0:
-            # Tenta carregar uma textura padrão do diretório do modelo
-            basename = os.path.basename(self.directory)
-            fallback_path = os.path.join(self.directory, f"{basename}_texture.png")
-
-            # Verifica se o arquivo de fallback existe
-            if os.path.isfile(fallback_path):
-                texture_id = load_texture(fallback_path)
-                logging.info("Fallback texture loaded: %s (ID: %s)", fallback_path, texture_id)
-                tex = {"id": texture_id, "type": type_str, "path": fallback_path}
-                textures.append(tex)
-                self.textures_loaded.append(tex)
-        return textures
\ No newline at end of file
+            textures.extend(self.fallback_textures(type_str))
+        return textures
+
+    def load_texture_file(self, full_path: str, type_str: str) -> dict:
+        """
+        Carrega uma textura, reaproveitando a já carregada com o mesmo caminho
+        (por este ou por outro modelo, via gerenciador de recursos).
+
+        :param full_path: Caminho do arquivo de imagem.
+        :param type_str: String que identifica o tipo na shader (por exemplo, "texture_diffuse").
+        :return: Texture com o recurso, o tipo e o caminho.
+        """
+        # Verifica se a textura ja foi carregada
+        already_loaded = self.textures_loaded.get(full_path)
+        if already_loaded:
+            return already_loaded
+
+        resource = gpu_resources.acquire("texture", ("texture", os.path.abspath(full_path)),
+                                         lambda: create_texture(full_path), delete_texture)
+        logging.info("Texture carregada: %s (ID: %s, referências: %d)",
+                     full_path, resource.handle, resource.refcount)
+        tex = Texture(resource, type_str, full_path)
+        self.textures_loaded[full_path] = tex
+        return tex
+
+    def fallback_textures(self, type_str: str) -> list:
+        """
+        Tenta carregar a textura padrão do diretório do modelo (<diretório>_texture.png).
+
+        :param type_str: String que identifica o tipo na shader.
+        :return: Lista com a textura de fallback, ou vazia se o arquivo não existir.
+        """
+        fallback_path = fallback_texture_path(self.directory)
+        if fallback_path is None:
+            return []
+        return [self.load_texture_file(fallback_path, type_str)]
+
+
+class LazyModel:
+    """
+    Handle de um modelo que adia a leitura do arquivo e o upload para a GPU
+    até o primeiro uso, por exemplo quando o corpo fica visível na tela.
+    """
+
+    def __init__(self, path: str, gamma: bool = False, radius: float = 1.0, loader: str = None):
+        """
+        :param path: Caminho para o arquivo do modelo.
+        :param gamma: Habilita correção gama se True.
+        :param radius: Raio estimado, usado no culling antes do carregamento.
+        :param loader: Carregador usado pelo Model (padrão DEFAULT_LOADER).
+        """
+        self.path = path
+        self.gamma = gamma
+        self.loader = loader
+        self.radius_hint = radius
+        self.model: Model = None
+
+    @property
+    def loaded(self) -> bool:
+        """Indica se o modelo já foi materializado."""
+        return self.model is not None
+
+    @property
+    def radius(self) -> float:
+        """Raio real depois do carregamento; antes disso, o raio estimado."""
+        return self.model.radius if self.model is not None else self.radius_hint
+
+    def load(self) -> Model:
+        """
+        Materializa o modelo (leitura do arquivo e upload), se ainda não foi feito.
+        """
+        if self.model is None:
+            logging.info("Carregando modelo sob demanda: %s", self.path)
+            self.model = Model(self.path, self.gamma, self.loader)
+        return self.model
+
+    def draw(self, shader):
+        """
+        Desenha o modelo, carregando-o antes se necessário.
+
+        :param shader: Shader utilizado para renderização.
+        """
+        self.load().draw(shader)
+
+    def release(self):
+        """
+        Libera os recursos do modelo; ele é carregado de novo no próximo uso.
+        """
+        if self.model is not None:
+            self.model.release()
+            self.model = None
@@ -0,0 +1,239 @@
+# Importando bibliotecas
+import os
+import numpy as np
+from asserts.mesh import model_vertex_dtype
+
+
+class ObjMesh:
+    """
+    Malha lida de um arquivo OBJ: vértices no mesmo formato estruturado
+    produzido por Model.process_mesh, índices e a textura difusa do material.
+    """
+
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray, material: str, diffuse: str):
+        self.vertices = vertices
+        self.indices = indices
+        self.material = material
+        self.diffuse = diffuse
+
+
+def _floats(lines: list[bytes], columns: int) -> np.ndarray:
+    """
+    Converte de uma vez as linhas de um tipo de registro (sem o prefixo) em
+    um array (n, columns); colunas extras são ignoradas e as faltantes ficam 0.
+    """
+    if not lines:
+        return np.zeros((0, columns), dtype=np.float32)
+    counts = [line.count(b" ") + 1 for line in lines]
+    if min(counts) == max(counts):
+        values = np.array(b" ".join(lines).split(), dtype=np.float32).reshape(len(lines), -1)
+    else:
+        width = max(counts)
+        values = np.zeros((len(lines), width), dtype=np.float32)
+        for i, line in enumerate(lines):
+            row = np.array(line.split(), dtype=np.float32)
+            values[i, :len(row)] = row
+    if values.shape[1] >= columns:
+        return values[:, :columns]
+    return np.pad(values, ((0, 0), (0, columns - values.shape[1])))
+
+
+def _resolve(indices: np.ndarray, count: int) -> np.ndarray:
+    """Converte índices do OBJ (base 1, negativos relativos ao fim) para base 0."""
+    return np.where(indices < 0, indices + count, indices - 1)
+
+
+def _faces(lines: list[bytes], counts: tuple[int, int, int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converte os registros 'f' em triângulos de cantos (posição, uv, normal).
+
+    Faces com mais de 3 vértices são trianguladas em leque, agrupadas por
+    número de vértices para que cada grupo seja processado de forma vetorizada.
+
+    :return: Array (n_triângulos, 3, 3) de índices base 0 (-1 quando ausente)
+             e o índice da face de origem de cada triângulo.
+    """
+    sizes = np.array([line.count(b" ") + 1 for line in lines], dtype=np.int64)
+    triangles = []
+    origins = []
+    for size in np.unique(sizes):
+        rows = np.flatnonzero(sizes == size)
+        joined = b" ".join(lines[i] for i in rows)
+        sample = joined[:joined.find(b" ")] if b" " in joined else joined
+
+        # Formatos: v, v/vt, v//vn ou v/vt/vn (assumido igual em todo o arquivo)
+        slashes = sample.count(b"/")
+        if slashes == 0:
+            corners = np.array(joined.split(), dtype=np.int64).reshape(-1, 1)
+            corners = np.hstack([corners, np.zeros_like(corners), np.zeros_like(corners)])
+        elif b"//" in sample:
+            corners = np.array(joined.replace(b"//", b" ").split(), dtype=np.int64).reshape(-1, 2)
+            corners = np.stack([corners[:, 0], np.zeros(len(corners), np.int64), corners[:, 1]], axis=1)
+        elif slashes == 1:
+            corners = np.array(joined.replace(b"/", b" ").split(), dtype=np.int64).reshape(-1, 2)
+            corners = np.hstack([corners, np.zeros((len(corners), 1), np.int64)])
+        else:
+            corners = np.array(joined.replace(b"/", b" ").split(), dtype=np.int64).reshape(-1, 3)
+
+        # Zero indica componente ausente; os demais são convertidos para base 0
+        resolved = np.full(corners.shape, -1, dtype=np.int64)
+        for column, count in enumerate(counts):
+            present = corners[:, column] != 0
+            resolved[present, column] = _resolve(corners[present, column], count)
+        polygons = resolved.reshape(len(rows), size, 3)
+
+        # Triangulação em leque: (0, k, k + 1)
+        for k in range(1, size - 1):
+            triangles.append(polygons[:, [0, k, k + 1]])
+            origins.append(rows)
+
+    if not triangles:
+        return np.zeros((0, 3, 3), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    triangles = np.concatenate(triangles)
+    origins = np.concatenate(origins)
+    order = np.argsort(origins, kind="stable")
+    return triangles[order], origins[order]
+
+
+def _smooth_normals(positions: np.ndarray, position_ids: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Gera normais suaves (como aiProcess_GenSmoothNormals) acumulando as
+    normais das faces em cada posição compartilhada.
+    """
+    tri = indices.reshape(-1, 3)
+    p0, p1, p2 = positions[tri[:, 0]], positions[tri[:, 1]], positions[tri[:, 2]]
+    face_normals = np.cross(p1 - p0, p2 - p0)
+    accumulated = np.zeros((position_ids.max() + 1, 3), dtype=np.float64)
+    for corner in range(3):
+        np.add.at(accumulated, position_ids[tri[:, corner]], face_normals)
+    normals = accumulated[position_ids]
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return (normals / np.where(length > 0, length, 1.0)).astype(np.float32)
+
+
+def _tangent_space(positions: np.ndarray, normals: np.ndarray, uvs: np.ndarray,
+                   indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula tangentes e bitangentes por vértice (como aiProcess_CalcTangentSpace).
+    """
+    tri = indices.reshape(-1, 3)
+    p0, p1, p2 = positions[tri[:, 0]], positions[tri[:, 1]], positions[tri[:, 2]]
+    w0, w1, w2 = uvs[tri[:, 0]], uvs[tri[:, 1]], uvs[tri[:, 2]]
+    e1, e2 = p1 - p0, p2 - p0
+    d1, d2 = w1 - w0, w2 - w0
+    det = d1[:, 0] * d2[:, 1] - d2[:, 0] * d1[:, 1]
+    r = np.where(np.abs(det) > 1e-12, 1.0 / np.where(det == 0, 1.0, det), 0.0)[:, None]
+    face_tangent = (e1 * d2[:, 1:2] - e2 * d1[:, 1:2]) * r
+    face_bitangent = (e2 * d1[:, 0:1] - e1 * d2[:, 0:1]) * r
+
+    tangent = np.zeros_like(positions, dtype=np.float64)
+    bitangent = np.zeros_like(positions, dtype=np.float64)
+    for corner in range(3):
+        np.add.at(tangent, tri[:, corner], face_tangent)
+        np.add.at(bitangent, tri[:, corner], face_bitangent)
+
+    # Ortogonaliza em relação à normal (Gram-Schmidt)
+    tangent -= normals * np.sum(normals * tangent, axis=1, keepdims=True)
+    for vectors in (tangent, bitangent):
+        length = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(length > 0, length, 1.0)
+    return tangent.astype(np.float32), bitangent.astype(np.float32)
+
+
+def load_mtl(path: str) -> dict[str, str]:
+    """
+    Lê um arquivo MTL e retorna o mapa material -> caminho da textura difusa (map_Kd).
+    """
+    materials = {}
+    current = None
+    if not os.path.isfile(path):
+        return materials
+    directory = os.path.dirname(path)
+    with open(path, "rb") as file:
+        for line in file:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == b"newmtl":
+                current = b" ".join(parts[1:]).decode("utf-8")
+                materials.setdefault(current, None)
+            elif parts[0] == b"map_Kd" and current is not None:
+                # O nome do arquivo é o último token (as opções vêm antes)
+                materials[current] = os.path.join(directory, parts[-1].decode("utf-8"))
+    return materials
+
+
+def load_obj(path: str) -> list[ObjMesh]:
+    """
+    Lê um arquivo Wavefront OBJ com NumPy, produzindo uma malha indexada por material.
+
+    Os registros v/vt/vn/f são convertidos em bloco, os cantos
+    (posição, uv, normal) idênticos são unidos com np.unique e as UVs são
+    invertidas no eixo V, como aiProcess_FlipUVs.
+
+    :param path: Caminho do arquivo OBJ.
+    :return: Lista de malhas, uma por material usado.
+    """
+    with open(path, "rb") as file:
+        lines = file.read().replace(b"\r", b"").replace(b"\t", b" ").split(b"\n")
+
+    v_lines, vt_lines, vn_lines, f_lines = [], [], [], []
+    f_materials = []
+    material_names = [None]
+    mtllib = None
+    current = 0
+    for line in lines:
+        head = line[:2]
+        if head == b"v ":
+            v_lines.append(b" ".join(line[2:].split()))
+        elif head == b"vt":
+            vt_lines.append(b" ".join(line[3:].split()))
+        elif head == b"vn":
+            vn_lines.append(b" ".join(line[3:].split()))
+        elif head == b"f ":
+            f_lines.append(b" ".join(line[2:].split()))
+            f_materials.append(current)
+        elif line.startswith(b"usemtl"):
+            material_names.append(line[6:].strip().decode("utf-8"))
+            current = len(material_names) - 1
+        elif line.startswith(b"mtllib"):
+            mtllib = line[6:].strip().decode("utf-8")
+
+    positions = _floats(v_lines, 3)
+    uvs = _floats(vt_lines, 2)
+    normals = _floats(vn_lines, 3)
+    triangles, origins = _faces(f_lines, (len(positions), len(uvs), len(normals)))
+    triangle_materials = np.array(f_materials, dtype=np.int64)[origins] if len(origins) else origins
+
+    directory = os.path.dirname(path)
+    textures = load_mtl(os.path.join(directory, mtllib)) if mtllib else {}
+
+    meshes = []
+    for material in np.unique(triangle_materials):
+        corners = triangles[triangle_materials == material].reshape(-1, 3)
+
+        # Solda os cantos idênticos em um único vértice indexado: cada trinca
+        # (posição, uv, normal) vira uma chave inteira única para o np.unique
+        sizes = np.array([len(positions), len(uvs) + 1, len(normals) + 1], dtype=np.int64)
+        keys = (corners[:, 0] * sizes[1] + corners[:, 1] + 1) * sizes[2] + corners[:, 2] + 1
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        unique = corners[first]
+        indices = inverse.reshape(-1).astype(np.uint32)
+
+        vertices = np.zeros(len(unique), dtype=model_vertex_dtype)
+        vertices["Position"] = positions[unique[:, 0]]
+        if len(uvs) and (unique[:, 1] >= 0).all():
+            texcoords = uvs[unique[:, 1]]
+            vertices["TexCoords"] = np.stack([texcoords[:, 0], 1.0 - texcoords[:, 1]], axis=1)
+        if len(normals) and (unique[:, 2] >= 0).all():
+            vertices["Normal"] = normals[unique[:, 2]]
+        else:
+            vertices["Normal"] = _smooth_normals(vertices["Position"], unique[:, 0], indices)
+        if len(uvs):
+            vertices["Tangent"], vertices["Bitangent"] = _tangent_space(
+                vertices["Position"].astype(np.float64), vertices["Normal"].astype(np.float64),
+                vertices["TexCoords"].astype(np.float64), indices)
+
+        name = material_names[material]
+        meshes.append(ObjMesh(vertices, indices, name, textures.get(name)))
+    return meshes
@@ -0,0 +1,219 @@
+# Importando bibliotecas
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+# Cubo unitário [-1, 1]^3 usado como volume envolvente das esferas
+_CUBE_VERTICES = np.array([
+    [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+    [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],
+], dtype=np.float32)
+_CUBE_INDICES = np.array([
+    0, 2, 1, 0, 3, 2,  4, 5, 6, 4, 6, 7,  0, 1, 5, 0, 5, 4,
+    3, 6, 2, 3, 7, 6,  0, 4, 7, 0, 7, 3,  1, 2, 6, 1, 6, 5,
+], dtype=np.uint32)
+
+
+def occlusion_groups(scene) -> np.ndarray:
+    """
+    Agrupa cada corpo com a raiz da sua hierarquia (planeta com luas e anéis),
+    para que um único teste descarte o grupo inteiro.
+
+    :return: Índice do corpo raiz de cada corpo.
+    """
+    root = np.arange(len(scene))
+    for level in scene.levels[1:]:
+        root[level] = root[scene.parent[level]]
+    return root
+
+
+class OcclusionCuller:
+    """
+    Culling por oclusão com consultas de hardware (GL_ANY_SAMPLES_PASSED).
+
+    Depois que a vista é desenhada, o cubo envolvente de cada grupo é
+    rasterizado contra o buffer de profundidade, sem escrever cor nem
+    profundidade. Os resultados são lidos nos frames seguintes apenas
+    quando já estão disponíveis (sem travar a CPU) e os grupos ocultos são
+    removidos da lista de desenho no lado da CPU. Quando não há oclusores
+    grandes na tela, o teste é desligado e tudo é desenhado.
+    """
+
+    def __init__(self, scene, shader, min_occluder_px: float = 40.0, max_query_fraction: float = 0.25,
+                 occluders: np.ndarray = None):
+        """
+        :param scene: Cena com a hierarquia de corpos.
+        :param shader: Shader simples (solid.vert) usado para os volumes envolventes.
+        :param min_occluder_px: Raio mínimo na tela, em pixels, de um corpo que conta como oclusor.
+        :param max_query_fraction: Grupos maiores que esta fração da altura da vista
+                                   não são testados (raramente ficam ocultos).
+        :param occluders: Máscara dos corpos que preenchem a profundidade e podem
+                          esconder outros; por padrão, todos os sujeitos a culling
+                          menos as linhas das órbitas (shader "cor"), cuja esfera
+                          envolvente é enorme mas que não cobrem quase nada.
+        """
+        self.scene = scene
+        self.shader = shader
+        self.min_occluder_px = min_occluder_px
+        self.max_query_fraction = max_query_fraction
+        if occluders is None:
+            occluders = scene.cull & np.array([body.shader != "cor" for body in scene.bodies])
+        self.occluders = np.asarray(occluders, dtype=bool)
+
+        self.root = occlusion_groups(scene)
+        # Apenas grupos sujeitos a culling (as estrelas de fundo nunca são testadas)
+        self.groups = np.array([g for g in np.unique(self.root) if scene.cull[g]], dtype=np.int64)
+        n = len(self.groups)
+        self.group_of = np.full(len(scene), -1, dtype=np.int64)
+        self.group_of[np.isin(self.root, self.groups)] = np.searchsorted(
+            self.groups, self.root[np.isin(self.root, self.groups)])
+
+        self.queries = np.array(glGenQueries(n), dtype=np.uint32).reshape(n)
+        self.in_flight = np.zeros(n, dtype=bool)
+        self.issued_frame = np.zeros(n, dtype=np.int64)
+        self.hidden = np.zeros(n, dtype=bool)
+        self.frame = 0
+        self.active = False
+
+        # Estatísticas
+        self.frames = 0
+        self.inactive_frames = 0
+        self.queries_issued = 0
+        self.results = 0
+        self.latency_frames = 0
+        self.culled_groups = 0
+        self.culled_bodies = 0
+
+        self._setup_proxy()
+
+    def _setup_proxy(self):
+        """Cria o VAO do cubo envolvente."""
+        self.vao = glGenVertexArrays(1)
+        self.vbo, self.ebo = glGenBuffers(2)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, _CUBE_VERTICES.nbytes, _CUBE_VERTICES, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, _CUBE_INDICES.nbytes, _CUBE_INDICES, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 12, ctypes.c_void_p(0))
+        glBindVertexArray(0)
+
+    def group_bounds(self, state) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Esfera envolvente de cada grupo: centrada na raiz e contendo todos os membros.
+
+        :return: Centros (n, 3) e raios (n,).
+        """
+        centers = state.centers[self.groups]
+        members = self.group_of >= 0
+        group = self.group_of[members]
+        reach = np.linalg.norm(state.centers[members] - centers[group], axis=1) + state.radii[members]
+        radii = np.zeros(len(self.groups))
+        np.maximum.at(radii, group, reach)
+        return centers, radii
+
+    def _collect(self):
+        """Lê os resultados já disponíveis, sem esperar pela GPU."""
+        for g in np.flatnonzero(self.in_flight):
+            query = int(self.queries[g])
+            if not glGetQueryObjectuiv(query, GL_QUERY_RESULT_AVAILABLE):
+                continue
+            self.hidden[g] = not glGetQueryObjectuiv(query, GL_QUERY_RESULT)
+            self.in_flight[g] = False
+            self.results += 1
+            self.latency_frames += self.frame - self.issued_frame[g]
+
+    def begin(self, view, state) -> np.ndarray:
+        """
+        Atualiza os resultados e decide os corpos ocultos da vista neste frame.
+
+        :param view: Vista preparada (visible, screen_radius, distance).
+        :param state: Estado da cena do frame.
+        :return: Máscara dos corpos que não precisam ser desenhados.
+        """
+        self.frame += 1
+        self.frames += 1
+        self._collect()
+
+        occluders = self.occluders & view.visible & (view.screen_radius >= self.min_occluder_px)
+        self.active = bool(occluders.any())
+        if not self.active:
+            # Poucos oclusores: o teste custaria mais do que economiza
+            self.inactive_frames += 1
+            self.hidden[:] = False
+            return np.zeros(len(self.scene), dtype=bool)
+
+        # Grupos fora do frustum perdem o resultado antigo
+        self._centers, self._radii = self.group_bounds(state)
+        in_view = view.visible[self.groups]
+        self.hidden &= in_view
+
+        hidden_groups = self.hidden.copy()
+        self.culled_groups += int(hidden_groups.sum())
+        mask = np.zeros(len(self.scene), dtype=bool)
+        members = self.group_of >= 0
+        mask[members] = hidden_groups[self.group_of[members]]
+        mask &= view.visible
+        self.culled_bodies += int(mask.sum())
+        return mask
+
+    def issue(self, view, state, projection, view_matrix, height: int):
+        """
+        Testa os volumes envolventes contra o buffer de profundidade já preenchido pela vista.
+
+        :param view: Vista preparada (visible, distance, focal).
+        :param state: Estado da cena do frame.
+        :param projection: Matriz de projeção da vista.
+        :param view_matrix: Matriz de visualização da vista.
+        :param height: Altura da vista em pixels.
+        """
+        if not self.active:
+            return
+        centers, radii = self._centers, self._radii
+        # Os grupos são centrados na raiz, cuja distância à câmera já é conhecida
+        distance = view.distance[self.groups]
+        with np.errstate(divide="ignore"):
+            group_px = np.where(distance > radii, view.focal * radii / distance, np.inf)
+
+        # Câmera dentro do cubo (ou perto) ou grupo grande demais: sem teste
+        candidates = (view.visible[self.groups] & ~self.in_flight
+                      & (distance > radii * np.sqrt(3.0) + 1.0)
+                      & (group_px < self.max_query_fraction * height))
+        if not candidates.any():
+            return
+
+        self.shader.use()
+        self.shader.set_mat4("projection", projection)
+        self.shader.set_mat4("view", view_matrix)
+        glColorMask(GL_FALSE, GL_FALSE, GL_FALSE, GL_FALSE)
+        glDepthMask(GL_FALSE)
+        glBindVertexArray(self.vao)
+        model = np.eye(4, dtype=np.float32)
+        for g in np.flatnonzero(candidates):
+            model[:3, :3] = np.eye(3) * radii[g]
+            model[:3, 3] = centers[g]
+            self.shader.set_mat4_numpy("model", model)
+            glBeginQuery(GL_ANY_SAMPLES_PASSED, int(self.queries[g]))
+            glDrawElements(GL_TRIANGLES, len(_CUBE_INDICES), GL_UNSIGNED_INT, None)
+            glEndQuery(GL_ANY_SAMPLES_PASSED)
+            self.in_flight[g] = True
+            self.issued_frame[g] = self.frame
+            self.queries_issued += 1
+        glBindVertexArray(0)
+        glDepthMask(GL_TRUE)
+        glColorMask(GL_TRUE, GL_TRUE, GL_TRUE, GL_TRUE)
+
+    def release(self):
+        """Apaga as consultas e o volume envolvente."""
+        glDeleteQueries(len(self.queries), self.queries)
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(2, [self.vbo, self.ebo])
+
+    def report(self) -> str:
+        """Grupos/corpos descartados, consultas e latência média dos resultados."""
+        frames = max(self.frames, 1)
+        latency = self.latency_frames / self.results if self.results else 0.0
+        return (f"Oclusão: {self.culled_groups / frames:.2f} grupos e {self.culled_bodies / frames:.2f} "
+                f"corpos descartados por frame, {self.queries_issued} consultas "
+                f"(latência média {latency:.2f} frames), desligada em {self.inactive_frames} de {self.frames} frames")
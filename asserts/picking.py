@@ -0,0 +1,321 @@
+# Importando bibliotecas
+import time
+import numpy as np
+import glm
+
+
+def unproject(projection, view, ndc_x: float, ndc_y: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converte um ponto em coordenadas normalizadas da tela em um raio no mundo.
+
+    :param projection: Matriz de projeção (glm).
+    :param view: Matriz de visualização (glm).
+    :param ndc_x: Coordenada x em [-1, 1].
+    :param ndc_y: Coordenada y em [-1, 1] (para cima).
+    :return: Origem (no plano próximo) e direção normalizada do raio.
+    """
+    inverse = np.linalg.inv(np.array(projection * view, dtype=np.float64))
+    near = inverse @ np.array([ndc_x, ndc_y, -1.0, 1.0])
+    far = inverse @ np.array([ndc_x, ndc_y, 1.0, 1.0])
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+    direction = far - near
+    return near, direction / np.linalg.norm(direction)
+
+
+def cursor_ray(view, x: float, y: float, width: int, height: int):
+    """
+    Raio sob o cursor em uma vista.
+
+    :param view: Vista (Viewport ou ViewPacket) com projection, view e rect.
+    :param x: Posição x do cursor, em coordenadas da janela.
+    :param y: Posição y do cursor, a partir do topo da janela (como a GLFW).
+    :param width: Largura da janela.
+    :param height: Altura da janela.
+    :return: Origem e direção do raio, ou None se o cursor estiver fora da vista.
+    """
+    vx, vy, vw, vh = view.rect
+    u = (x / width - vx) / vw
+    v = (1.0 - y / height - vy) / vh
+    if not (0.0 <= u <= 1.0 and 0.0 <= v <= 1.0):
+        return None
+    return unproject(view.projection, view.view, 2.0 * u - 1.0, 2.0 * v - 1.0)
+
+
+def view_at(views: list, x: float, y: float, width: int, height: int):
+    """
+    Vista sob o cursor; entre vistas sobrepostas (picture-in-picture), a
+    desenhada por último.
+    """
+    for view in reversed(views):
+        vx, vy, vw, vh = view.rect
+        u = x / width - vx
+        v = 1.0 - y / height - vy
+        if 0.0 <= u <= vw and 0.0 <= v <= vh:
+            return view
+    return None
+
+
+def camera_ray(camera, x: float, y: float, width: int, height: int,
+               near: float = 0.1, far: float = 25000.0):
+    """
+    Raio sob o cursor para uma câmera ocupando a janela inteira, com a mesma
+    projeção usada pelas vistas.
+    """
+    projection = glm.perspective(glm.radians(camera.Zoom), width / height, near, far)
+    return unproject(projection, camera.get_view_matrix(),
+                     2.0 * x / width - 1.0, 1.0 - 2.0 * y / height)
+
+
+def morton_codes(points: np.ndarray) -> np.ndarray:
+    """
+    Código de Morton (curva Z, 10 bits por eixo) de cada ponto, para ordenar
+    os corpos de forma que vizinhos no array sejam vizinhos no espaço.
+    """
+    lower = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - lower, 1e-9)
+    cells = np.clip((points - lower) / extent * 1023.0, 0, 1023).astype(np.uint64)
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for axis in range(3):
+        value = cells[:, axis]
+        value = (value | (value << np.uint64(16))) & np.uint64(0x030000FF)
+        value = (value | (value << np.uint64(8))) & np.uint64(0x0300F00F)
+        value = (value | (value << np.uint64(4))) & np.uint64(0x030C30C3)
+        value = (value | (value << np.uint64(2))) & np.uint64(0x09249249)
+        codes |= value << np.uint64(axis)
+    return codes
+
+
+def _reduce_groups(function, values: np.ndarray, size: int) -> np.ndarray:
+    """Reduz grupos consecutivos de 'size' linhas (mais rápido que min/max em um eixo curto)."""
+    result = values[0::size].copy()
+    for k in range(1, size):
+        function(result, values[k::size], out=result)
+    return result
+
+
+class BodyBVH:
+    """
+    Hierarquia de volumes envolventes (caixas alinhadas aos eixos) sobre as
+    esferas dos corpos em mundo.
+
+    A topologia é uma árvore binária completa sobre os corpos ordenados pela
+    curva de Morton, guardada por níveis (o nó i tem os filhos 2i e 2i + 1 no
+    nível seguinte). Assim o refit de cada frame é feito inteiro em NumPy:
+    as folhas são recalculadas a partir das esferas e cada nível é o mínimo e
+    o máximo dos pares do nível abaixo. Só quando as caixas incham demais
+    (corpos que se afastaram dos vizinhos da ordenação) a árvore é refeita.
+    """
+
+    def __init__(self, centers: np.ndarray, radii: np.ndarray, ids: np.ndarray = None,
+                 leaf_size: int = 4, rebuild_ratio: float = 2.0):
+        """
+        :param centers: Centros das esferas (n, 3).
+        :param radii: Raios das esferas (n,).
+        :param ids: Índices dos corpos incluídos (padrão: todos).
+        :param leaf_size: Corpos por folha.
+        :param rebuild_ratio: Refaz a árvore quando a área das folhas passa
+                              deste múltiplo da área logo após a construção.
+        """
+        self.ids = np.arange(len(centers)) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.builds = 0
+        self.refits = 0
+        self.build(centers, radii)
+
+    def build(self, centers: np.ndarray, radii: np.ndarray):
+        """Ordena os corpos pela curva de Morton e monta a árvore."""
+        n = len(self.ids)
+        leaves = max(1, -(-n // self.leaf_size))
+        self.depth = int(np.ceil(np.log2(leaves))) if leaves > 1 else 0
+        # Folhas completadas até uma potência de 2; entradas -1 são vazias
+        self.order = np.full((1 << self.depth) * self.leaf_size, -1, dtype=np.int64)
+        if n:
+            self.order[:n] = self.ids[np.argsort(morton_codes(centers[self.ids]), kind="stable")]
+        # Caixas das esferas, reaproveitadas a cada refit; o enchimento fica vazio (inf, -inf)
+        self._lower = np.full((len(self.order), 3), np.inf)
+        self._upper = np.full((len(self.order), 3), -np.inf)
+        self.refit(centers, radii)
+        self.build_area = self.leaf_area()
+        self.builds += 1
+
+    def refit(self, centers: np.ndarray, radii: np.ndarray):
+        """
+        Atualiza as caixas com as novas posições, sem mudar a topologia.
+        """
+        self.centers = centers
+        self.radii = radii
+        # Os corpos válidos ocupam o início de self.order; o resto é enchimento.
+        # np.take por linhas é bem mais rápido que a indexação avançada de (n, 3)
+        n = len(self.ids)
+        bodies = self.order[:n]
+        center = np.take(centers, bodies, axis=0)
+        reach = np.take(radii, bodies)[:, None]
+        np.subtract(center, reach, out=self._lower[:n])
+        np.add(center, reach, out=self._upper[:n])
+        lower = _reduce_groups(np.minimum, self._lower, self.leaf_size)
+        upper = _reduce_groups(np.maximum, self._upper, self.leaf_size)
+        self.lower = [lower]
+        self.upper = [upper]
+        while len(lower) > 1:
+            lower = np.minimum(lower[0::2], lower[1::2])
+            upper = np.maximum(upper[0::2], upper[1::2])
+            self.lower.insert(0, lower)
+            self.upper.insert(0, upper)
+        self.refits += 1
+
+    def leaf_area(self) -> float:
+        """Soma das áreas das caixas das folhas (custo aproximado da travessia)."""
+        size = np.maximum(self.upper[-1] - self.lower[-1], 0.0)
+        return float((size[:, 0] * size[:, 1] + size[:, 1] * size[:, 2] + size[:, 2] * size[:, 0]).sum())
+
+    def update(self, centers: np.ndarray, radii: np.ndarray):
+        """
+        Refit do frame; refaz a árvore se a qualidade tiver degradado.
+        """
+        self.refit(centers, radii)
+        if self.leaf_area() > self.rebuild_ratio * max(self.build_area, 1e-9):
+            self.build(centers, radii)
+
+    def intersect(self, origin: np.ndarray, direction: np.ndarray, t_max: float = np.inf):
+        """
+        Corpo mais próximo atingido pelo raio. A travessia é feita por níveis:
+        todos os nós atingidos de um nível são testados de uma vez.
+
+        :param origin: Origem do raio.
+        :param direction: Direção normalizada do raio.
+        :param t_max: Distância máxima.
+        :return: Índice do corpo e distância ao longo do raio, ou None; e o número de nós testados.
+        """
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / np.where(direction == 0.0, 1e-30, direction)
+        frontier = np.zeros(1, dtype=np.int64)
+        tested = 0
+        for level in range(self.depth + 1):
+            lower = self.lower[level][frontier]
+            upper = self.upper[level][frontier]
+            tested += len(frontier)
+            t1 = (lower - origin) * inverse
+            t2 = (upper - origin) * inverse
+            near = np.minimum(t1, t2).max(axis=1)
+            far = np.maximum(t1, t2).min(axis=1)
+            hit = (far >= np.maximum(near, 0.0)) & (near <= t_max) & (lower <= upper).all(axis=1)
+            frontier = frontier[hit]
+            if not len(frontier):
+                return None, tested
+            if level < self.depth:
+                frontier = (frontier[:, None] * 2 + np.arange(2)).reshape(-1)
+
+        # Teste exato contra as esferas das folhas atingidas
+        bodies = self.order.reshape(-1, self.leaf_size)[frontier].reshape(-1)
+        bodies = bodies[bodies >= 0]
+        tested += len(bodies)
+        offset = self.centers[bodies] - origin
+        b = offset @ direction
+        c = (offset * offset).sum(axis=1) - self.radii[bodies] ** 2
+        discriminant = b * b - c
+        # Só interessa a entrada na esfera à frente (câmera fora do corpo)
+        with np.errstate(invalid="ignore"):
+            t = b - np.sqrt(discriminant)
+        candidates = (discriminant >= 0.0) & (c > 0.0) & (t >= 0.0) & (t <= t_max)
+        if not candidates.any():
+            return None, tested
+        t = np.where(candidates, t, np.inf)
+        best = int(np.argmin(t))
+        return (int(bodies[best]), float(t[best])), tested
+
+
+class Picker:
+    """
+    Seleção de corpos com o mouse: o cursor é desprojetado pela câmera da
+    vista e o raio é testado contra a BVH dos corpos. A BVH só é atualizada
+    nos frames em que há uma seleção: update apenas guarda o estado do
+    frame, e o refit acontece na primeira seleção feita com ele.
+    """
+
+    def __init__(self, scene, pickable: np.ndarray = None, leaf_size: int = 4, rebuild_ratio: float = 2.0):
+        """
+        :param scene: Cena com os corpos.
+        :param pickable: Máscara dos corpos selecionáveis (padrão: os sujeitos a culling).
+        :param leaf_size: Corpos por folha da BVH.
+        :param rebuild_ratio: Ver BodyBVH.
+        """
+        self.scene = scene
+        self.pickable = scene.cull.copy() if pickable is None else np.asarray(pickable, dtype=bool)
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.bvh: BodyBVH = None
+        self.state = None
+        self.stale = False
+
+        # Estatísticas
+        self.frames = 0
+        self.update_time = 0.0
+        self.updates = 0
+        self.pick_times: list[float] = []
+        self.nodes_tested = 0
+
+    def update(self, state):
+        """Guarda o estado do frame; a BVH é atualizada só se houver uma seleção."""
+        self.frames += 1
+        self.state = state
+        self.stale = True
+
+    def _refresh(self):
+        """Refit (ou construção) da BVH com as esferas do último estado."""
+        inicio = time.perf_counter()
+        state = self.state
+        if self.bvh is None:
+            self.bvh = BodyBVH(state.centers, state.radii, np.flatnonzero(self.pickable),
+                               self.leaf_size, self.rebuild_ratio)
+        else:
+            self.bvh.update(state.centers, state.radii)
+        self.stale = False
+        self.update_time += time.perf_counter() - inicio
+        self.updates += 1
+
+    def pick_ray(self, origin: np.ndarray, direction: np.ndarray, t_max: float = np.inf):
+        """
+        Corpo mais próximo atingido por um raio.
+
+        :return: Índice do corpo e distância, ou None.
+        """
+        if self.stale:
+            self._refresh()
+        inicio = time.perf_counter()
+        hit, tested = self.bvh.intersect(origin, direction, t_max)
+        self.pick_times.append(time.perf_counter() - inicio)
+        self.nodes_tested += tested
+        return hit
+
+    def pick(self, view, x: float, y: float, width: int, height: int):
+        """
+        Corpo sob o cursor em uma vista.
+
+        :param view: Vista desenhada (projection, view, rect e far).
+        :param x: Posição x do cursor na janela.
+        :param y: Posição y do cursor na janela, a partir do topo.
+        :param width: Largura da janela.
+        :param height: Altura da janela.
+        :return: Índice do corpo e distância, ou None.
+        """
+        ray = cursor_ray(view, x, y, width, height)
+        if ray is None:
+            return None
+        return self.pick_ray(*ray, view.far)
+
+    def report(self) -> str:
+        """Latência das seleções, custo de cada refit e custo médio por frame."""
+        updates = max(self.updates, 1)
+        builds = self.bvh.builds if self.bvh is not None else 0
+        total = self.update_time + sum(self.pick_times)
+        text = (f"Seleção: {1000.0 * total / max(self.frames, 1):.3f} ms por frame em média, "
+                f"{self.updates} refits da BVH em {self.frames} frames "
+                f"({1000.0 * self.update_time / updates:.3f} ms cada, {builds} construções)")
+        if self.pick_times:
+            times = np.array(self.pick_times) * 1000.0
+            text += (f", {len(times)} seleções, média {times.mean():.3f} ms, "
+                     f"p95 {np.percentile(times, 95):.3f} ms, "
+                     f"{self.nodes_tested / len(times):.0f} nós testados por seleção")
+        return text
@@ -0,0 +1,161 @@
+# Importando bibliotecas
+import copy
+import time
+import queue
+import threading
+
+
+class ViewPacket:
+    """
+    Resultado da preparação de uma vista em um frame: cópia do estado da
+    Viewport (matrizes, culling) e a lista de desenho já ordenada.
+    """
+
+    def __init__(self, viewport, records, pending):
+        self.name = viewport.name
+        self.rect = viewport.rect
+        self.far = viewport.far
+        # Viewport.update cria objetos novos a cada chamada, então as
+        # referências abaixo não são alteradas pela preparação do próximo frame
+        self.projection = viewport.projection
+        self.view = viewport.view
+        self.visible = viewport.visible
+        self.screen_radius = viewport.screen_radius
+        self.distance = viewport.distance
+        self.focal = viewport.focal
+        self.records = records
+        self.pending = pending
+
+    def pixel_rect(self, width: int, height: int) -> tuple[int, int, int, int]:
+        """Converte o retângulo fracionário para pixels do framebuffer."""
+        x, y, w, h = self.rect
+        return (int(x * width), int(y * height),
+                max(int(w * width), 1), max(int(h * height), 1))
+
+
+class FramePacket:
+    """
+    Tudo o que a thread do OpenGL precisa para submeter um frame: estado
+    da cena e as vistas preparadas.
+    """
+
+    def __init__(self):
+        self.frame = -1
+        self.state = None
+        self.views: list[ViewPacket] = []
+        self.prepare_time = 0.0
+
+
+class FramePipeline:
+    """
+    Pipeline de dois estágios: uma thread de trabalho prepara o frame N+1
+    (avaliação da cena, matrizes das câmeras, culling e ordenação) enquanto
+    a thread principal submete o frame N ao OpenGL.
+
+    Os dois pacotes de frame alternam de dono: a thread de trabalho só
+    escreve em pacotes livres e a principal só lê pacotes prontos, então os
+    dados não são protegidos por locks; a passagem de posse é feita por filas.
+    Sem thread (threaded=False), o frame é preparado na própria chamada.
+    """
+
+    def __init__(self, scene, viewports: list, prepare_view, threaded: bool = True):
+        """
+        :param scene: Cena avaliada a cada frame.
+        :param viewports: Vistas desenhadas.
+        :param prepare_view: Função (vista, estado, índice da vista, pode_carregar)
+                             -> (registros ordenados, modelos pendentes).
+        :param threaded: Se True, prepara os frames em uma thread de trabalho.
+        """
+        self.scene = scene
+        self.viewports = viewports
+        self.prepare_view = prepare_view
+        self.threaded = threaded
+        self.requested = 0
+        self.wait_time = 0.0
+        self.prepare_time = 0.0
+        self.frames = 0
+
+        self._free = queue.SimpleQueue()
+        self._ready = queue.SimpleQueue()
+        self._requests = queue.SimpleQueue()
+        for _ in range(2):
+            self._free.put(FramePacket())
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name="preparacao-frame", daemon=True)
+            self._thread.start()
+
+    def _prepare(self, packet: FramePacket, frame: int, tempo: float, camera,
+                 width: int, height: int, can_load: bool) -> FramePacket:
+        """Preenche um pacote com o frame pedido."""
+        inicio = time.perf_counter()
+        packet.frame = frame
+        packet.state = self.scene.evaluate(tempo)
+        packet.views = []
+        for index, viewport in enumerate(self.viewports):
+            viewport.update(packet.state, width, height, camera)
+            records, pending = self.prepare_view(viewport, packet.state, index, can_load)
+            packet.views.append(ViewPacket(viewport, records, pending))
+        packet.prepare_time = time.perf_counter() - inicio
+        return packet
+
+    def _run(self):
+        """Laço da thread de trabalho: atende os pedidos na ordem."""
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            packet = self._free.get()
+            self._ready.put(self._prepare(packet, *request, False))
+
+    def _request(self, tempo: float, camera, width: int, height: int):
+        # A câmera é copiada porque a entrada continua alterando a original
+        self._requests.put((self.requested, tempo, copy.deepcopy(camera), width, height))
+        self.requested += 1
+
+    def advance(self, tempo: float, camera, width: int, height: int) -> FramePacket:
+        """
+        Pede a preparação do próximo frame e retorna o frame a ser submetido agora.
+
+        Com a thread, o frame retornado foi preparado com a entrada do frame
+        anterior (uma troca de latência por paralelismo); o primeiro pedido é
+        duplicado para encher o pipeline.
+
+        :param tempo: Relógio da simulação.
+        :param camera: Câmera livre (copiada no pedido).
+        :param width: Largura do framebuffer.
+        :param height: Altura do framebuffer.
+        """
+        if not self.threaded:
+            packet = self._prepare(self._free.get(), self.requested, tempo, camera, width, height, True)
+            self.requested += 1
+        else:
+            if self.requested == 0:
+                self._request(tempo, camera, width, height)
+            self._request(tempo, camera, width, height)
+            inicio = time.perf_counter()
+            packet = self._ready.get()
+            self.wait_time += time.perf_counter() - inicio
+        self.prepare_time += packet.prepare_time
+        self.frames += 1
+        return packet
+
+    def recycle(self, packet: FramePacket):
+        """Devolve um pacote já submetido para ser reaproveitado."""
+        self._free.put(packet)
+
+    def close(self):
+        """Encerra a thread de trabalho."""
+        if self._thread is not None:
+            self._requests.put(None)
+            # Libera a thread caso esteja esperando um pacote livre
+            self._free.put(FramePacket())
+            self._thread.join()
+            self._thread = None
+
+    def report(self) -> str:
+        """Tempo médio de preparação e de espera da thread principal por frame."""
+        frames = max(self.frames, 1)
+        modo = "thread de trabalho" if self.threaded else "sequencial"
+        return (f"Pipeline de frames ({modo}): preparação {1000.0 * self.prepare_time / frames:.3f} ms, "
+                f"espera da thread principal {1000.0 * self.wait_time / frames:.3f} ms por frame")
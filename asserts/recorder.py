@@ -0,0 +1,202 @@
+# Importando bibliotecas
+import struct
+import logging
+import numpy as np
+import glm
+
+# Formato do arquivo de gravação:
+#   cabeçalho: magic (8 bytes) + versão (uint32)
+#   registros: tipo (uint8) + timestamp (float64) + payload dependente do tipo
+MAGIC = b"SSINPUT1"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sI")
+_RECORD = struct.Struct("<Bd")
+
+EVENT_MOUSE = 1   # xoffset, yoffset
+EVENT_SCROLL = 2  # yoffset
+EVENT_KEY = 3     # direção da câmera, delta de tempo (já multiplicado pelo Shift)
+EVENT_FRAME = 4   # tempo de simulação, dt, posição, yaw, pitch, zoom
+
+_PAYLOADS = {
+    EVENT_MOUSE: struct.Struct("<ff"),
+    EVENT_SCROLL: struct.Struct("<f"),
+    EVENT_KEY: struct.Struct("<Bf"),
+    EVENT_FRAME: struct.Struct("<df3f3f"),
+}
+
+
+class InputRecorder:
+    """
+    Grava os eventos de entrada (mouse, scroll e teclado) com timestamp e o
+    estado resultante da câmera a cada frame em um arquivo binário compacto.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Caminho do arquivo de gravação.
+        """
+        self.path = path
+        self.frames = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+
+    def _write(self, kind: int, timestamp: float, *values):
+        self._file.write(_RECORD.pack(kind, timestamp))
+        self._file.write(_PAYLOADS[kind].pack(*values))
+
+    def record_mouse(self, timestamp: float, xoffset: float, yoffset: float):
+        """Grava um deslocamento do mouse."""
+        self._write(EVENT_MOUSE, timestamp, xoffset, yoffset)
+
+    def record_scroll(self, timestamp: float, yoffset: float):
+        """Grava um deslocamento do scroll."""
+        self._write(EVENT_SCROLL, timestamp, yoffset)
+
+    def record_key(self, timestamp: float, direction, delta: float):
+        """Grava um movimento da câmera pelo teclado."""
+        self._write(EVENT_KEY, timestamp, direction.value, delta)
+
+    def record_frame(self, timestamp: float, tempo: float, delta: float, camera):
+        """
+        Grava o estado da câmera ao final do processamento de entrada do frame.
+
+        :param timestamp: Tempo de parede do frame.
+        :param tempo: Relógio da simulação.
+        :param delta: Intervalo entre frames.
+        :param camera: Câmera cujo estado será gravado.
+        """
+        p = camera.Position
+        self._write(EVENT_FRAME, timestamp, tempo, delta,
+                    p.x, p.y, p.z, camera.Yaw, camera.Pitch, camera.Zoom)
+        self.frames += 1
+
+    def close(self):
+        """Fecha o arquivo de gravação."""
+        if not self._file.closed:
+            self._file.close()
+            logging.info("Gravação salva em %s (%d frames)", self.path, self.frames)
+
+
+def read_recording(path: str) -> tuple[list, np.ndarray]:
+    """
+    Lê um arquivo de gravação.
+
+    :param path: Caminho do arquivo.
+    :return: Lista de eventos (tipo, timestamp, valores) e um array estruturado
+             com os frames gravados.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Arquivo de gravação inválido: {path}")
+
+    events = []
+    frames = []
+    offset = _HEADER.size
+    while offset < len(data):
+        kind, timestamp = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        payload = _PAYLOADS[kind]
+        values = payload.unpack_from(data, offset)
+        offset += payload.size
+        if kind == EVENT_FRAME:
+            frames.append((timestamp,) + values)
+        else:
+            events.append((kind, timestamp, values))
+
+    frame_dtype = np.dtype([
+        ("timestamp", np.float64),
+        ("tempo", np.float64),
+        ("delta", np.float32),
+        ("Position", np.float32, 3),
+        ("Yaw", np.float32),
+        ("Pitch", np.float32),
+        ("Zoom", np.float32),
+    ])
+    frame_array = np.array(
+        [(f[0], f[1], f[2], f[3:6], f[6], f[7], f[8]) for f in frames],
+        dtype=frame_dtype,
+    )
+    return events, frame_array
+
+
+class InputReplayer:
+    """
+    Reproduz uma gravação em passos de tempo fixos, controlando a câmera e o
+    relógio da simulação de forma determinística, independente da taxa de
+    quadros da máquina.
+    """
+
+    def __init__(self, path: str, fixed_delta: float = 1.0 / 60.0):
+        """
+        :param path: Caminho do arquivo de gravação.
+        :param fixed_delta: Passo de tempo fixo da simulação, em segundos.
+        """
+        self.events, self.frames = read_recording(path)
+        if len(self.frames) == 0:
+            raise ValueError(f"Gravação sem frames: {path}")
+        self.fixed_delta = fixed_delta
+        self.step_index = 0
+        self.frame_times: list[float] = []
+        self._ultimo_tempo_parede = None
+
+    @property
+    def duration(self) -> float:
+        """Duração da gravação em tempo de simulação."""
+        return float(self.frames["tempo"][-1] - self.frames["tempo"][0])
+
+    @property
+    def finished(self) -> bool:
+        """Indica se todos os passos da gravação já foram reproduzidos."""
+        return self.step_index * self.fixed_delta > self.duration
+
+    def state_at(self, tempo: float) -> tuple[glm.vec3, float, float, float]:
+        """
+        Interpola o estado da câmera gravado em um instante da simulação.
+
+        :param tempo: Tempo de simulação (relativo ao início da gravação).
+        :return: Posição, yaw, pitch e zoom.
+        """
+        t = self.frames["tempo"] - self.frames["tempo"][0]
+        position = self.frames["Position"]
+        pos = glm.vec3(*(float(np.interp(tempo, t, position[:, i])) for i in range(3)))
+        yaw = float(np.interp(tempo, t, self.frames["Yaw"]))
+        pitch = float(np.interp(tempo, t, self.frames["Pitch"]))
+        zoom = float(np.interp(tempo, t, self.frames["Zoom"]))
+        return pos, yaw, pitch, zoom
+
+    def step(self, camera, tempo_parede: float = None) -> tuple[float, float]:
+        """
+        Avança um passo fixo aplicando o estado gravado na câmera.
+
+        :param camera: Câmera que será controlada pela gravação.
+        :param tempo_parede: Tempo de parede atual, usado nas estatísticas de frame.
+        :return: Relógio da simulação e o intervalo entre frames (sempre fixo).
+        """
+        if tempo_parede is not None:
+            if self._ultimo_tempo_parede is not None:
+                self.frame_times.append(tempo_parede - self._ultimo_tempo_parede)
+            self._ultimo_tempo_parede = tempo_parede
+
+        tempo = self.step_index * self.fixed_delta
+        camera.Position, camera.Yaw, camera.Pitch, camera.Zoom = self.state_at(tempo)
+        camera.update_camera_vectors()
+        self.step_index += 1
+        return float(self.frames["tempo"][0]) + tempo, self.fixed_delta
+
+    def report(self) -> str:
+        """
+        Gera um resumo dos tempos de frame medidos durante a reprodução.
+        """
+        if not self.frame_times:
+            return "Reprodução sem frames medidos"
+        times = np.array(self.frame_times) * 1000.0
+        return (f"Reprodução: {len(times)} frames, "
+                f"média {times.mean():.3f} ms ({1000.0 / times.mean():.1f} FPS), "
+                f"p50 {np.percentile(times, 50):.3f} ms, "
+                f"p95 {np.percentile(times, 95):.3f} ms, "
+                f"p99 {np.percentile(times, 99):.3f} ms, "
+                f"máx {times.max():.3f} ms")
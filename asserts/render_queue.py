@@ -0,0 +1,176 @@
+# Importando bibliotecas
+import numpy as np
+from OpenGL.GL import *
+
+# Registro compacto de uma submissão de desenho
+record_dtype = np.dtype([
+    ("key", np.uint64),        # chave de ordenação empacotada
+    ("shader", np.uint16),     # índice do programa
+    ("vao", np.uint32),        # índice da malha (VAO) na tabela da fila
+    ("textures", np.uint32),   # índice do conjunto de texturas
+    ("depth", np.float32),     # distância da câmera ao corpo
+    ("transform", np.uint32),  # índice da matriz de modelo no estado da cena
+])
+
+# Layout da chave de 64 bits (do mais para o menos significativo):
+#   [63]     translúcido (desenhado depois dos opacos)
+#   [62..48] programa
+#   [47..32] conjunto de texturas
+#   [31..16] VAO
+#   [15..0]  profundidade quantizada (frente para trás nos opacos)
+_SHADER_SHIFT = np.uint64(48)
+_TEXTURE_SHIFT = np.uint64(32)
+_VAO_SHIFT = np.uint64(16)
+_TRANSLUCENT_BIT = np.uint64(1 << 63)
+
+
+def state_changes(records: np.ndarray) -> int:
+    """
+    Conta as trocas de estado necessárias para desenhar os registros na ordem dada:
+    programas, VAOs e conjuntos de texturas (que são revinculados a cada troca
+    de programa, já que os samplers são uniforms do programa).
+    """
+    if len(records) == 0:
+        return 0
+    shader = np.diff(records["shader"].astype(np.int64), prepend=-1) != 0
+    vao = np.diff(records["vao"].astype(np.int64), prepend=-1) != 0
+    textures = (np.diff(records["textures"].astype(np.int64), prepend=-1) != 0) | shader
+    return int(shader.sum() + vao.sum() + textures.sum())
+
+
+class RenderQueue:
+    """
+    Fila de desenho de uma vista: as submissões são acumuladas como
+    registros compactos, ordenadas por uma chave de 64 bits que agrupa
+    programa, texturas e VAO (e, dentro de um mesmo estado, da frente para
+    trás) e então executadas vinculando apenas o que mudou.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        :param capacity: Número inicial de registros (a fila cresce se necessário).
+        """
+        self.records = np.zeros(capacity, dtype=record_dtype)
+        self.count = 0
+        self.meshes = []            # malha de cada índice de VAO
+        self.texture_sets = []      # malha representante de cada conjunto de texturas
+        self._mesh_ids = {}
+        self._texture_set_ids = {}
+        self.translucent_shaders = set()
+        self.frames = 0
+        self.draws = 0
+        self.changes_submitted = 0
+        self.changes_sorted = 0
+
+    def clear(self):
+        """Esvazia a fila para uma nova vista/frame."""
+        self.count = 0
+
+    def _ids(self, mesh) -> tuple[int, int]:
+        """Índices de VAO e de conjunto de texturas de uma malha."""
+        ids = self._mesh_ids.get(mesh)
+        if ids is None:
+            textures = tuple(tex.resource.key for tex in mesh.textures)
+            texture_set = self._texture_set_ids.get(textures)
+            if texture_set is None:
+                texture_set = len(self.texture_sets)
+                self._texture_set_ids[textures] = texture_set
+                self.texture_sets.append(mesh)
+            ids = self._mesh_ids[mesh] = (len(self.meshes), texture_set)
+            self.meshes.append(mesh)
+        return ids
+
+    def submit(self, shader: int, model, transform: int, depth: float):
+        """
+        Adiciona à fila todas as malhas de um modelo.
+
+        :param shader: Índice do programa.
+        :param model: Modelo já carregado.
+        :param transform: Índice da matriz de modelo no estado da cena.
+        :param depth: Distância da câmera ao corpo.
+        """
+        for mesh in model.meshes:
+            if self.count == len(self.records):
+                self.records = np.concatenate([self.records, np.zeros_like(self.records)])
+            vao, textures = self._ids(mesh)
+            record = self.records[self.count]
+            record["shader"] = shader
+            record["vao"] = vao
+            record["textures"] = textures
+            record["depth"] = depth
+            record["transform"] = transform
+            self.count += 1
+
+    def sort(self, far: float) -> np.ndarray:
+        """
+        Calcula as chaves e ordena os registros da fila.
+
+        :param far: Plano distante da vista (usado na quantização da profundidade).
+        :return: Registros na ordem de execução.
+        """
+        records = self.records[:self.count]
+        # Profundidade em escala logarítmica para manter precisão perto da câmera
+        depth = np.log1p(np.maximum(records["depth"], 0.0)) / np.log1p(far)
+        depth = (np.clip(depth, 0.0, 1.0) * 0xFFFF).astype(np.uint64)
+
+        translucent = np.isin(records["shader"], list(self.translucent_shaders))
+        # Translúcidos vão de trás para frente
+        depth = np.where(translucent, np.uint64(0xFFFF) - depth, depth)
+        records["key"] = ((records["shader"].astype(np.uint64) & np.uint64(0x7FFF)) << _SHADER_SHIFT
+                          | (records["textures"].astype(np.uint64) & np.uint64(0xFFFF)) << _TEXTURE_SHIFT
+                          | (records["vao"].astype(np.uint64) & np.uint64(0xFFFF)) << _VAO_SHIFT
+                          | depth
+                          | np.where(translucent, _TRANSLUCENT_BIT, np.uint64(0)))
+
+        self.frames += 1
+        self.draws += len(records)
+        self.changes_submitted += state_changes(records)
+        ordered = records[np.argsort(records["key"], kind="stable")]
+        self.changes_sorted += state_changes(ordered)
+        return ordered
+
+    def execute(self, records: np.ndarray, shaders: list, matrices: np.ndarray,
+                projection, view, on_draw=None):
+        """
+        Executa os registros ordenados, vinculando programa, texturas e VAO
+        apenas quando mudam.
+
+        :param records: Registros retornados por sort.
+        :param shaders: Lista de shaders indexada pelo campo 'shader'.
+        :param matrices: Matrizes de modelo (n, 4, 4) do estado da cena.
+        :param projection: Matriz de projeção da vista.
+        :param view: Matriz de visualização da vista.
+        :param on_draw: Função opcional (shader, índice da transformação)
+                        chamada antes de cada desenho, para uniforms extras.
+        """
+        shader_atual = vao_atual = texturas_atuais = None
+        shader = None
+        for shader_id, vao, textures, transform in zip(
+                records["shader"].tolist(), records["vao"].tolist(),
+                records["textures"].tolist(), records["transform"].tolist()):
+            if shader_id != shader_atual:
+                shader = shaders[shader_id]
+                shader.use()
+                shader.set_mat4("projection", projection)
+                shader.set_mat4("view", view)
+                shader_atual = shader_id
+                texturas_atuais = None
+            if textures != texturas_atuais:
+                self.texture_sets[textures].bind_textures(shader)
+                texturas_atuais = textures
+            mesh = self.meshes[vao]
+            if vao != vao_atual:
+                mesh.bind()
+                vao_atual = vao
+            if on_draw is not None:
+                on_draw(shader, transform)
+            shader.set_mat4_numpy("model", matrices[transform])
+            mesh.draw_elements()
+        glBindVertexArray(0)
+
+    def report(self) -> str:
+        """Trocas de estado médias por frame, na ordem de submissão e depois da ordenação."""
+        frames = max(self.frames, 1)
+        return (f"Fila de desenho: {self.draws / frames:.1f} desenhos por vista, trocas de estado "
+                f"{self.changes_submitted / frames:.1f} antes e {self.changes_sorted / frames:.1f} "
+                f"depois da ordenação")
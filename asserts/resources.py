@@ -0,0 +1,155 @@
+# Importando bibliotecas
+import os
+import logging
+
+
+class GpuResource:
+    """
+    Registro de um objeto OpenGL controlado pelo GpuResourceManager.
+
+    O objeto é recriado sob demanda (create) depois de despejado (destroy),
+    então quem o usa deve sempre obter o handle atual por GpuResourceManager.use.
+    """
+
+    def __init__(self, kind: str, key, create, destroy, evictable: bool):
+        """
+        :param kind: Tipo do recurso ("texture", "mesh", ...).
+        :param key: Chave única do recurso (por exemplo, o caminho da textura).
+        :param create: Função sem argumentos que cria o objeto e retorna (handle, bytes na GPU).
+        :param destroy: Função que recebe o handle e apaga o objeto.
+        :param evictable: Se o recurso pode ser despejado para respeitar o orçamento.
+        """
+        self.kind = kind
+        self.key = key
+        self.nbytes = 0
+        self.create = create
+        self.destroy = destroy
+        self.evictable = evictable
+        self.handle = None
+        self.refcount = 0
+        self.last_used = -1
+
+    @property
+    def resident(self) -> bool:
+        """Indica se o objeto existe na GPU neste momento."""
+        return self.handle is not None
+
+
+class GpuResourceManager:
+    """
+    Dono central dos objetos OpenGL de texturas e malhas.
+
+    Conta referências entre modelos (a mesma textura é carregada uma única
+    vez), contabiliza os bytes por tipo e, com um orçamento de VRAM,
+    despeja os recursos desenhados há mais tempo (LRU), que são recriados
+    na próxima vez em que forem usados.
+    """
+
+    def __init__(self, budget_bytes: int = 0):
+        """
+        :param budget_bytes: Orçamento de VRAM em bytes (0 para ilimitado).
+        """
+        self.budget_bytes = budget_bytes
+        self.resources: dict = {}
+        self.frame = 0
+        self.evictions = 0
+        self.reloads = 0
+        self.peak_bytes = 0
+        self._over_budget_logged = False
+
+    def acquire(self, kind: str, key, create, destroy, evictable: bool = True) -> GpuResource:
+        """
+        Obtém um recurso, criando-o na primeira referência.
+
+        :return: Registro do recurso (com a referência já contada).
+        """
+        resource = self.resources.get(key)
+        if resource is None:
+            resource = GpuResource(kind, key, create, destroy, evictable)
+            self.resources[key] = resource
+            self._create(resource)
+        resource.refcount += 1
+        return resource
+
+    def release(self, resource: GpuResource):
+        """
+        Devolve uma referência; o objeto é apagado quando não há mais referências.
+        """
+        resource.refcount -= 1
+        if resource.refcount > 0:
+            return
+        if resource.resident:
+            resource.destroy(resource.handle)
+            resource.handle = None
+        self.resources.pop(resource.key, None)
+
+    def use(self, resource: GpuResource):
+        """
+        Marca o recurso como usado no frame atual, recriando-o se tiver sido despejado.
+
+        :return: Handle atual do objeto.
+        """
+        resource.last_used = self.frame
+        if not resource.resident:
+            self.reloads += 1
+            self._create(resource)
+        return resource.handle
+
+    def begin_frame(self):
+        """Avança o contador de frames usado pelo LRU."""
+        self.frame += 1
+
+    def _create(self, resource: GpuResource):
+        resource.handle, resource.nbytes = resource.create()
+        resource.last_used = self.frame
+        self.enforce_budget()
+        self.peak_bytes = max(self.peak_bytes, self.resident_bytes())
+
+    def resident_bytes(self, kind: str = None) -> int:
+        """Bytes dos recursos residentes (de um tipo ou de todos)."""
+        return sum(r.nbytes for r in self.resources.values()
+                   if r.resident and (kind is None or r.kind == kind))
+
+    def enforce_budget(self):
+        """
+        Despeja os recursos usados há mais tempo até caber no orçamento.
+        Recursos usados no frame atual nunca são despejados.
+        """
+        if not self.budget_bytes:
+            return
+        total = self.resident_bytes()
+        if total <= self.budget_bytes:
+            return
+        candidates = sorted((r for r in self.resources.values()
+                             if r.resident and r.evictable and r.last_used < self.frame),
+                            key=lambda r: r.last_used)
+        for resource in candidates:
+            if total <= self.budget_bytes:
+                break
+            resource.destroy(resource.handle)
+            resource.handle = None
+            total -= resource.nbytes
+            self.evictions += 1
+        if total > self.budget_bytes and not self._over_budget_logged:
+            logging.warning("Orçamento de VRAM excedido pelos recursos do frame atual: %.1f MB",
+                            total / (1024.0 * 1024.0))
+            self._over_budget_logged = True
+
+    def report(self) -> str:
+        """Resumo da memória por tipo, orçamento e atividade do LRU."""
+        mb = 1024.0 * 1024.0
+        kinds = sorted({r.kind for r in self.resources.values()})
+        parts = []
+        for kind in kinds:
+            items = [r for r in self.resources.values() if r.kind == kind]
+            resident = [r for r in items if r.resident]
+            parts.append(f"{kind} {len(resident)}/{len(items)} "
+                         f"{sum(r.nbytes for r in resident) / mb:.1f} MB")
+        budget = f"{self.budget_bytes / mb:.0f} MB" if self.budget_bytes else "ilimitado"
+        return (f"Recursos da GPU: {', '.join(parts) or 'nenhum'}; residente "
+                f"{self.resident_bytes() / mb:.1f} MB (pico {self.peak_bytes / mb:.1f} MB, "
+                f"orçamento {budget}), {self.evictions} despejos, {self.reloads} recargas")
+
+
+# Gerenciador compartilhado por malhas e modelos (orçamento em MB pela variável de ambiente)
+gpu_resources = GpuResourceManager(int(float(os.environ.get("SOLAR_SYSTEM_VRAM_BUDGET", "0")) * 1024 * 1024))
@@ -0,0 +1,204 @@
+# Importando bibliotecas
+import numpy as np
+
+
+class Body:
+    """
+    Descreve um corpo da cena (planeta, lua, anel, órbita ou fundo).
+
+    A matriz de modelo segue a mesma composição usada com o glm:
+    matriz_do_pai * escala * rotação(tempo * velocidade + fase, eixo) * translação(offset)
+    """
+
+    def __init__(self, name: str, model: str, shader: str, scale: float = 1.0,
+                 speed: float = 0.0, phase: float = 0.0, offset=(0.0, 0.0, 0.0),
+                 axis=(0.0, 1.0, 0.0), parent: str = None, cull: bool = True):
+        """
+        :param name: Nome único do corpo.
+        :param model: Chave do modelo usado para desenhar o corpo.
+        :param shader: Chave do shader usado para desenhar o corpo.
+        :param scale: Escala uniforme aplicada sobre a matriz do pai.
+        :param speed: Velocidade angular (radianos por unidade de tempo).
+        :param phase: Ângulo inicial da rotação.
+        :param offset: Translação aplicada após a rotação.
+        :param axis: Eixo de rotação.
+        :param parent: Nome do corpo pai (None para corpos na origem).
+        :param cull: Se False, o corpo nunca é descartado pelo culling.
+        """
+        self.name = name
+        self.model = model
+        self.shader = shader
+        self.scale = scale
+        self.speed = speed
+        self.phase = phase
+        self.offset = offset
+        self.axis = axis
+        self.parent = parent
+        self.cull = cull
+
+
+class SceneState:
+    """
+    Resultado da avaliação da cena em um instante: matrizes de modelo e
+    esferas envolventes em coordenadas de mundo, compartilhadas por todas as vistas.
+    """
+
+    def __init__(self, scene, tempo: float, matrices: np.ndarray, radii: np.ndarray):
+        self.scene = scene
+        self.tempo = tempo
+        self.matrices = matrices        # (n, 4, 4) em ordem matemática (por linhas)
+        self.centers = matrices[:, :3, 3]
+        self.radii = radii
+
+    def index(self, name: str) -> int:
+        """Retorna o índice do corpo com o nome informado."""
+        return self.scene.index[name]
+
+
+class Scene:
+    """
+    Tabela de corpos avaliada de forma vetorizada com NumPy: todas as matrizes
+    de um mesmo nível da hierarquia são compostas de uma vez.
+    """
+
+    def __init__(self, bodies: list[Body]):
+        """
+        :param bodies: Corpos na ordem de desenho; o pai deve vir antes dos filhos.
+        """
+        self.bodies = list(bodies)
+        self.index = {body.name: i for i, body in enumerate(self.bodies)}
+        n = len(self.bodies)
+
+        self.parent = np.full(n, -1, dtype=np.int64)
+        for i, body in enumerate(self.bodies):
+            if body.parent is not None:
+                parent = self.index[body.parent]
+                if parent >= i:
+                    raise ValueError(f"O pai de {body.name} deve ser declarado antes dele")
+                self.parent[i] = parent
+
+        self.scale = np.array([b.scale for b in self.bodies], dtype=np.float64)
+        self.speed = np.array([b.speed for b in self.bodies], dtype=np.float64)
+        self.phase = np.array([b.phase for b in self.bodies], dtype=np.float64)
+        self.offset = np.array([b.offset for b in self.bodies], dtype=np.float64).reshape(n, 3)
+        axis = np.array([b.axis for b in self.bodies], dtype=np.float64).reshape(n, 3)
+        self.axis = axis / np.linalg.norm(axis, axis=1, keepdims=True)
+        self.cull = np.array([b.cull for b in self.bodies], dtype=bool)
+        self.model_radius = np.ones(n, dtype=np.float64)
+
+        # Agrupa os corpos por profundidade na hierarquia
+        depth = np.zeros(n, dtype=np.int64)
+        for i in range(n):
+            if self.parent[i] >= 0:
+                depth[i] = depth[self.parent[i]] + 1
+        self.levels = [np.flatnonzero(depth == d) for d in range(depth.max() + 1 if n else 0)]
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def bind_models(self, models: dict):
+        """
+        Usa o raio de cada modelo para calcular as esferas envolventes.
+
+        :param models: Dicionário chave do modelo -> objeto com atributo 'radius'.
+        """
+        for i, body in enumerate(self.bodies):
+            model = models.get(body.model)
+            if model is not None:
+                self.model_radius[i] = model.radius
+
+    def local_matrices(self, tempo: float) -> np.ndarray:
+        """
+        Calcula as matrizes locais (escala * rotação * translação) de todos os corpos.
+
+        :param tempo: Relógio da simulação.
+        :return: Array (n, 4, 4).
+        """
+        n = len(self.bodies)
+        angle = tempo * self.speed + self.phase
+        c = np.cos(angle)[:, None, None]
+        s = np.sin(angle)[:, None, None]
+        k = self.axis
+
+        # Fórmula de Rodrigues para a rotação em torno de um eixo arbitrário
+        cross = np.zeros((n, 3, 3))
+        cross[:, 0, 1] = -k[:, 2]
+        cross[:, 0, 2] = k[:, 1]
+        cross[:, 1, 0] = k[:, 2]
+        cross[:, 1, 2] = -k[:, 0]
+        cross[:, 2, 0] = -k[:, 1]
+        cross[:, 2, 1] = k[:, 0]
+        outer = k[:, :, None] * k[:, None, :]
+        rotation = c * np.eye(3) + s * cross + (1.0 - c) * outer
+        linear = rotation * self.scale[:, None, None]
+
+        local = np.zeros((n, 4, 4))
+        local[:, :3, :3] = linear
+        local[:, :3, 3] = np.einsum("nij,nj->ni", linear, self.offset)
+        local[:, 3, 3] = 1.0
+        return local
+
+    def evaluate(self, tempo: float) -> SceneState:
+        """
+        Avalia a hierarquia inteira uma única vez para o instante informado.
+
+        :param tempo: Relógio da simulação.
+        :return: Estado da cena com matrizes e esferas envolventes em mundo.
+        """
+        world = self.local_matrices(tempo)
+        for level in self.levels[1:]:
+            world[level] = world[self.parent[level]] @ world[level]
+
+        # Raio em mundo: raio do modelo vezes o maior fator de escala da matriz
+        scale = np.linalg.norm(world[:, :3, :3], axis=1).max(axis=1)
+        radii = self.model_radius * scale
+        return SceneState(self, tempo, world.astype(np.float32), radii)
+
+
+def solar_system(background: bool = True) -> Scene:
+    """
+    Monta a cena do sistema solar na mesma ordem de desenho usada originalmente.
+
+    :param background: Inclui a esfera de estrelas (desnecessária com o skybox).
+    """
+    jupiter_moons = [
+        (-40, 0, 10), (-30, 15, -20), (-25, -10, 10), (-25, 10, 20), (-40, -15, 10),
+        (-20, 5, 5), (-22, -3, 3), (-28, 2, 2), (-30, -1, 1),
+    ]
+    orbits = [
+        ("Mercury", 180), ("Venus", 350), ("Earth", 450), ("Mars", 655),
+        ("Jupiter", 1350), ("Saturn", 2550), ("Uranus", 3650), ("Neptune", 5300),
+    ]
+
+    # Background e Sol (planetas_shader)
+    bodies = [Body("Stars", "Stars", "planetas", scale=4000, cull=False)] if background else []
+    bodies += [
+        Body("Sun", "Sun", "planetas", scale=50),
+
+        # Planetas, luas e anéis (light_shader)
+        Body("Mercury", "Mercury", "light", scale=10, speed=1.0, offset=(0, 0, 17.5)),
+        Body("Venus", "Venus", "light", scale=15, speed=1 / 2, offset=(0, 0, 22)),
+        Body("Earth", "Earth", "light", scale=17, speed=1 / 6, offset=(0, 0, 26)),
+        Body("Moon", "Moon", "light", scale=0.5, speed=1 / 6, offset=(-3, 0, 8), parent="Earth"),
+        Body("Mars", "Mars", "light", scale=13, speed=1 / 6.5, offset=(0, 0, 50)),
+        Body("Jupiter", "Jupiter", "light", scale=45, speed=1 / 8, offset=(0, 0, 30)),
+    ]
+    bodies += [
+        Body(f"JupiterMoon{i + 1}", "Moon", "light", scale=0.1, speed=1 / 4,
+             offset=offset, parent="Jupiter")
+        for i, offset in enumerate(jupiter_moons)
+    ]
+    bodies += [
+        Body("Saturn", "Saturn", "light", scale=42, speed=1 / 10, offset=(0, 0, 60)),
+        Body("SaturnRing", "Orbita3", "light", scale=4, speed=1.0, phase=-60.0, parent="Saturn"),
+        Body("Uranus", "Uranus", "light", scale=30, speed=1 / 12, offset=(0, 0, 120)),
+        Body("Neptune", "Neptune", "light", scale=29, speed=1 / 14, offset=(0, 0, 180)),
+        Body("NeptuneRing", "Orbita3", "light", scale=4, speed=1 / 4, axis=(0, 0, 1), parent="Neptune"),
+    ]
+
+    # Órbitas (cor_shader)
+    bodies += [
+        Body(f"Orbit{name}", "Orbita", "cor", scale=radius)
+        for name, radius in orbits
+    ]
+    return Scene(bodies)
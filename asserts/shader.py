@@ -1,61 +1,30 @@
 # Importando bibliotecas
 from OpenGL.GL import *
 import glm
+from asserts.shader_cache import shader_cache
+from asserts.asset_pack import assets
 
 class Shader:
     """
     Classe para gerenciamento de shaders
     """
-    def __init__(self, vertex_path, fragment_path, geometry_path=None):
-        # Lê os arquivos dos shaders
-        with open(vertex_path, 'r') as file:
-            vertex_code = file.read()
-        with open(fragment_path, 'r') as file:
-            fragment_code = file.read()
+    def __init__(self, vertex_path, fragment_path, geometry_path=None, cache=None):
+        self.cache = cache if cache is not None else shader_cache
+
+        # Lê os arquivos dos shaders (do pacote de assets, se houver)
+        vertex_code = assets.read_text(vertex_path)
+        fragment_code = assets.read_text(fragment_path)
         
         # Lê o arquivo de geometria, se fornecido
         geometry_code = None
         if geometry_path is not None:
-            with open(geometry_path, 'r') as file:
-                geometry_code = file.read()
-        
-        # Compila o shader de vértice
-        vertex_shader = glCreateShader(GL_VERTEX_SHADER)
-        glShaderSource(vertex_shader, vertex_code)
-        glCompileShader(vertex_shader)
-        self.check_compile_errors(vertex_shader, "VERTEX")
-        
-        # Compila o shader de fragmento
-        fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)
-        glShaderSource(fragment_shader, fragment_code)
-        glCompileShader(fragment_shader)
-        self.check_compile_errors(fragment_shader, "FRAGMENT")
-        
-        # Compila o shader de geometria, se fornecido
-        if geometry_path is not None and geometry_code is not None:
-            geometry_shader = glCreateShader(GL_GEOMETRY_SHADER)
-            glShaderSource(geometry_shader, geometry_code)
-            glCompileShader(geometry_shader)
-            self.check_compile_errors(geometry_shader, "GEOMETRY")
+            geometry_code = assets.read_text(geometry_path)
         
-        # Cria o programa de shader e anexa os shaders compilados
-        self.ID = glCreateProgram()
-        glAttachShader(self.ID, vertex_shader)
-        glAttachShader(self.ID, fragment_shader)
-
-        # Anexa o shader de geometria, se fornecido
-        if geometry_path is not None and geometry_code is not None:
-            glAttachShader(self.ID, geometry_shader)
-        glLinkProgram(self.ID)
-        self.check_compile_errors(self.ID, "PROGRAM")
-        
-        # Deleta os shaders, pois já estão linkados no programa
-        glDeleteShader(vertex_shader)
-        glDeleteShader(fragment_shader)
-        
-        # Deleta o shader de geometria, se fornecido
-        if geometry_path is not None and geometry_code is not None:
-            glDeleteShader(geometry_shader)
+        # Compila e linka o programa, reaproveitando estágios e binários em cache
+        sources = [(GL_VERTEX_SHADER, vertex_code), (GL_FRAGMENT_SHADER, fragment_code)]
+        if geometry_code is not None:
+            sources.append((GL_GEOMETRY_SHADER, geometry_code))
+        self.ID = self.cache.program(sources, self.check_compile_errors)
     
     def use(self):
         """Ativa o programa de shader."""
@@ -109,6 +78,10 @@ class Shader:
         """Define uma matriz 4x4 na variável uniforme."""
         glUniformMatrix4fv(glGetUniformLocation(self.ID, name.encode()), 1, GL_FALSE, glm.value_ptr(mat))
     
+    def set_mat4_numpy(self, name, mat):
+        """Define uma matriz 4x4 (array NumPy em ordem matemática) na variável uniforme."""
+        glUniformMatrix4fv(glGetUniformLocation(self.ID, name.encode()), 1, GL_TRUE, mat)
+    
     def check_compile_errors(self, shader, type):
         """
         Verifica e exibe mensagens de erro durante a compilação e o link dos shaders/programas.
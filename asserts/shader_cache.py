@@ -0,0 +1,203 @@
+# Importando bibliotecas
+import os
+import time
+import struct
+import hashlib
+import logging
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.error import GLError, NullFunctionError
+from asserts.utils import cache_path
+
+_BINARY_HEADER = struct.Struct("<4sI")
+_BINARY_MAGIC = b"SPRG"
+
+STAGE_NAMES = {
+    GL_VERTEX_SHADER: "VERTEX",
+    GL_FRAGMENT_SHADER: "FRAGMENT",
+    GL_GEOMETRY_SHADER: "GEOMETRY",
+}
+
+
+class ShaderCache:
+    """
+    Cache de shaders: evita compilar duas vezes o mesmo código-fonte em uma
+    execução (deduplicação por hash do conteúdo) e guarda os programas
+    linkados em disco com glGetProgramBinary, para recarregá-los com
+    glProgramBinary nas próximas execuções.
+    """
+
+    def __init__(self, directory: str = "shaders", use_binary: bool = True):
+        """
+        :param directory: Subdiretório do cache em disco.
+        :param use_binary: Se False, apenas a deduplicação em memória é usada.
+        """
+        self.directory = directory
+        self.use_binary = use_binary
+        self.stages: dict = {}     # (tipo, hash do código) -> id do shader compilado
+        self._driver = None
+
+        # Estatísticas
+        self.compile_time = 0.0
+        self.stages_compiled = 0
+        self.stages_reused = 0
+        self.binary_hits = 0
+        self.binary_misses = 0
+
+    def driver_key(self) -> str:
+        """
+        Identifica o driver (fabricante, renderizador e versão): binários de
+        programa só são válidos para o mesmo driver.
+        """
+        if self._driver is None:
+            parts = []
+            for name in (GL_VENDOR, GL_RENDERER, GL_VERSION):
+                value = glGetString(name)
+                parts.append(value.decode() if value else "")
+            self._driver = "|".join(parts)
+        return self._driver
+
+    def binary_supported(self) -> bool:
+        """Verifica se o driver expõe algum formato de binário de programa."""
+        if not self.use_binary:
+            return False
+        try:
+            return int(glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS)) > 0
+        except (GLError, NullFunctionError):
+            return False
+
+    def program_key(self, sources: list) -> str:
+        """
+        Hash do programa: driver + tipo e código de cada estágio.
+
+        :param sources: Lista de (tipo do estágio, código-fonte).
+        """
+        digest = hashlib.sha256(self.driver_key().encode())
+        for stage_type, code in sources:
+            digest.update(str(int(stage_type)).encode())
+            digest.update(hashlib.sha256(code.encode()).digest())
+        return digest.hexdigest()
+
+    def stage(self, stage_type, code: str, check) -> int:
+        """
+        Compila um estágio ou reaproveita um já compilado com o mesmo código.
+
+        :param stage_type: GL_VERTEX_SHADER, GL_FRAGMENT_SHADER ou GL_GEOMETRY_SHADER.
+        :param code: Código-fonte GLSL.
+        :param check: Função que verifica os erros de compilação.
+        :return: ID do shader.
+        """
+        key = (int(stage_type), hashlib.sha256(code.encode()).hexdigest())
+        if key in self.stages:
+            self.stages_reused += 1
+            return self.stages[key]
+
+        shader = glCreateShader(stage_type)
+        glShaderSource(shader, code)
+        glCompileShader(shader)
+        check(shader, STAGE_NAMES[stage_type])
+        self.stages[key] = shader
+        self.stages_compiled += 1
+        return shader
+
+    def program(self, sources: list, check) -> int:
+        """
+        Retorna um programa linkado, carregando o binário do disco quando possível.
+
+        :param sources: Lista de (tipo do estágio, código-fonte).
+        :param check: Função que verifica erros de compilação e de link.
+        :return: ID do programa.
+        """
+        inicio = time.perf_counter()
+        use_binary = self.binary_supported()
+        path = cache_path(self.directory, self.program_key(sources) + ".bin") if use_binary else None
+
+        program = self._load_binary(path) if use_binary else None
+        if program is None:
+            if use_binary:
+                self.binary_misses += 1
+            program = glCreateProgram()
+            shaders = [self.stage(stage_type, code, check) for stage_type, code in sources]
+            for shader in shaders:
+                glAttachShader(program, shader)
+            if use_binary:
+                glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+            glLinkProgram(program)
+            check(program, "PROGRAM")
+            for shader in shaders:
+                glDetachShader(program, shader)
+            if use_binary and glGetProgramiv(program, GL_LINK_STATUS):
+                self._save_binary(program, path)
+        else:
+            self.binary_hits += 1
+
+        self.compile_time += time.perf_counter() - inicio
+        return program
+
+    def _load_binary(self, path: str):
+        """
+        Tenta recriar o programa a partir do binário salvo; retorna None se
+        o arquivo não existir ou se o driver recusar o binário.
+        """
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as file:
+            data = file.read()
+        # Arquivo truncado (gravação interrompida): compila de novo
+        if len(data) <= _BINARY_HEADER.size:
+            return None
+        magic, binary_format = _BINARY_HEADER.unpack_from(data, 0)
+        if magic != _BINARY_MAGIC:
+            return None
+        binary = np.frombuffer(data, dtype=np.uint8, offset=_BINARY_HEADER.size)
+
+        program = glCreateProgram()
+        try:
+            glProgramBinary(program, binary_format, binary, binary.size)
+        except GLError:
+            glDeleteProgram(program)
+            return None
+        if not glGetProgramiv(program, GL_LINK_STATUS):
+            # Driver atualizado ou binário incompatível: volta a compilar
+            glDeleteProgram(program)
+            logging.info("Binário de shader inválido, recompilando: %s", path)
+            return None
+        return program
+
+    def _save_binary(self, program: int, path: str):
+        """Salva o binário do programa linkado no cache em disco."""
+        size = int(glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH))
+        if size <= 0:
+            return
+        length = np.zeros(1, dtype=np.int32)
+        binary_format = np.zeros(1, dtype=np.uint32)
+        binary = np.zeros(size, dtype=np.uint8)
+        try:
+            glGetProgramBinary(program, size, length, binary_format, binary)
+        except GLError:
+            return
+        # Temporário por processo + renomeação: vários processos podem gerar o mesmo binário
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(_BINARY_HEADER.pack(_BINARY_MAGIC, int(binary_format[0])))
+            file.write(binary[:int(length[0])].tobytes())
+        os.replace(temporary, path)
+
+    def release_stages(self):
+        """
+        Deleta os estágios compilados; deve ser chamada depois que o último
+        programa foi linkado (shaders criados depois compilam os estágios de novo).
+        """
+        for shader in self.stages.values():
+            glDeleteShader(shader)
+        self.stages.clear()
+
+    def report(self) -> str:
+        """Resumo do tempo de compilação dos shaders na inicialização."""
+        return (f"Shaders: {1000.0 * self.compile_time:.1f} ms, "
+                f"{self.stages_compiled} estágios compilados, {self.stages_reused} reaproveitados, "
+                f"binários em cache: {self.binary_hits} carregados, {self.binary_misses} gerados")
+
+
+# Cache compartilhado por todos os shaders da aplicação
+shader_cache = ShaderCache()
@@ -8,6 +8,38 @@ in vec2 TexCoords;
 
 uniform sampler2D texture_diffuse1;
 
+// Textura virtual (ver asserts/virtual_texture.py)
+const float VT_CONTENT = 128.0;
+const float VT_BORDER = 4.0;
+const float VT_TILE = VT_CONTENT + 2.0 * VT_BORDER;
+uniform bool use_virtual_texture;
+uniform sampler2D vt_atlas;
+uniform sampler2D vt_indirection;
+uniform vec4 vt_info;           // tiles_x, tiles_y (nível 0), último nível, id
+uniform float vt_atlas_slots;
+uniform float vt_lod_bias;
+
+float vt_lod(vec2 uv)
+{
+    vec2 texel = uv * vt_info.xy * VT_CONTENT;
+    vec2 dx = dFdx(texel);
+    vec2 dy = dFdy(texel);
+    return clamp(0.5 * log2(max(dot(dx, dx), dot(dy, dy))) + vt_lod_bias, 0.0, vt_info.z);
+}
+
+vec4 sample_virtual(vec2 uv)
+{
+    float level = floor(vt_lod(uv));
+    vec2 wrapped = vec2(fract(uv.x), clamp(uv.y, 0.0, 0.99999));
+
+    // A indireção aponta para o tile residente mais fino que cobre este ponto
+    vec4 entry = floor(textureLod(vt_indirection, wrapped, level) * 255.0 + 0.5);
+    vec2 tiles = max(floor(vt_info.xy / exp2(entry.z)), vec2(1.0));
+    vec2 local = fract(wrapped * tiles);
+    vec2 atlas = (entry.xy * VT_TILE + VT_BORDER + local * VT_CONTENT) / (vt_atlas_slots * VT_TILE);
+    return textureLod(vt_atlas, atlas, 0.0);
+}
+
 void main()
 {
     vec3 lightColor = vec3(1.0,1.0,1.0);
@@ -16,6 +48,7 @@ void main()
     float dotProduct = dot(normalVector, lightVector);
     float brightness = max(dotProduct, 0.38);
     vec3 diffuse = brightness * lightColor;
-    FragColor = vec4(diffuse, 1.0) * texture(texture_diffuse1, TexCoords);
+    vec4 albedo = use_virtual_texture ? sample_virtual(TexCoords) : texture(texture_diffuse1, TexCoords);
+    FragColor = vec4(diffuse, 1.0) * albedo;
 
 }
\ No newline at end of file
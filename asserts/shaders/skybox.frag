@@ -0,0 +1,11 @@
+#version 330 core
+out vec4 FragColor;
+
+in vec3 Direction;
+
+uniform samplerCube skybox;
+
+void main()
+{
+    FragColor = texture(skybox, Direction);
+}
@@ -0,0 +1,16 @@
+#version 330 core
+layout (location = 0) in vec3 aPos;
+
+out vec3 Direction;
+
+uniform mat4 view;
+uniform mat4 projection;
+
+void main()
+{
+    Direction = aPos;
+    //Remove a translação da câmera: o fundo fica sempre "no infinito"
+    vec4 pos = projection * mat4(mat3(view)) * vec4(aPos, 1.0);
+    //z = w coloca o fundo na profundidade máxima (1.0), testado com GL_LEQUAL
+    gl_Position = pos.xyww;
+}
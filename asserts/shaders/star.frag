@@ -0,0 +1,13 @@
+#version 330 core
+out vec4 FragColor;
+
+in vec3 Color;
+in float Brightness;
+
+void main()
+{
+    //Disco suave: o brilho cai do centro para a borda do ponto
+    vec2 d = gl_PointCoord * 2.0 - 1.0;
+    float falloff = max(1.0 - dot(d, d), 0.0);
+    FragColor = vec4(Color * Brightness * falloff, 1.0);
+}
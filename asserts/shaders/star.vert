@@ -0,0 +1,43 @@
+#version 330 core
+layout (location = 0) in vec3 aPosition;
+layout (location = 1) in vec2 aPhotometry;
+
+out vec3 Color;
+out float Brightness;
+
+uniform mat4 view;
+uniform mat4 projection;
+uniform float magnitudeLimit;
+uniform float pointScale;
+
+//Cor aproximada a partir do índice de cor B-V (azul, branca, laranja)
+vec3 bvToRgb(float bv)
+{
+    float t = clamp((bv + 0.4) / 2.4, 0.0, 1.0);
+    vec3 blue = vec3(0.62, 0.72, 1.0);
+    vec3 white = vec3(1.0, 0.97, 0.92);
+    vec3 orange = vec3(1.0, 0.63, 0.36);
+    return t < 0.4 ? mix(blue, white, t / 0.4) : mix(white, orange, (t - 0.4) / 0.6);
+}
+
+void main()
+{
+    float magnitude = aPhotometry.x;
+    if (magnitude > magnitudeLimit)
+    {
+        //Mais fraca que o limite: fica fora do volume de recorte
+        gl_Position = vec4(2.0, 2.0, 2.0, 1.0);
+        gl_PointSize = 0.0;
+        return;
+    }
+
+    //Fluxo relativo ao limite (5 magnitudes = 100 vezes mais brilhante)
+    float flux = pow(10.0, 0.4 * (magnitudeLimit - magnitude));
+    gl_PointSize = clamp(pointScale * pow(flux, 0.25), 1.0, 12.0);
+    Brightness = clamp(0.25 * sqrt(flux), 0.1, 1.0);
+    Color = bvToRgb(aPhotometry.y);
+
+    //Estrelas no infinito, como o skybox: só a rotação da câmera importa
+    vec4 pos = projection * mat4(mat3(view)) * vec4(normalize(aPosition), 1.0);
+    gl_Position = pos.xyww;
+}
@@ -0,0 +1,12 @@
+#version 330 core
+out vec4 FragColor;
+
+in float Alpha;
+
+uniform vec3 color;
+
+void main()
+{
+    //O rastro desaparece com a idade da amostra
+    FragColor = vec4(color, Alpha * Alpha);
+}
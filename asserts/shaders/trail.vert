@@ -0,0 +1,16 @@
+#version 330 core
+layout (location = 0) in vec4 aSample;
+
+out float Alpha;
+
+uniform mat4 view;
+uniform mat4 projection;
+uniform float now;
+uniform float duration;
+
+void main()
+{
+    //xyz = posição do corpo na amostra, w = instante da amostra
+    Alpha = clamp(1.0 - (now - aSample.w) / duration, 0.0, 1.0);
+    gl_Position = projection * view * vec4(aSample.xyz, 1.0);
+}
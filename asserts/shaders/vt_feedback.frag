@@ -0,0 +1,22 @@
+#version 330 core
+out vec4 FragColor;
+
+in vec2 TexCoords;
+
+// Passe de feedback da textura virtual: grava (tile x, tile y, mip, id + 1)
+const float VT_CONTENT = 128.0;
+uniform vec4 vt_info;           // tiles_x, tiles_y (nível 0), último nível, id
+uniform float vt_lod_bias;
+
+void main()
+{
+    vec2 texel = TexCoords * vt_info.xy * VT_CONTENT;
+    vec2 dx = dFdx(texel);
+    vec2 dy = dFdy(texel);
+    float level = floor(clamp(0.5 * log2(max(dot(dx, dx), dot(dy, dy))) + vt_lod_bias, 0.0, vt_info.z));
+
+    vec2 wrapped = vec2(fract(TexCoords.x), clamp(TexCoords.y, 0.0, 0.99999));
+    vec2 tiles = max(floor(vt_info.xy / exp2(level)), vec2(1.0));
+    vec2 tile = min(floor(wrapped * tiles), tiles - 1.0);
+    FragColor = vec4(tile.x, tile.y, level, vt_info.w + 1.0) / 255.0;
+}
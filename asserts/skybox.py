@@ -0,0 +1,201 @@
+# Importando bibliotecas
+import os
+import ctypes
+import hashlib
+import logging
+import numpy as np
+from OpenGL.GL import *
+from asserts.utils import cache_path
+
+# Cubo unitário desenhado por dentro (36 vértices, sem índices)
+_CUBE = np.array([
+    -1, 1, -1, -1, -1, -1, 1, -1, -1, 1, -1, -1, 1, 1, -1, -1, 1, -1,
+    -1, -1, 1, -1, -1, -1, -1, 1, -1, -1, 1, -1, -1, 1, 1, -1, -1, 1,
+    1, -1, -1, 1, -1, 1, 1, 1, 1, 1, 1, 1, 1, 1, -1, 1, -1, -1,
+    -1, -1, 1, -1, 1, 1, 1, 1, 1, 1, 1, 1, 1, -1, 1, -1, -1, 1,
+    -1, 1, -1, 1, 1, -1, 1, 1, 1, 1, 1, 1, -1, 1, 1, -1, 1, -1,
+    -1, -1, -1, -1, -1, 1, 1, -1, -1, 1, -1, -1, -1, -1, 1, 1, -1, 1,
+], dtype=np.float32)
+
+
+def cube_face_directions(size: int) -> np.ndarray:
+    """
+    Direção de cada texel das 6 faces, na ordem e convenção do OpenGL
+    (+X, -X, +Y, -Y, +Z, -Z; a primeira linha de cada face é t = 0).
+
+    :return: Array (6, size, size, 3) de vetores normalizados.
+    """
+    coords = 2.0 * (np.arange(size) + 0.5) / size - 1.0
+    tc, sc = np.meshgrid(coords, coords, indexing="ij")
+    one = np.ones_like(sc)
+    faces = np.stack([
+        np.stack([one, -tc, -sc], axis=-1),
+        np.stack([-one, -tc, sc], axis=-1),
+        np.stack([sc, one, tc], axis=-1),
+        np.stack([sc, -one, -tc], axis=-1),
+        np.stack([sc, -tc, one], axis=-1),
+        np.stack([-sc, -tc, -one], axis=-1),
+    ])
+    return faces / np.linalg.norm(faces, axis=-1, keepdims=True)
+
+
+def sample_equirectangular(image: np.ndarray, directions: np.ndarray) -> np.ndarray:
+    """
+    Amostra (bilinear) uma imagem equirretangular nas direções dadas, com o
+    mesmo mapeamento das UVs da esfera Stars.obj: u = 0.5 + atan2(z, x) / 2π
+    e a linha (a partir do topo da imagem) = 0.5 + asin(y) / π.
+    """
+    h, w = image.shape[:2]
+    x, y, z = directions[..., 0], directions[..., 1], directions[..., 2]
+    u = 0.5 + np.arctan2(z, x) / (2.0 * np.pi)
+    v = 0.5 + np.arcsin(np.clip(y, -1.0, 1.0)) / np.pi
+
+    px = u * w - 0.5
+    py = np.clip(v * h - 0.5, 0.0, h - 1.0)
+    x0 = np.floor(px).astype(np.int64)
+    y0 = np.floor(py).astype(np.int64)
+    fx = (px - x0)[..., None]
+    fy = (py - y0)[..., None]
+    x1 = (x0 + 1) % w
+    x0 %= w
+    y1 = np.minimum(y0 + 1, h - 1)
+
+    image = image.astype(np.float32)
+    top = image[y0, x0] * (1.0 - fx) + image[y0, x1] * fx
+    bottom = image[y1, x0] * (1.0 - fx) + image[y1, x1] * fx
+    return np.clip(top * (1.0 - fy) + bottom * fy + 0.5, 0, 255).astype(np.uint8)
+
+
+def bake_cubemap(image_path: str, face_size: int = 512) -> np.ndarray:
+    """
+    Converte a imagem equirretangular em 6 faces de cubemap, uma única vez;
+    o resultado fica em cache no disco.
+
+    :return: Array (6, face_size, face_size, 3) uint8.
+    """
+    stat = os.stat(image_path)
+    digest = hashlib.sha1(f"{os.path.abspath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}|{face_size}"
+                          .encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(image_path))[0]
+    path = cache_path("skybox", f"{name}-{digest}.npy")
+    if os.path.isfile(path):
+        return np.load(path)
+
+    from PIL import Image
+    with Image.open(image_path) as image:
+        pixels = np.asarray(image.convert("RGB"))
+    faces = sample_equirectangular(pixels, cube_face_directions(face_size))
+    # Arquivo temporário por processo e renomeação atômica: processos que
+    # geram o mesmo cache ao mesmo tempo nunca leem um arquivo pela metade
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        np.save(file, faces)
+    os.replace(temporary, path)
+    logging.info("Cubemap gerado: %s (%dx%d por face)", path, face_size, face_size)
+    return faces
+
+
+class Skybox:
+    """
+    Fundo de estrelas em cubemap, desenhado por último na profundidade máxima
+    (gl_Position.xyww com GL_LEQUAL): o teste de profundidade antecipado
+    descarta os fragmentos já cobertos por planetas e órbitas.
+
+    Uma consulta GL_SAMPLES_PASSED mede quantos pixels do fundo foram
+    realmente sombreados (a esfera antiga sombreava a tela inteira).
+    """
+
+    def __init__(self, image_path: str, shader, face_size: int = 512):
+        """
+        :param image_path: Imagem equirretangular das estrelas.
+        :param shader: Shader do skybox (skybox.vert/skybox.frag).
+        :param face_size: Resolução de cada face do cubemap.
+        """
+        self.shader = shader
+        faces = bake_cubemap(image_path, face_size)
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_CUBE_MAP, self.texture)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        for i, face in enumerate(faces):
+            glTexImage2D(GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, GL_RGB8, face_size, face_size, 0,
+                         GL_RGB, GL_UNSIGNED_BYTE, np.ascontiguousarray(face))
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        for wrap in (GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_TEXTURE_WRAP_R):
+            glTexParameteri(GL_TEXTURE_CUBE_MAP, wrap, GL_CLAMP_TO_EDGE)
+        glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
+
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, _CUBE.nbytes, _CUBE, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 12, ctypes.c_void_p(0))
+        glBindVertexArray(0)
+
+        # Consultas de amostras alternadas, lidas um frame depois
+        self.queries = list(glGenQueries(2))
+        self.pending = [None, None]
+        self.frame = 0
+        self.samples = 0
+        self.pixels = 0
+
+    def draw(self, projection, view, pixels: int):
+        """
+        Desenha o fundo depois de toda a cena.
+
+        :param projection: Matriz de projeção da vista.
+        :param view: Matriz de visualização da vista (a translação é descartada no shader).
+        :param pixels: Número de pixels da vista (para a estatística de overdraw).
+        """
+        slot = self.frame % 2
+        self.frame += 1
+        self._collect(slot)
+
+        glDepthFunc(GL_LEQUAL)
+        glDepthMask(GL_FALSE)
+        self.shader.use()
+        self.shader.set_mat4("projection", projection)
+        self.shader.set_mat4("view", view)
+        self.shader.set_int("skybox", 0)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_CUBE_MAP, self.texture)
+        glBindVertexArray(self.vao)
+        query = self.pending[slot] is None
+        if query:
+            glBeginQuery(GL_SAMPLES_PASSED, self.queries[slot])
+        glDrawArrays(GL_TRIANGLES, 0, 36)
+        if query:
+            glEndQuery(GL_SAMPLES_PASSED)
+            self.pending[slot] = pixels
+        glBindVertexArray(0)
+        glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
+        glDepthMask(GL_TRUE)
+        glDepthFunc(GL_LESS)
+
+    def _collect(self, slot: int):
+        """Lê a consulta do slot, se o resultado já estiver disponível."""
+        if self.pending[slot] is None:
+            return
+        query = self.queries[slot]
+        if not glGetQueryObjectuiv(query, GL_QUERY_RESULT_AVAILABLE):
+            return
+        self.samples += glGetQueryObjectuiv(query, GL_QUERY_RESULT)
+        self.pixels += self.pending[slot]
+        self.pending[slot] = None
+
+    def release(self):
+        """Apaga a textura, os buffers e as consultas."""
+        glDeleteTextures(1, [self.texture])
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(1, [self.vbo])
+        glDeleteQueries(2, self.queries)
+
+    def report(self) -> str:
+        """Fração dos pixels da vista em que o fundo foi sombreado."""
+        fraction = self.samples / self.pixels if self.pixels else 0.0
+        return (f"Skybox: fundo sombreado em {100.0 * fraction:.1f}% dos pixels "
+                f"(a esfera de estrelas sombreava 100% antes de ser coberta)")
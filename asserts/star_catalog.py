@@ -0,0 +1,252 @@
+# Importando bibliotecas
+import mmap
+import time
+import ctypes
+import struct
+import logging
+import numpy as np
+import glm
+from OpenGL.GL import *
+from asserts.picking import morton_codes
+from asserts.viewport import frustum_planes, spheres_in_frustum
+
+# Formato do catálogo de estrelas:
+#   cabeçalho: magic (8 bytes) + versão (uint32) + número de estrelas (uint32) + número de blocos (uint32)
+#   blocos: primeira estrela, quantidade, eixo do cone de direções (3 floats), corda do cone,
+#           menor distância e menor magnitude (a estrela mais brilhante) do bloco
+#   estrelas: posição (3 float32, em parsecs), magnitude e índice de cor B-V (float16)
+MAGIC = b"SSTARS01"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIII")
+_BLOCK = struct.Struct("<II6f")
+
+star_dtype = np.dtype([
+    ("position", np.float32, 3),
+    ("magnitude", np.float16),
+    ("color_index", np.float16),
+])
+
+# Faixas de magnitude: um bloco nunca mistura faixas, então o corte por
+# magnitude descarta blocos inteiros
+MAGNITUDE_BANDS = (2.0, 4.0, 5.5, 6.5, 7.5, 8.5, 9.5)
+
+
+def write_catalog(path: str, positions: np.ndarray, magnitudes: np.ndarray, color_indices: np.ndarray,
+                  block_size: int = 1024) -> int:
+    """
+    Grava o catálogo ordenado em blocos: primeiro por faixa de magnitude e,
+    dentro da faixa, pela curva de Morton das direções (estrelas vizinhas no
+    céu ficam no mesmo bloco).
+
+    :param path: Arquivo de saída.
+    :param positions: Posições (n, 3) em parsecs, com o Sol na origem.
+    :param magnitudes: Magnitudes aparentes (n,).
+    :param color_indices: Índices de cor B-V (n,).
+    :param block_size: Estrelas por bloco.
+    :return: Número de blocos.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    distance = np.linalg.norm(positions, axis=1)
+    keep = distance > 0.0
+    positions, distance = positions[keep], distance[keep]
+    magnitudes = np.asarray(magnitudes, dtype=np.float64)[keep]
+    color_indices = np.asarray(color_indices, dtype=np.float64)[keep]
+    directions = positions / distance[:, None]
+
+    band = np.searchsorted(MAGNITUDE_BANDS, magnitudes)
+    order = np.lexsort((morton_codes(directions), band))
+    positions, distance, directions = positions[order], distance[order], directions[order]
+    magnitudes, color_indices, band = magnitudes[order], color_indices[order], band[order]
+
+    stars = np.zeros(len(positions), dtype=star_dtype)
+    stars["position"] = positions
+    stars["magnitude"] = magnitudes
+    stars["color_index"] = color_indices
+
+    # Blocos de até block_size estrelas, sem atravessar a fronteira de uma faixa
+    blocks = []
+    for b in np.unique(band):
+        start, end = np.searchsorted(band, [b, b + 1])
+        for first in range(start, end, block_size):
+            last = min(first + block_size, end)
+            axis = directions[first:last].sum(axis=0)
+            axis /= max(np.linalg.norm(axis), 1e-12)
+            chord = float(np.linalg.norm(directions[first:last] - axis, axis=1).max())
+            blocks.append(_BLOCK.pack(first, last - first, *axis, chord,
+                                      float(distance[first:last].min()), float(magnitudes[first:last].min())))
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(stars), len(blocks)))
+        file.write(b"".join(blocks))
+        file.write(b"\0" * (-file.tell() % 16))
+        file.write(stars.tobytes())
+    return len(blocks)
+
+
+def read_catalog(path: str):
+    """
+    Abre o catálogo com mmap, sem copiar as estrelas.
+
+    :return: Estrelas (array somente leitura sobre o mapeamento), tabela de
+             blocos (array estruturado) e o mmap (para ser fechado depois do upload).
+    """
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count, block_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        data.close()
+        raise ValueError(f"Catálogo de estrelas inválido: {path}")
+
+    block_dtype = np.dtype([("first", np.uint32), ("count", np.uint32), ("axis", np.float32, 3),
+                            ("chord", np.float32), ("min_distance", np.float32), ("min_magnitude", np.float32)])
+    blocks = np.frombuffer(data, dtype=block_dtype, count=block_count, offset=_HEADER.size).copy()
+    offset = _HEADER.size + block_count * _BLOCK.size
+    offset += -offset % 16
+    stars = np.frombuffer(data, dtype=star_dtype, count=count, offset=offset)
+    return stars, blocks, data
+
+
+def synthetic_catalog(count: int, seed: int = 0):
+    """
+    Catálogo sintético com distribuições parecidas com as reais: estrelas
+    concentradas no plano galáctico, mais estrelas fracas que brilhantes
+    (N(< m) cresce como 10^(0.5 m)) e cores em torno de B-V 0.6.
+
+    :return: Posições (parsecs), magnitudes e índices de cor.
+    """
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(count, 3)) * np.array([1.0, 0.35, 1.0])
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    distance = 2000.0 * rng.uniform(1e-6, 1.0, count) ** (1.0 / 3.0)
+    magnitudes = np.maximum(12.0 + 2.0 * np.log10(rng.uniform(1e-9, 1.0, count)), -1.5)
+    color_indices = np.clip(rng.normal(0.6, 0.45, count), -0.4, 2.0)
+    return directions * distance[:, None], magnitudes, color_indices
+
+
+class StarCatalog:
+    """
+    Estrelas do catálogo desenhadas como pontos: o catálogo é lido com mmap
+    e enviado uma única vez para um VBO estático. A cada frame, os blocos
+    fora do frustum, além da distância máxima ou só com estrelas mais fracas
+    que o limite são descartados na CPU, e os restantes (trechos contíguos
+    unidos) são desenhados com um único glMultiDrawArrays de GL_POINTS.
+    Tamanho e brilho de cada ponto vêm da magnitude, no shader.
+    """
+
+    def __init__(self, path: str, shader, magnitude_limit: float = 6.5, max_distance: float = np.inf,
+                 point_scale: float = 1.5):
+        """
+        :param path: Arquivo do catálogo (ver write_catalog).
+        :param shader: Shader das estrelas (star.vert/star.frag).
+        :param magnitude_limit: Magnitude mais fraca desenhada (a olho nu, cerca de 6.5).
+        :param max_distance: Distância máxima das estrelas desenhadas, em parsecs.
+        :param point_scale: Tamanho, em pixels, de uma estrela no limite de magnitude
+                            multiplicado pela raiz quarta do fluxo relativo.
+        """
+        self.path = path
+        self.shader = shader
+        self.magnitude_limit = magnitude_limit
+        self.max_distance = max_distance
+        self.point_scale = point_scale
+
+        inicio = time.perf_counter()
+        stars, self.blocks, data = read_catalog(path)
+        self.count = len(stars)
+        self.nbytes = stars.nbytes
+
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, stars.nbytes, stars, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, star_dtype.itemsize, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(1, 2, GL_HALF_FLOAT, GL_FALSE, star_dtype.itemsize,
+                              ctypes.c_void_p(star_dtype.fields["magnitude"][1]))
+        glBindVertexArray(0)
+        # Depois do upload o catálogo não é mais necessário na memória do processo
+        del stars
+        data.close()
+        logging.info("Catálogo de estrelas: %s (%d estrelas, %d blocos, %.1f ms)", path, self.count,
+                     len(self.blocks), 1000.0 * (time.perf_counter() - inicio))
+
+        # Estatísticas
+        self.frames = 0
+        self.cull_time = 0.0
+        self.blocks_drawn = 0
+        self.stars_drawn = 0
+        self.draw_ranges = 0
+
+    def visible_ranges(self, projection, view) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Seleciona os blocos visíveis e une os vizinhos em trechos contíguos.
+
+        :return: Primeiro vértice e quantidade de cada trecho.
+        """
+        blocks = self.blocks
+        keep = (blocks["min_magnitude"] <= self.magnitude_limit) & (blocks["min_distance"] <= self.max_distance)
+        # As direções são testadas contra o frustum só com a rotação da câmera
+        # (estrelas no infinito); o cone de cada bloco vira uma esfera em torno do eixo
+        planes = frustum_planes(np.array(projection * glm.mat4(glm.mat3(view))))
+        keep &= spheres_in_frustum(planes[:4], blocks["axis"].astype(np.float64), blocks["chord"].astype(np.float64))
+
+        index = np.flatnonzero(keep)
+        self.blocks_drawn += len(index)
+        if not len(index):
+            return index.astype(np.int32), index.astype(np.int32)
+        first = blocks["first"][index].astype(np.int64)
+        end = first + blocks["count"][index]
+        # Um novo trecho começa onde o bloco anterior não termina exatamente antes
+        starts = np.concatenate([[True], first[1:] != end[:-1]])
+        run_first = first[starts]
+        run_end = end[np.concatenate([starts[1:], [True]])]
+        return run_first.astype(np.int32), (run_end - run_first).astype(np.int32)
+
+    def draw(self, projection, view):
+        """
+        Desenha as estrelas no fundo (profundidade máxima, sem escrever
+        profundidade), somando a luz dos pontos.
+
+        :param projection: Matriz de projeção da vista.
+        :param view: Matriz de visualização da vista.
+        """
+        self.frames += 1
+        inicio = time.perf_counter()
+        first, count = self.visible_ranges(projection, view)
+        self.cull_time += time.perf_counter() - inicio
+        if not len(first):
+            return
+        self.stars_drawn += int(count.sum())
+        self.draw_ranges += len(first)
+
+        self.shader.use()
+        self.shader.set_mat4("projection", projection)
+        self.shader.set_mat4("view", view)
+        self.shader.set_float("magnitudeLimit", self.magnitude_limit)
+        self.shader.set_float("pointScale", self.point_scale)
+        glEnable(GL_PROGRAM_POINT_SIZE)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_ONE, GL_ONE)
+        glDepthFunc(GL_LEQUAL)
+        glDepthMask(GL_FALSE)
+        glBindVertexArray(self.vao)
+        glMultiDrawArrays(GL_POINTS, first, count, len(first))
+        glBindVertexArray(0)
+        glDepthMask(GL_TRUE)
+        glDepthFunc(GL_LESS)
+        glDisable(GL_BLEND)
+        glDisable(GL_PROGRAM_POINT_SIZE)
+
+    def release(self):
+        """Apaga o VAO e o buffer."""
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(1, [self.vbo])
+
+    def report(self) -> str:
+        """Estrelas e blocos enviados por frame e custo do descarte na CPU."""
+        frames = max(self.frames, 1)
+        return (f"Estrelas: {self.count} no catálogo ({self.nbytes / (1024 * 1024):.1f} MB na GPU), "
+                f"{self.stars_drawn / frames:.0f} enviadas por frame em {self.blocks_drawn / frames:.1f} blocos "
+                f"({self.draw_ranges / frames:.1f} trechos), descarte {1000.0 * self.cull_time / frames:.3f} ms")
@@ -0,0 +1,56 @@
+# Importando bibliotecas
+import time
+from contextlib import contextmanager
+
+# Ordem das categorias no relatório
+CATEGORIES = ("import", "contexto", "shaders", "malhas", "texturas", "upload")
+
+
+class StartupProfiler:
+    """
+    Acumula o tempo de inicialização por categoria (imports, criação do
+    contexto, compilação de shaders, leitura de malhas, decodificação de
+    texturas e upload para a GPU).
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.totals = {name: 0.0 for name in CATEGORIES}
+        self._active = []
+
+    @contextmanager
+    def section(self, name: str):
+        """
+        Mede um trecho de código. Trechos aninhados descontam o tempo dos
+        internos do externo, para que nenhuma categoria seja contada duas vezes.
+
+        :param name: Categoria do trecho.
+        """
+        inicio = time.perf_counter()
+        self._active.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - inicio
+            nested = self._active.pop()
+            self.totals[name] = self.totals.get(name, 0.0) + elapsed - nested
+            if self._active:
+                self._active[-1] += elapsed
+
+    def add(self, name: str, seconds: float):
+        """Soma um tempo medido externamente a uma categoria."""
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+
+    def report(self, title: str = "Inicialização") -> str:
+        """
+        Gera o relatório com o tempo total desde a criação do profiler e a
+        divisão por categoria.
+        """
+        total = time.perf_counter() - self.start
+        parts = [f"{name} {1000.0 * seconds:.1f} ms" for name, seconds in self.totals.items()]
+        other = total - sum(self.totals.values())
+        return f"{title}: {1000.0 * total:.1f} ms ({', '.join(parts)}, outros {1000.0 * other:.1f} ms)"
+
+
+# Profiler compartilhado pelos módulos de carregamento
+startup_profiler = StartupProfiler()
@@ -0,0 +1,344 @@
+# Importando bibliotecas
+import os
+import time
+import struct
+import hashlib
+import logging
+import numpy as np
+from OpenGL.GL import *
+from asserts.utils import cache_path
+
+# Formatos internos do EXT_texture_compression_s3tc
+GL_COMPRESSED_RGB_S3TC_DXT1_EXT = 0x83F0
+GL_COMPRESSED_RGBA_S3TC_DXT5_EXT = 0x83F3
+
+# Contêiner simples no estilo DDS/KTX:
+#   cabeçalho: magic, versão, formato interno GL, largura, altura, níveis
+#   por nível: largura, altura, tamanho em bytes, dados dos blocos
+_MAGIC = b"STX1"
+_VERSION = 2  # 2: níveis com floor(n / 2), como o GL exige
+_HEADER = struct.Struct("<4sIIIII")
+_LEVEL = struct.Struct("<III")
+
+_BC1_BLOCK = np.dtype([("color0", "<u2"), ("color1", "<u2"), ("indices", "<u4")])
+
+
+def _halve(current: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Reduz um eixo para floor(n / 2), como o GL espera para os níveis de mipmap.
+    Tamanho par: média de pares. Tamanho ímpar: filtro de 3 amostras com
+    pesos ((m - i) / n, m / n, (i + 1) / n), que cobre todas as n amostras
+    sem repetir bordas.
+    """
+    n = current.shape[axis]
+    m = n // 2
+    take = lambda start: np.take(current, np.arange(start, start + 2 * m, 2), axis=axis)
+    if n % 2 == 0:
+        return 0.5 * (take(0) + take(1))
+    shape = [1] * current.ndim
+    shape[axis] = m
+    i = np.arange(m, dtype=np.float32).reshape(shape)
+    return ((m - i) * take(0) + m * take(1) + (i + 1) * take(2)) / n
+
+
+def build_mip_chain(pixels: np.ndarray) -> list[np.ndarray]:
+    """
+    Gera a cadeia de mipmaps até 1x1, com max(1, floor(n / 2)) em cada eixo.
+
+    :param pixels: Array (altura, largura, 4) uint8.
+    :return: Lista de níveis, do maior para o menor.
+    """
+    levels = [pixels]
+    current = pixels.astype(np.float32)
+    while current.shape[0] > 1 or current.shape[1] > 1:
+        if current.shape[0] > 1:
+            current = _halve(current, 0)
+        if current.shape[1] > 1:
+            current = _halve(current, 1)
+        levels.append(np.clip(current + 0.5, 0, 255).astype(np.uint8))
+    return levels
+
+
+def _blocks(pixels: np.ndarray) -> np.ndarray:
+    """
+    Divide a imagem em blocos 4x4 (repetindo as bordas quando necessário).
+
+    :return: Array (blocos_y, blocos_x, 16, 4) float32.
+    """
+    h, w = pixels.shape[:2]
+    ph, pw = (-h) % 4, (-w) % 4
+    if ph or pw:
+        pixels = np.pad(pixels, ((0, ph), (0, pw), (0, 0)), mode="edge")
+    by, bx = pixels.shape[0] // 4, pixels.shape[1] // 4
+    blocks = pixels.reshape(by, 4, bx, 4, 4).transpose(0, 2, 1, 3, 4).reshape(by, bx, 16, 4)
+    return blocks.astype(np.float32)
+
+
+def _to_565(colors: np.ndarray) -> np.ndarray:
+    """Quantiza cores RGB (0-255) para RGB565."""
+    r = np.clip(np.round(colors[..., 0] * 31.0 / 255.0), 0, 31).astype(np.uint16)
+    g = np.clip(np.round(colors[..., 1] * 63.0 / 255.0), 0, 63).astype(np.uint16)
+    b = np.clip(np.round(colors[..., 2] * 31.0 / 255.0), 0, 31).astype(np.uint16)
+    return (r << 11) | (g << 5) | b
+
+
+def _from_565(values: np.ndarray) -> np.ndarray:
+    """Expande RGB565 para RGB (0-255), como o decodificador faz."""
+    values = values.astype(np.uint32)
+    r = (values >> 11) & 31
+    g = (values >> 5) & 63
+    b = values & 31
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1).astype(np.float32)
+
+
+def _encode_color_blocks(rgb: np.ndarray) -> np.ndarray:
+    """
+    Codifica a parte de cor (BC1, modo de 4 cores) de blocos 4x4.
+
+    Os extremos são os cantos da caixa envolvente do bloco, levemente
+    recuados para dentro; cada pixel recebe o índice da cor mais próxima da
+    paleta interpolada.
+
+    :param rgb: Array (n, 16, 3) float32.
+    :return: Array estruturado (n,) com color0, color1 e indices.
+    """
+    low = rgb.min(axis=1)
+    high = rgb.max(axis=1)
+    inset = (high - low) / 16.0
+    color0 = _to_565(high - inset)
+    color1 = _to_565(low + inset)
+
+    # O modo de 4 cores exige color0 > color1
+    swap = color0 < color1
+    color0, color1 = np.where(swap, color1, color0), np.where(swap, color0, color1)
+    equal = color0 == color1
+
+    c0, c1 = _from_565(color0), _from_565(color1)
+    palette = np.stack([c0, c1, (2.0 * c0 + c1) / 3.0, (c0 + 2.0 * c1) / 3.0], axis=1)
+    distances = ((rgb[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+    indices = distances.argmin(axis=-1).astype(np.uint32)
+    indices[equal] = 0
+
+    shifts = (2 * np.arange(16, dtype=np.uint32))
+    packed = (indices << shifts).sum(axis=1, dtype=np.uint64).astype(np.uint32)
+
+    blocks = np.empty(len(rgb), dtype=_BC1_BLOCK)
+    blocks["color0"] = color0
+    blocks["color1"] = color1
+    blocks["indices"] = packed
+    return blocks
+
+
+def _encode_alpha_blocks(alpha: np.ndarray) -> np.ndarray:
+    """
+    Codifica o canal alfa de blocos 4x4 no formato BC3 (8 valores interpolados).
+
+    :param alpha: Array (n, 16) float32.
+    :return: Array (n, 8) uint8.
+    """
+    a0 = alpha.max(axis=1)
+    a1 = alpha.min(axis=1)
+    a0q, a1q = np.round(a0).astype(np.uint8), np.round(a1).astype(np.uint8)
+
+    f0, f1 = a0q.astype(np.float32)[:, None], a1q.astype(np.float32)[:, None]
+    steps = np.arange(1, 7, dtype=np.float32)
+    interpolated = ((7.0 - steps) * f0 + steps * f1) / 7.0
+    palette = np.concatenate([f0, f1, interpolated], axis=1)
+    indices = np.abs(alpha[:, :, None] - palette[:, None, :]).argmin(axis=-1).astype(np.uint64)
+    indices[a0q == a1q] = 0
+
+    packed = (indices << (3 * np.arange(16, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+    out = np.empty((len(alpha), 8), dtype=np.uint8)
+    out[:, 0] = a0q
+    out[:, 1] = a1q
+    out[:, 2:] = packed[:, None].view(np.uint8).reshape(-1, 8)[:, :6]
+    return out
+
+
+def encode_bc1(pixels: np.ndarray) -> bytes:
+    """Codifica um nível RGBA em BC1 (DXT1, opaco)."""
+    blocks = _blocks(pixels)
+    return _encode_color_blocks(blocks.reshape(-1, 16, 4)[:, :, :3]).tobytes()
+
+
+def encode_bc3(pixels: np.ndarray) -> bytes:
+    """Codifica um nível RGBA em BC3 (DXT5, com alfa interpolado)."""
+    blocks = _blocks(pixels).reshape(-1, 16, 4)
+    alpha = _encode_alpha_blocks(blocks[:, :, 3])
+    color = _encode_color_blocks(blocks[:, :, :3]).view(np.uint8).reshape(-1, 8)
+    return np.concatenate([alpha, color], axis=1).tobytes()
+
+
+def bake_texture(path: str) -> str:
+    """
+    Gera (uma única vez) a versão comprimida de uma imagem com todos os
+    mipmaps e grava no cache em disco.
+
+    :param path: Caminho da imagem de origem.
+    :return: Caminho do arquivo comprimido.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{_VERSION}".encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    output = cache_path("textures", f"{name}-{digest}.stx")
+    if os.path.isfile(output):
+        return output
+
+    from PIL import Image
+    with Image.open(path) as image:
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        # Mesma orientação de utils.load_texture (primeira linha = base da imagem)
+        pixels = np.asarray(image.convert("RGBA"))[::-1]
+    if has_alpha and (pixels[..., 3] == 255).all():
+        has_alpha = False
+
+    inicio = time.perf_counter()
+    encode = encode_bc3 if has_alpha else encode_bc1
+    internal_format = GL_COMPRESSED_RGBA_S3TC_DXT5_EXT if has_alpha else GL_COMPRESSED_RGB_S3TC_DXT1_EXT
+    levels = build_mip_chain(np.ascontiguousarray(pixels))
+
+    temporary = f"{output}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, internal_format, pixels.shape[1], pixels.shape[0], len(levels)))
+        for level in levels:
+            data = encode(level)
+            file.write(_LEVEL.pack(level.shape[1], level.shape[0], len(data)))
+            file.write(data)
+    os.replace(temporary, output)
+    logging.info("Textura comprimida (%s): %s em %.0f ms", "BC3" if has_alpha else "BC1",
+                 path, 1000.0 * (time.perf_counter() - inicio))
+    return output
+
+
+def read_compressed(path: str) -> tuple[int, int, int, list]:
+    """
+    Lê um arquivo comprimido.
+
+    :return: Formato interno, largura, altura e lista de (largura, altura, bytes) por nível.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, internal_format, width, height, count = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Arquivo de textura comprimida inválido: {path}")
+    offset = _HEADER.size
+    levels = []
+    for _ in range(count):
+        w, h, size = _LEVEL.unpack_from(data, offset)
+        offset += _LEVEL.size
+        levels.append((w, h, data[offset:offset + size]))
+        offset += size
+    return internal_format, width, height, levels
+
+
+_s3tc_supported = None
+
+
+def s3tc_supported() -> bool:
+    """Verifica (uma vez) se o driver suporta texturas S3TC/DXT."""
+    global _s3tc_supported
+    if _s3tc_supported is None:
+        names = set()
+        for i in range(int(glGetIntegerv(GL_NUM_EXTENSIONS))):
+            names.add(glGetStringi(GL_EXTENSIONS, i).decode())
+        _s3tc_supported = "GL_EXT_texture_compression_s3tc" in names
+        if not _s3tc_supported:
+            logging.info("S3TC indisponível: texturas serão enviadas sem compressão")
+    return _s3tc_supported
+
+
+class TextureStats:
+    """
+    Contabiliza a memória de vídeo estimada e o tempo de carregamento das
+    texturas, comparando com o equivalente RGBA8 com mipmaps. Os tempos são
+    separados entre texturas comprimidas e RGBA8 (ver benchmarks/bench_textures.py
+    para as duas versões das mesmas imagens).
+
+    Cada imagem conta uma vez; as cargas seguintes da mesma imagem (por
+    exemplo, depois de um despejo pelo orçamento de VRAM) são recargas,
+    contadas à parte.
+    """
+
+    def __init__(self):
+        self.paths: set[str] = set()
+        self.count = 0
+        self.stored_bytes = 0
+        self.uncompressed_bytes = 0
+        self.load_time = 0.0
+        self.compressed_count = 0
+        self.compressed_time = 0.0
+        self.reloads = 0
+        self.reload_bytes = 0
+        self.reload_time = 0.0
+
+    def add(self, path: str, width: int, height: int, stored_bytes: int, seconds: float,
+            compressed: bool = False):
+        """
+        :param path: Caminho da imagem de origem.
+        :param width: Largura do nível base.
+        :param height: Altura do nível base.
+        :param stored_bytes: Bytes efetivamente enviados à GPU (todos os níveis).
+        :param seconds: Tempo de carregamento.
+        :param compressed: Se a textura foi enviada comprimida (BC1/BC3).
+        """
+        path = os.path.abspath(path)
+        if path in self.paths:
+            self.reloads += 1
+            self.reload_bytes += stored_bytes
+            self.reload_time += seconds
+            return
+        self.paths.add(path)
+        self.count += 1
+        self.stored_bytes += stored_bytes
+        self.uncompressed_bytes += int(width * height * 4 * 4 / 3)
+        self.load_time += seconds
+        if compressed:
+            self.compressed_count += 1
+            self.compressed_time += seconds
+
+    def report(self) -> str:
+        """Resumo da economia de memória e do tempo de carregamento por caminho."""
+        mb = 1024.0 * 1024.0
+        ratio = self.uncompressed_bytes / self.stored_bytes if self.stored_bytes else 0.0
+        paths = []
+        for name, count, seconds in (("comprimidas", self.compressed_count, self.compressed_time),
+                                     ("RGBA8", self.count - self.compressed_count,
+                                      self.load_time - self.compressed_time)):
+            if count:
+                paths.append(f"{name} {count} em {1000.0 * seconds:.1f} ms, "
+                             f"{1000.0 * seconds / count:.1f} ms cada")
+        reloads = (f", {self.reloads} recargas em {1000.0 * self.reload_time:.1f} ms"
+                   if self.reloads else "")
+        return (f"Texturas: {self.count} carregadas em {1000.0 * self.load_time:.1f} ms "
+                f"({'; '.join(paths)}), VRAM {self.stored_bytes / mb:.1f} MB (RGBA8 com mipmaps: "
+                f"{self.uncompressed_bytes / mb:.1f} MB, {ratio:.1f}x menor){reloads}")
+
+
+texture_stats = TextureStats()
+
+
+def load_compressed_texture(path: str) -> int:
+    """
+    Carrega uma textura comprimida (gerando o cache na primeira execução)
+    e envia todos os níveis com glCompressedTexImage2D.
+
+    :param path: Caminho da imagem de origem.
+    :return: ID da textura.
+    """
+    inicio = time.perf_counter()
+    internal_format, width, height, levels = read_compressed(bake_texture(path))
+
+    texture_id = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture_id)
+    for level, (w, h, data) in enumerate(levels):
+        glCompressedTexImage2D(GL_TEXTURE_2D, level, internal_format, w, h, 0, data)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glBindTexture(GL_TEXTURE_2D, 0)
+
+    texture_stats.add(path, width, height, sum(len(data) for _, _, data in levels),
+                      time.perf_counter() - inicio, compressed=True)
+    return texture_id
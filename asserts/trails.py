@@ -0,0 +1,147 @@
+# Importando bibliotecas
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+# Cada amostra: posição (xyz) e instante (w), relativos ao início dos rastros
+_SAMPLE = np.dtype([("position", np.float32, 3), ("time", np.float32)])
+
+
+class OrbitTrails:
+    """
+    Rastros das órbitas em um único buffer de tamanho fixo: um anel de
+    amostras por corpo, todos no mesmo VBO. A cada frame só a amostra mais
+    nova de cada corpo é escrita (glBufferSubData de 16 bytes) e todos os
+    rastros são desenhados com um único glMultiDrawArrays.
+
+    O anel de cada corpo tem capacity + 1 vértices: o último repete o slot 0,
+    para que o rastro, ao dar a volta no anel, seja desenhado como dois
+    trechos contíguos (do mais antigo ao fim e do começo ao mais novo) sem
+    perder o segmento entre eles.
+    """
+
+    def __init__(self, bodies, shader, capacity: int = 256, interval: float = 0.05,
+                 color=(0.55, 0.75, 1.0)):
+        """
+        :param bodies: Índices dos corpos com rastro.
+        :param shader: Shader dos rastros (trail.vert/trail.frag).
+        :param capacity: Amostras guardadas por corpo.
+        :param interval: Tempo de simulação entre duas amostras; a duração do
+                         rastro é capacity * interval.
+        :param color: Cor dos rastros.
+        """
+        self.bodies = np.asarray(bodies, dtype=np.int64)
+        self.shader = shader
+        self.capacity = capacity
+        self.interval = interval
+        self.duration = capacity * interval
+        self.color = color
+        self.stride = capacity + 1
+        self.head = 0
+        self.origin = None
+        self.last_sample = None
+
+        n = len(self.bodies)
+        self.nbytes = n * self.stride * _SAMPLE.itemsize
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.nbytes, None, GL_DYNAMIC_DRAW)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 4, GL_FLOAT, GL_FALSE, _SAMPLE.itemsize, ctypes.c_void_p(0))
+        glBindVertexArray(0)
+
+        self._sample = np.zeros(1, dtype=_SAMPLE)
+        self._first = np.zeros(2 * n, dtype=np.int32)
+        self._count = np.zeros(2 * n, dtype=np.int32)
+
+        # Estatísticas
+        self.frames = 0
+        self.bytes_uploaded = 0
+        self.upload_calls = 0
+
+    def reset(self, state):
+        """Enche todos os anéis com a posição atual, já transparente (rastro vazio)."""
+        self.origin = state.tempo
+        self.last_sample = state.tempo
+        self.head = 0
+        samples = np.zeros((len(self.bodies), self.stride), dtype=_SAMPLE)
+        samples["position"] = state.centers[self.bodies][:, None, :]
+        samples["time"] = -2.0 * self.duration
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, samples.nbytes, samples)
+        self.bytes_uploaded += samples.nbytes
+        self.upload_calls += 1
+
+    def update(self, state):
+        """
+        Escreve a amostra mais nova de cada corpo. Entre duas amostras, o
+        slot da cabeça acompanha o corpo; passado o intervalo, a cabeça avança.
+
+        :param state: Estado da cena do frame.
+        """
+        self.frames += 1
+        if self.origin is None or state.tempo < self.last_sample:
+            # Primeiro frame ou relógio voltou (reprodução reiniciada)
+            self.reset(state)
+        elif state.tempo - self.last_sample >= self.interval:
+            self.head = (self.head + 1) % self.capacity
+            self.last_sample = state.tempo
+
+        size = _SAMPLE.itemsize
+        slots = [self.head, self.capacity] if self.head == 0 else [self.head]
+        self._sample["time"] = state.tempo - self.origin
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        for b, body in enumerate(self.bodies):
+            self._sample["position"] = state.centers[body]
+            for slot in slots:
+                glBufferSubData(GL_ARRAY_BUFFER, (b * self.stride + slot) * size, size, self._sample)
+        self.bytes_uploaded += len(self.bodies) * len(slots) * size
+        self.upload_calls += len(self.bodies) * len(slots)
+
+    def draw(self, projection, view, tempo: float):
+        """
+        Desenha todos os rastros com mistura por alfa, sem escrever profundidade.
+        Deve ser chamado depois do skybox, que só pinta onde a profundidade está vazia.
+
+        :param projection: Matriz de projeção da vista.
+        :param view: Matriz de visualização da vista.
+        :param tempo: Relógio da simulação.
+        """
+        if self.origin is None:
+            return
+        # Do mais antigo (head + 1) até o vértice repetido e do slot 0 até a cabeça
+        base = np.arange(len(self.bodies), dtype=np.int32) * self.stride
+        self._first[0::2] = base + self.head + 1
+        self._count[0::2] = self.capacity - self.head
+        self._first[1::2] = base
+        self._count[1::2] = self.head + 1
+        draws = self._count >= 2
+
+        self.shader.use()
+        self.shader.set_mat4("projection", projection)
+        self.shader.set_mat4("view", view)
+        self.shader.set_float("now", tempo - self.origin)
+        self.shader.set_float("duration", self.duration)
+        self.shader.set_vec3("color", *self.color)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glDepthMask(GL_FALSE)
+        glBindVertexArray(self.vao)
+        glMultiDrawArrays(GL_LINE_STRIP, self._first[draws], self._count[draws], int(draws.sum()))
+        glBindVertexArray(0)
+        glDepthMask(GL_TRUE)
+        glDisable(GL_BLEND)
+
+    def release(self):
+        """Apaga o VAO e o buffer."""
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(1, [self.vbo])
+
+    def report(self) -> str:
+        """Memória fixa do buffer e tráfego de upload por frame."""
+        frames = max(self.frames, 1)
+        return (f"Rastros: {len(self.bodies)} corpos x {self.capacity} amostras em {self.nbytes / 1024:.1f} KB fixos, "
+                f"{self.bytes_uploaded / frames:.0f} bytes e {self.upload_calls / frames:.1f} "
+                f"glBufferSubData por frame")
@@ -1,21 +1,92 @@
 # Importando bibliotecas
+import os
+import time
 from OpenGL.GL import *
-from PIL import Image
+from asserts.startup import startup_profiler
+from asserts.asset_pack import assets
+
+# Diretório raiz dos caches gerados em disco (shaders, texturas, ...)
+CACHE_DIR = os.environ.get("SOLAR_SYSTEM_CACHE", ".cache")
+
+# Usa texturas comprimidas (BC1/BC3) pré-geradas quando o driver suporta S3TC
+COMPRESS_TEXTURES = os.environ.get("SOLAR_SYSTEM_COMPRESS_TEXTURES", "0") == "1"
+
+def cache_path(*parts):
+    """
+    Retorna um caminho dentro do diretório de cache, criando os diretórios necessários.
+    """
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
 
 def load_texture(path):
     """
-    Classe que carrega e processa um modelo 3D utilizando pyassimp.
+    Carrega uma imagem (do pacote de assets ou do disco) e cria uma textura OpenGL com mipmaps.
+    """
+    from asserts.texture_compress import texture_stats, s3tc_supported, load_compressed_texture
+
+    if COMPRESS_TEXTURES and s3tc_supported():
+        with startup_profiler.section("texturas"):
+            return load_compressed_texture(path)
+
+    inicio = time.perf_counter()
+
+    # Pixels já decodificados no pacote de assets: upload direto do mmap
+    packed = assets.texture(path)
+    if packed is not None:
+        width, height, pixels = packed
+        with startup_profiler.section("upload"):
+            texture_id = _upload_texture(width, height, pixels)
+        texture_stats.add(path, width, height, width * height * 4 * 4 // 3, time.perf_counter() - inicio)
+        return texture_id
+
+    # O PIL só é importado na primeira textura carregada
+    with startup_profiler.section("import"):
+        from PIL import Image
+
+    # As imagens são fechadas logo depois da conversão e os pixels descartados
+    # depois do upload: nenhuma cópia da textura fica na memória do processo
+    with startup_profiler.section("texturas"), Image.open(path) as image:
+        width, height = image.size
+        with image.convert("RGBA") as rgba:
+            img_data = rgba.tobytes("raw", "RGBA", 0, -1)
+
+    with startup_profiler.section("upload"):
+        texture_id = _upload_texture(width, height, img_data)
+    del img_data
+    texture_stats.add(path, width, height, width * height * 4 * 4 // 3, time.perf_counter() - inicio)
+    return texture_id
+
+def create_texture(path):
+    """
+    Carrega uma textura e estima a memória ocupada na GPU.
+
+    :return: ID da textura e bytes enviados (todos os níveis de mipmap).
+    """
+    from asserts.texture_compress import texture_stats
+
+    # Uma recarga (depois de um despejo) não conta de novo em stored_bytes
+    before = texture_stats.stored_bytes + texture_stats.reload_bytes
+    texture_id = load_texture(path)
+    return texture_id, texture_stats.stored_bytes + texture_stats.reload_bytes - before
+
+def delete_texture(texture_id):
+    """
+    Apaga uma textura da GPU.
+    """
+    glDeleteTextures(1, [texture_id])
+
+def _upload_texture(width, height, img_data):
+    """
+    Envia os pixels RGBA para uma nova textura com mipmaps.
     """
-    image = Image.open(path)
-    image = image.convert("RGBA")
-    img_data = image.tobytes("raw", "RGBA", 0, -1)
     texture_id = glGenTextures(1)
 
     # Carrega a textura
     glBindTexture(GL_TEXTURE_2D, texture_id)
 
     # Configura a textura
-    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, image.width, image.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
 
     # Gera o mipmap
     glGenerateMipmap(GL_TEXTURE_2D)
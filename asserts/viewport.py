@@ -0,0 +1,131 @@
+# Importando bibliotecas
+import numpy as np
+import glm
+
+
+def frustum_planes(view_projection: np.ndarray) -> np.ndarray:
+    """
+    Extrai os 6 planos do frustum de uma matriz projeção * visualização.
+
+    :param view_projection: Matriz 4x4 em ordem matemática (por linhas).
+    :return: Array (6, 4) com planos normalizados (a, b, c, d).
+    """
+    m = view_projection
+    planes = np.array([
+        m[3] + m[0], m[3] - m[0],  # esquerda, direita
+        m[3] + m[1], m[3] - m[1],  # baixo, cima
+        m[3] + m[2], m[3] - m[2],  # perto, longe
+    ], dtype=np.float64)
+    planes /= np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes
+
+
+def spheres_in_frustum(planes: np.ndarray, centers: np.ndarray, radii: np.ndarray) -> np.ndarray:
+    """
+    Testa esferas contra o frustum de forma vetorizada.
+
+    :return: Máscara booleana com as esferas ao menos parcialmente visíveis.
+    """
+    distances = centers @ planes[:, :3].T + planes[:, 3]
+    return np.all(distances >= -radii[:, None], axis=1)
+
+
+class Viewport:
+    """
+    Uma vista da cena: câmera própria, retângulo na janela e culling próprio.
+    As matrizes dos corpos vêm de uma única avaliação da cena por frame.
+    """
+
+    def __init__(self, camera, rect=(0.0, 0.0, 1.0, 1.0), follow: str = None,
+                 follow_distance: float = 6.0, name: str = "livre",
+                 near: float = 0.1, far: float = 25000.0):
+        """
+        :param camera: Câmera da vista.
+        :param rect: Retângulo (x, y, largura, altura) em frações da janela.
+        :param follow: Nome do corpo seguido pela câmera (None para câmera livre).
+        :param follow_distance: Distância da câmera ao corpo seguido, em raios do corpo.
+        :param name: Nome da vista (usado nos relatórios).
+        :param near: Plano próximo da projeção.
+        :param far: Plano distante da projeção.
+        """
+        self.camera = camera
+        self.rect = rect
+        self.follow = follow
+        self.follow_distance = follow_distance
+        self.name = name
+        self.near = near
+        self.far = far
+        self.projection = glm.mat4(1.0)
+        self.view = glm.mat4(1.0)
+        self.visible = np.zeros(0, dtype=bool)
+        self.screen_radius = np.zeros(0)
+        self.distance = np.zeros(0)
+        self.focal = 1.0
+
+    def pixel_rect(self, width: int, height: int) -> tuple[int, int, int, int]:
+        """
+        Converte o retângulo fracionário para pixels do framebuffer.
+        """
+        x, y, w, h = self.rect
+        return (int(x * width), int(y * height),
+                max(int(w * width), 1), max(int(h * height), 1))
+
+    def update(self, state, width: int, height: int, camera=None):
+        """
+        Atualiza a câmera (se estiver seguindo um corpo), as matrizes e o culling da vista.
+
+        :param state: Estado da cena avaliado no frame.
+        :param width: Largura do framebuffer.
+        :param height: Altura do framebuffer.
+        :param camera: Cópia da câmera a usar no lugar de self.camera (vistas livres),
+                       para preparar o frame fora da thread que processa a entrada.
+        """
+        if camera is None or self.follow is not None:
+            camera = self.camera
+        if self.follow is not None:
+            i = state.index(self.follow)
+            center = glm.vec3(*state.centers[i])
+            # Posiciona a câmera do lado iluminado do corpo, um pouco acima do plano orbital
+            outward = glm.normalize(center) if glm.length(center) > 0.0 else glm.vec3(0.0, 0.0, 1.0)
+            distance = float(state.radii[i]) * self.follow_distance
+            camera.Position = center + (outward + glm.vec3(0.0, 0.35, 0.0)) * distance
+            camera.look_at(center)
+
+        _, _, w, h = self.pixel_rect(width, height)
+        self.projection = glm.perspective(glm.radians(camera.Zoom), w / h, self.near, self.far)
+        self.view = camera.get_view_matrix()
+
+        planes = frustum_planes(np.array(self.projection * self.view))
+        self.visible = spheres_in_frustum(planes, state.centers, state.radii) | ~state.scene.cull
+
+        # Raio aproximado de cada corpo na tela, em pixels (infinito se a câmera estiver dentro)
+        position = np.array(camera.Position)
+        self.distance = distance = np.linalg.norm(state.centers - position, axis=1)
+        self.focal = focal = 0.5 * h / np.tan(np.radians(camera.Zoom) * 0.5)
+        with np.errstate(divide="ignore"):
+            self.screen_radius = np.where(distance > state.radii,
+                                          focal * state.radii / distance, np.inf)
+
+
+def layout_viewports(layout: str, camera, follow_camera, follow: str) -> list[Viewport]:
+    """
+    Cria as vistas de um layout pré-definido.
+
+    :param layout: "single", "split" (tela dividida) ou "pip" (picture-in-picture).
+    :param camera: Câmera livre, controlada pela entrada do usuário.
+    :param follow_camera: Câmera usada pela vista que segue um corpo.
+    :param follow: Nome do corpo seguido.
+    """
+    if layout == "single":
+        return [Viewport(camera)]
+    if layout == "split":
+        return [
+            Viewport(camera, rect=(0.0, 0.0, 0.5, 1.0)),
+            Viewport(follow_camera, rect=(0.5, 0.0, 0.5, 1.0), follow=follow, name=follow),
+        ]
+    if layout == "pip":
+        return [
+            Viewport(camera),
+            Viewport(follow_camera, rect=(0.7, 0.7, 0.28, 0.28), follow=follow, name=follow),
+        ]
+    raise ValueError(f"Layout de vistas desconhecido: {layout}")
@@ -0,0 +1,488 @@
+# Importando bibliotecas
+import os
+import json
+import hashlib
+import ctypes
+import logging
+from collections import OrderedDict, deque
+import numpy as np
+from OpenGL.GL import *
+from asserts.utils import cache_path
+
+# Geometria dos tiles: conteúdo útil + borda para a filtragem bilinear.
+# Estes valores precisam ser os mesmos de VT_CONTENT/VT_BORDER nos shaders.
+# Com conteúdo em potência de dois, mapas de 8k/16k viram um número exato de
+# tiles e são divididos sem reamostragem.
+TILE_CONTENT = 128
+TILE_BORDER = 4
+TILE_SIZE = TILE_CONTENT + 2 * TILE_BORDER
+
+
+def _prev_pow2(value: int) -> int:
+    return 1 << max(int(value).bit_length() - 1, 0)
+
+
+def _source_rows(image, rows: np.ndarray) -> np.ndarray:
+    """
+    Linhas de conteúdo do nível 0 lidas da imagem de origem (invertida na
+    vertical), convertendo para RGBA só a faixa recortada.
+    """
+    height = image.height
+    top, bottom = height - 1 - int(rows.max()), height - int(rows.min())
+    with image.crop((0, top, image.width, bottom)) as strip, strip.convert("RGBA") as rgba:
+        pixels = np.asarray(rgba)
+    return pixels[height - 1 - top - rows]
+
+
+def _level_rows(tiles: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Linhas de conteúdo (sem as bordas) de um nível já gravado no cache."""
+    ly, lx = tiles.shape[:2]
+    block = tiles[rows // TILE_CONTENT, :, TILE_BORDER + rows % TILE_CONTENT, TILE_BORDER:TILE_BORDER + TILE_CONTENT]
+    return block.reshape(len(rows), lx * TILE_CONTENT, 4)
+
+
+def build_tile_cache(image_path: str) -> str:
+    """
+    Divide uma imagem em uma pirâmide de mipmaps de tiles com borda, gravada
+    em disco (um arquivo bruto por nível) para ser lida via memmap.
+
+    A imagem é invertida verticalmente, como em utils.load_texture, para que
+    a linha 0 do tile corresponda a v = 0. O número de tiles é a maior
+    potência de dois que cabe na imagem, então ela nunca é ampliada. Os
+    níveis são gerados uma linha de tiles por vez (o nível 0 a partir de
+    faixas da imagem, os demais a partir do nível anterior já gravado), e
+    só a imagem decodificada e uma faixa ficam na memória.
+
+    :param image_path: Caminho da imagem de origem.
+    :return: Diretório do cache de tiles.
+    """
+    stat = os.stat(image_path)
+    digest = hashlib.sha1(f"{os.path.abspath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+                          f"|{TILE_CONTENT}|{TILE_BORDER}".encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(image_path))[0]
+    directory = os.path.dirname(cache_path("virtual_textures", f"{name}-{digest}", "info.json"))
+    info_path = os.path.join(directory, "info.json")
+    if os.path.isfile(info_path):
+        return directory
+
+    from PIL import Image
+    Image.MAX_IMAGE_PIXELS = None  # mapas de 8k-16k ultrapassam o limite padrão
+
+    image = Image.open(image_path)
+    tiles_x = _prev_pow2(max(image.width // TILE_CONTENT, 1))
+    tiles_y = _prev_pow2(max(image.height // TILE_CONTENT, 1))
+    levels = int(np.log2(max(tiles_x, tiles_y))) + 1
+    logging.info("Gerando tiles de %s: %dx%d tiles, %d níveis", image_path, tiles_x, tiles_y, levels)
+
+    # Só reduz (e só quando a imagem não é um múltiplo exato do tamanho dos tiles)
+    size = (tiles_x * TILE_CONTENT, tiles_y * TILE_CONTENT)
+    if image.size != size:
+        with image:
+            image = image.resize(size, Image.LANCZOS)
+
+    previous = None
+    with image:
+        for level in range(levels):
+            lx, ly = max(tiles_x >> level, 1), max(tiles_y >> level, 1)
+            width, height = lx * TILE_CONTENT, ly * TILE_CONTENT
+            tiles = np.lib.format.open_memmap(os.path.join(directory, f"level_{level}.npy"), mode="w+",
+                                              dtype=np.uint8, shape=(ly, lx, TILE_SIZE, TILE_SIZE, 4))
+            # Borda: repete na horizontal (longitude) e estende na vertical (polos)
+            columns = np.arange(-TILE_BORDER, width + TILE_BORDER) % width
+            for ty in range(ly):
+                rows = np.clip(np.arange(ty * TILE_CONTENT - TILE_BORDER, (ty + 1) * TILE_CONTENT + TILE_BORDER),
+                               0, height - 1)
+                if previous is None:
+                    strip = _source_rows(image, rows)
+                else:
+                    # Filtro caixa 2x2 sobre o nível anterior (1 no eixo que já tem um só tile)
+                    fy = previous.shape[0] // ly
+                    fx = previous.shape[1] // lx
+                    parent = _level_rows(previous, (rows[:, None] * fy + np.arange(fy)).reshape(-1))
+                    parent = parent.reshape(len(rows), fy, width, fx, 4).astype(np.uint16)
+                    strip = ((parent.sum(axis=(1, 3)) + fx * fy // 2) // (fx * fy)).astype(np.uint8)
+                strip = strip[:, columns]
+                for tx in range(lx):
+                    x = tx * TILE_CONTENT
+                    tiles[ty, tx] = strip[:, x:x + TILE_SIZE]
+            tiles.flush()
+            previous = tiles
+
+    del previous
+    with open(info_path, "w") as file:
+        json.dump({"source": image_path, "tiles_x": tiles_x, "tiles_y": tiles_y, "levels": levels,
+                   "content": TILE_CONTENT, "border": TILE_BORDER}, file)
+    return directory
+
+
+class VirtualTexture:
+    """
+    Uma textura virtual: pirâmide de tiles em disco (memmap) e a textura de
+    indireção que aponta cada tile virtual para um slot do atlas físico.
+    """
+
+    def __init__(self, vt_id: int, directory: str):
+        with open(os.path.join(directory, "info.json")) as file:
+            info = json.load(file)
+        self.id = vt_id
+        self.source = info["source"]
+        self.tiles_x = info["tiles_x"]
+        self.tiles_y = info["tiles_y"]
+        self.levels = info["levels"]
+        self.tiles = [np.load(os.path.join(directory, f"level_{level}.npy"), mmap_mode="r")
+                      for level in range(self.levels)]
+
+        # Indireção por nível: (slot x, slot y, nível residente, 255)
+        self.indirection = [np.zeros((max(self.tiles_y >> l, 1), max(self.tiles_x >> l, 1), 4), np.uint8)
+                            for l in range(self.levels)]
+        self.indirection_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.indirection_id)
+        for level, data in enumerate(self.indirection):
+            glTexImage2D(GL_TEXTURE_2D, level, GL_RGBA8, data.shape[1], data.shape[0], 0,
+                         GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, self.levels - 1)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST_MIPMAP_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def tile(self, level: int, tx: int, ty: int) -> np.ndarray:
+        """Lê um tile (com borda) do cache em disco."""
+        return np.ascontiguousarray(self.tiles[level][ty, tx])
+
+    def update_indirection(self, resident: dict):
+        """
+        Reconstrói a indireção a partir dos tiles residentes: cada tile virtual
+        aponta para ele mesmo se estiver no atlas, senão para o ancestral
+        residente mais fino.
+
+        :param resident: Mapa (nível, tx, ty) -> (slot x, slot y) deste VT.
+        """
+        coarsest = self.levels - 1
+        for level in range(coarsest, -1, -1):
+            table = self.indirection[level]
+            if level < coarsest:
+                parent = self.indirection[level + 1]
+                ys = np.minimum(np.arange(table.shape[0]) >> 1, parent.shape[0] - 1)
+                xs = np.minimum(np.arange(table.shape[1]) >> 1, parent.shape[1] - 1)
+                table[:] = parent[ys][:, xs]
+            for (l, tx, ty), (sx, sy) in resident.items():
+                if l == level:
+                    table[ty, tx] = (sx, sy, level, 255)
+
+        glBindTexture(GL_TEXTURE_2D, self.indirection_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        for level, table in enumerate(self.indirection):
+            glTexSubImage2D(GL_TEXTURE_2D, level, 0, 0, table.shape[1], table.shape[0],
+                            GL_RGBA, GL_UNSIGNED_BYTE, table)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+
+class VirtualTextureSystem:
+    """
+    Streaming de texturas virtuais: um passe de feedback em baixa resolução
+    descobre quais tiles (e em qual mip) estão visíveis, os tiles são
+    enviados com glTexSubImage2D para um atlas físico com substituição LRU, e
+    as texturas de indireção guiam a amostragem em lightSun.frag.
+    """
+
+    def __init__(self, atlas_slots: int = 16, feedback_scale: int = 8, uploads_per_frame: int = 16,
+                 feedback_ring: int = 3):
+        """
+        :param atlas_slots: Número de slots por lado do atlas físico.
+        :param feedback_scale: Fator de redução da resolução do passe de feedback.
+        :param uploads_per_frame: Máximo de tiles enviados à GPU por frame.
+        :param feedback_ring: Número de PBOs no anel de leitura do feedback.
+        """
+        self.atlas_slots = atlas_slots
+        self.feedback_scale = feedback_scale
+        self.uploads_per_frame = uploads_per_frame
+        self.textures: list[VirtualTexture] = []
+        self.by_model: dict = {}
+
+        size = atlas_slots * TILE_SIZE
+        self.atlas_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.atlas_id)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, size, size, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        # Slots do atlas: chave (vt, nível, tx, ty) -> slot, em ordem de uso (LRU)
+        self.slots: OrderedDict = OrderedDict()
+        self.free_slots = [(sx, sy) for sy in range(atlas_slots) for sx in range(atlas_slots)]
+        self.pinned: set = set()
+        self.dirty: set = set()
+
+        self.feedback_fbo = None
+        self.feedback_size = (0, 0)
+        # Anel de PBOs da leitura do feedback (como em capture.py); in_flight
+        # guarda (índice do PBO, fence, bytes) das leituras pendentes
+        self.feedback_pbos = [glGenBuffers(1) for _ in range(feedback_ring)]
+        self.feedback_pbo_bytes = [0] * len(self.feedback_pbos)
+        self.feedback_in_flight: deque = deque()
+        self.feedback_next = 0
+        self.feedback_pixels = np.empty(0, dtype=np.uint8)
+
+        # Estatísticas
+        self.uploads = 0
+        self.evictions = 0
+        self.requested = 0
+
+    def register(self, model_key: str, image_path: str) -> VirtualTexture:
+        """
+        Registra uma textura virtual para um modelo, gerando o cache de tiles
+        se necessário. O nível mais grosso fica sempre residente como fallback.
+
+        :param model_key: Chave do modelo que usará a textura.
+        :param image_path: Imagem de alta resolução de origem.
+        """
+        vt = VirtualTexture(len(self.textures), build_tile_cache(image_path))
+        self.textures.append(vt)
+        self.by_model[model_key] = vt
+
+        coarsest = vt.levels - 1
+        for ty in range(max(vt.tiles_y >> coarsest, 1)):
+            for tx in range(max(vt.tiles_x >> coarsest, 1)):
+                key = (vt.id, coarsest, tx, ty)
+                self._upload(key)
+                self.pinned.add(key)
+        self._flush_indirection()
+        return vt
+
+    def _upload(self, key: tuple) -> bool:
+        """
+        Envia um tile para o atlas, liberando o slot menos usado se necessário.
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            victim = next((k for k in self.slots if k not in self.pinned), None)
+            if victim is None:
+                return False
+            slot = self.slots.pop(victim)
+            self.dirty.add(victim[0])
+            self.evictions += 1
+
+        vt_id, level, tx, ty = key
+        data = self.textures[vt_id].tile(level, tx, ty)
+        glBindTexture(GL_TEXTURE_2D, self.atlas_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexSubImage2D(GL_TEXTURE_2D, 0, slot[0] * TILE_SIZE, slot[1] * TILE_SIZE,
+                        TILE_SIZE, TILE_SIZE, GL_RGBA, GL_UNSIGNED_BYTE, data)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.slots[key] = slot
+        self.dirty.add(vt_id)
+        self.uploads += 1
+        return True
+
+    def _flush_indirection(self):
+        """Atualiza as indireções dos VTs cujos tiles residentes mudaram."""
+        for vt_id in self.dirty:
+            resident = {(l, tx, ty): slot for (v, l, tx, ty), slot in self.slots.items() if v == vt_id}
+            self.textures[vt_id].update_indirection(resident)
+        self.dirty.clear()
+
+    def _ensure_feedback_target(self, width: int, height: int):
+        """Cria (ou recria) o framebuffer de baixa resolução do passe de feedback."""
+        size = (max(width // self.feedback_scale, 1), max(height // self.feedback_scale, 1))
+        if self.feedback_fbo is not None and size == self.feedback_size:
+            return
+        if self.feedback_fbo is not None:
+            glDeleteFramebuffers(1, [self.feedback_fbo])
+            glDeleteRenderbuffers(2, [self.feedback_color, self.feedback_depth])
+        self.feedback_size = size
+        self.feedback_fbo = glGenFramebuffers(1)
+        self.feedback_color, self.feedback_depth = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.feedback_color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, *size)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.feedback_depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, *size)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.feedback_fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.feedback_color)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.feedback_depth)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+    def set_uniforms(self, shader, vt: VirtualTexture = None, lod_bias: float = 0.0):
+        """
+        Configura os uniforms de amostragem virtual; com vt=None, desliga o VT no shader.
+
+        :param shader: Shader com os uniforms vt_* (lightSun ou vt_feedback).
+        :param vt: Textura virtual do corpo desenhado.
+        :param lod_bias: Correção do nível de mip (usada pelo passe de feedback).
+        """
+        shader.set_bool("use_virtual_texture", vt is not None)
+        if vt is None:
+            return
+        glActiveTexture(GL_TEXTURE0 + 6)
+        glBindTexture(GL_TEXTURE_2D, self.atlas_id)
+        glActiveTexture(GL_TEXTURE0 + 7)
+        glBindTexture(GL_TEXTURE_2D, vt.indirection_id)
+        glActiveTexture(GL_TEXTURE0)
+        shader.set_int("vt_atlas", 6)
+        shader.set_int("vt_indirection", 7)
+        shader.set_vec4("vt_info", float(vt.tiles_x), float(vt.tiles_y), float(vt.levels - 1), float(vt.id))
+        shader.set_float("vt_atlas_slots", float(self.atlas_slots))
+        shader.set_float("vt_lod_bias", lod_bias)
+
+    def feedback_pass(self, shader, projection, view, draws: list, width: int, height: int):
+        """
+        Desenha os corpos com textura virtual em baixa resolução gravando
+        (tile x, tile y, mip, id do VT) por pixel e agenda a leitura em um
+        PBO. A leitura não bloqueia: as requisições devolvidas são as do
+        passe mais recente que a GPU já terminou (um ou dois passes atrás).
+
+        :param shader: Shader de feedback (lightSun.vert + vt_feedback.frag).
+        :param projection: Matriz de projeção da vista principal.
+        :param view: Matriz de visualização da vista principal.
+        :param draws: Lista de (matriz de modelo NumPy, modelo, VirtualTexture).
+        :param width: Largura do framebuffer principal.
+        :param height: Altura do framebuffer principal.
+        :return: Array (n, 4) com as requisições únicas (vt, nível, tx, ty), vazio se nenhuma leitura terminou.
+        """
+        requests = self._harvest_feedback()
+        # Anel cheio: a GPU ainda não terminou as leituras anteriores
+        if len(self.feedback_in_flight) == len(self.feedback_pbos):
+            return requests
+
+        self._ensure_feedback_target(width, height)
+        w, h = self.feedback_size
+        glBindFramebuffer(GL_FRAMEBUFFER, self.feedback_fbo)
+        glViewport(0, 0, w, h)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+        shader.use()
+        shader.set_mat4("projection", projection)
+        shader.set_mat4("view", view)
+        lod_bias = -float(np.log2(self.feedback_scale))
+        for matrix, model, vt in draws:
+            self.set_uniforms(shader, vt, lod_bias)
+            shader.set_mat4_numpy("model", matrix)
+            model.draw(shader)
+
+        # O PBO é realocado quando o tamanho do feedback muda (nunca está em uso aqui)
+        index = self.feedback_next
+        self.feedback_next = (index + 1) % len(self.feedback_pbos)
+        nbytes = w * h * 4
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.feedback_pbos[index])
+        if self.feedback_pbo_bytes[index] != nbytes:
+            glBufferData(GL_PIXEL_PACK_BUFFER, nbytes, None, GL_STREAM_READ)
+            self.feedback_pbo_bytes[index] = nbytes
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glReadPixels(0, 0, w, h, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.feedback_in_flight.append((index, fence, nbytes))
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        return requests
+
+    def _harvest_feedback(self) -> np.ndarray:
+        """
+        Decodifica a leitura de feedback mais recente cuja fence já sinalizou,
+        descartando as mais antigas. Não bloqueia.
+
+        :return: Array (n, 4) de (vt, nível, tx, ty), vazio se nenhuma leitura terminou.
+        """
+        ready = None
+        while self.feedback_in_flight:
+            index, fence, nbytes = self.feedback_in_flight[0]
+            status = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 0)
+            if status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                break
+            self.feedback_in_flight.popleft()
+            glDeleteSync(fence)
+            ready = (index, nbytes)
+        if ready is None:
+            return np.empty((0, 4), dtype=np.int64)
+
+        index, nbytes = ready
+        if self.feedback_pixels.size != nbytes:
+            self.feedback_pixels = np.empty(nbytes, dtype=np.uint8)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.feedback_pbos[index])
+        ptr = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, nbytes, GL_MAP_READ_BIT)
+        if ptr:
+            ctypes.memmove(self.feedback_pixels.ctypes.data, ptr, nbytes)
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        if not ptr:
+            return np.empty((0, 4), dtype=np.int64)
+
+        pixels = self.feedback_pixels.reshape(-1, 4)
+        pixels = pixels[pixels[:, 3] > 0]
+        packed = np.unique(pixels.view(np.uint32).reshape(-1))
+        texels = packed.view(np.uint8).reshape(-1, 4).astype(np.int64)
+        # (tx, ty, nível, vt + 1) -> (vt, nível, tx, ty)
+        return np.stack([texels[:, 3] - 1, texels[:, 2], texels[:, 0], texels[:, 1]], axis=1)
+
+    def update(self, requests: np.ndarray):
+        """
+        Processa as requisições do feedback: marca os tiles usados como
+        recentes e envia os que faltam, limitados por uploads_per_frame.
+        Também pede os ancestrais para que a transição entre mips seja suave.
+
+        :param requests: Array (n, 4) de (vt, nível, tx, ty).
+        """
+        wanted = []
+        for vt_id, level, tx, ty in requests.tolist():
+            if vt_id < 0 or vt_id >= len(self.textures):
+                continue
+            vt = self.textures[vt_id]
+            level = min(level, vt.levels - 1)
+            while level < vt.levels:
+                wanted.append((vt_id, level, tx, ty))
+                level, tx, ty = level + 1, tx >> 1, ty >> 1
+        self.requested = len(requests)
+
+        # Marca primeiro os tiles já residentes, para que não sejam substituídos agora
+        missing = []
+        for key in set(wanted):
+            if key in self.slots:
+                self.slots.move_to_end(key)
+            else:
+                missing.append(key)
+
+        # Prioriza os níveis mais grossos: cobrem mais área com menos uploads
+        budget = self.uploads_per_frame
+        for key in sorted(missing, key=lambda k: -k[1]):
+            if budget <= 0 or not self._upload(key):
+                break
+            budget -= 1
+        self._flush_indirection()
+
+    def report(self) -> str:
+        """Resumo do streaming de tiles."""
+        return (f"Texturas virtuais: {len(self.textures)} VTs, {len(self.slots)}/"
+                f"{self.atlas_slots * self.atlas_slots} slots ocupados, "
+                f"{self.uploads} uploads, {self.evictions} substituições")
+
+
+def find_source_image(model_path: str) -> str:
+    """
+    Escolhe a imagem de maior resolução disponível para um modelo, entre os
+    arquivos <Nome>_texture*.png/.jpg do diretório (por exemplo, um
+    Earth_texture_16k.png colocado ao lado do Earth_texture.png).
+
+    :param model_path: Caminho do arquivo do modelo.
+    :return: Caminho da imagem, ou None se não houver nenhuma.
+    """
+    from PIL import Image
+    Image.MAX_IMAGE_PIXELS = None
+
+    directory = os.path.dirname(model_path)
+    name = os.path.basename(directory)
+    best, best_pixels = None, 0
+    for file_name in sorted(os.listdir(directory)):
+        base, extension = os.path.splitext(file_name)
+        if not base.startswith(f"{name}_texture") or extension.lower() not in (".png", ".jpg", ".jpeg"):
+            continue
+        path = os.path.join(directory, file_name)
+        with Image.open(path) as image:
+            pixels = image.width * image.height
+        if pixels > best_pixels:
+            best, best_pixels = path, pixels
+    return best
@@ -0,0 +1,68 @@
+# Importando bibliotecas
+import os
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asserts.obj_loader import load_obj
+from asserts.model import Model
+
+
+def load_with_obj(path):
+    """Leitor nativo em NumPy: vértices e índices de cada malha."""
+    return [(mesh.vertices, mesh.indices) for mesh in load_obj(path)]
+
+
+def load_with_assimp(path):
+    """Caminho antigo: pyassimp + travessia da cena + Model.mesh_arrays."""
+    import pyassimp
+    from pyassimp.postprocess import (
+        aiProcess_Triangulate,
+        aiProcess_GenSmoothNormals,
+        aiProcess_FlipUVs,
+        aiProcess_CalcTangentSpace,
+    )
+    processing = (aiProcess_Triangulate | aiProcess_GenSmoothNormals
+                  | aiProcess_FlipUVs | aiProcess_CalcTangentSpace)
+    with pyassimp.load(path, processing=processing) as scene:
+        return [Model.mesh_arrays(mesh) for mesh in scene.meshes]
+
+
+def bench(function, paths, repeat):
+    """Retorna o menor tempo total (em segundos) de carregar todos os arquivos."""
+    best = float("inf")
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        for path in paths:
+            function(path)
+        best = min(best, time.perf_counter() - inicio)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o leitor OBJ nativo com o pyassimp")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("models", nargs="*", default=sorted(glob.glob("asserts/models/*/*.obj")))
+    args = parser.parse_args()
+
+    obj_time = bench(load_with_obj, args.models, args.repeat)
+    vertices = sum(len(v) for path in args.models for v, _ in load_with_obj(path))
+    print(f"obj (NumPy): {1000.0 * obj_time:8.1f} ms  ({len(args.models)} arquivos, {vertices} vértices)")
+
+    # AssimpError herda de BaseException quando a biblioteca nativa não é encontrada
+    try:
+        assimp_time = bench(load_with_assimp, args.models, args.repeat)
+    except (ImportError, BaseException) as error:
+        if isinstance(error, (KeyboardInterrupt, SystemExit)):
+            raise
+        print(f"pyassimp indisponível: {error}")
+        return
+    vertices = sum(len(v) for path in args.models for v, _ in load_with_assimp(path))
+    print(f"pyassimp:    {1000.0 * assimp_time:8.1f} ms  ({len(args.models)} arquivos, {vertices} vértices)")
+    print(f"speedup:     {assimp_time / obj_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
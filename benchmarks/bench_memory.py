@@ -0,0 +1,72 @@
+# Importando bibliotecas
+import os
+import sys
+import argparse
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from asserts.headless import configure_headless_environment
+
+
+def load_scene(low_memory: bool, asset_pack: str):
+    """
+    Carrega todos os modelos da cena em um contexto sem janela e imprime o
+    RSS antes e depois. Roda em um processo próprio para cada modo, já que a
+    memória devolvida ao alocador nem sempre volta ao sistema.
+    """
+    # O contexto precisa da plataforma EGL antes do primeiro import de OpenGL
+    configure_headless_environment()
+    from asserts.headless import HeadlessContext
+    from asserts import mesh as mesh_module
+    from asserts.asset_pack import assets
+    from asserts.memory import memory_report
+    from asserts.resources import gpu_resources
+
+    os.chdir(RAIZ)
+    mesh_module.LOW_MEMORY = low_memory
+    if asset_pack:
+        assets.open(asset_pack)
+    contexto = HeadlessContext(64, 64)
+    import main as app
+
+    memory_report.mark("antes")
+    modelos = app.cria_modelos()
+    for modelo in modelos.values():
+        modelo.load()
+    memory_report.mark("depois")
+    meshes = [mesh for modelo in modelos.values() for mesh in modelo.model.meshes]
+    # Cópias próprias na CPU (as vistas sobre o mmap do pacote não contam)
+    geometry = sum(mesh.nbytes for mesh in meshes if mesh.vertices is not None and not mesh.mapped)
+    print(f"  {'pouca memória' if low_memory else 'padrão':>14}: {len(meshes)} malhas, "
+          f"{geometry / (1024 * 1024):.1f} MB de geometria na CPU")
+    print(f"  {'':>14}  {memory_report.report()}")
+    print(f"  {'':>14}  {gpu_resources.report()}")
+
+    for modelo in modelos.values():
+        modelo.release()
+    contexto.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória residente da cena completa, com e sem o modo de pouca memória")
+    parser.add_argument("--asset-pack", metavar="ARQUIVO", default="",
+                        help="lê os modelos do pacote gerado por build_asset_pack.py")
+    parser.add_argument("--mode", choices=("default", "low-memory"),
+                        help="mede só um modo neste processo (usado internamente)")
+    args = parser.parse_args()
+
+    if args.mode:
+        load_scene(args.mode == "low-memory", args.asset_pack)
+        return
+
+    print(f"Cena completa{' (pacote de assets)' if args.asset_pack else ''}:")
+    for mode in ("default", "low-memory"):
+        command = [sys.executable, os.path.abspath(__file__), "--mode", mode]
+        if args.asset_pack:
+            command += ["--asset-pack", os.path.abspath(args.asset_pack)]
+        subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Importando bibliotecas
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import glm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asserts.camera import Camera
+from asserts.picking import Picker, camera_ray
+from bench_pipeline import asteroid_scene
+
+
+def brute_force(state, pickable, origin, direction):
+    """Teste do raio contra todas as esferas de uma vez (referência em NumPy)."""
+    bodies = np.flatnonzero(pickable)
+    offset = state.centers[bodies] - origin
+    b = offset @ direction
+    c = (offset * offset).sum(axis=1) - state.radii[bodies] ** 2
+    discriminant = b * b - c
+    with np.errstate(invalid="ignore"):
+        t = b - np.sqrt(discriminant)
+    t = np.where((discriminant >= 0.0) & (c > 0.0) & (t >= 0.0), t, np.inf)
+    best = int(np.argmin(t))
+    return (int(bodies[best]), float(t[best])) if np.isfinite(t[best]) else None
+
+
+def run(count: int, frames: int, picks: int, seed: int = 0):
+    """
+    Seleções sob cursores aleatórios, distribuídas pelos frames e comparadas
+    com a força bruta. A BVH só é atualizada nos frames com seleção, então o
+    custo por frame depende de quantas seleções há por frame.
+    """
+    rng = np.random.default_rng(seed)
+    scene = asteroid_scene(count)
+    scene.model_radius[:] = 2.5
+    pickable = scene.cull & np.array([body.shader != "cor" for body in scene.bodies])
+    picker = Picker(scene, pickable)
+    camera = Camera(glm.vec3(3750.0, 1500.0, -1000.0))
+    camera.look_at(glm.vec3(0.0, 0.0, 0.0))
+    width, height = 1200, 800
+
+    brute_time = 0.0
+    hits = 0
+    for frame in range(frames):
+        state = scene.evaluate(frame / 60.0)
+        picker.update(state)
+        for _ in range(picks * (frame + 1) // frames - picks * frame // frames):
+            # Metade dos cursores sobre um corpo, metade em posições aleatórias
+            if rng.random() < 0.5:
+                target = state.centers[rng.choice(np.flatnonzero(pickable))]
+                origin = np.array(camera.Position, dtype=np.float64)
+                direction = (target - origin) / np.linalg.norm(target - origin)
+            else:
+                origin, direction = camera_ray(camera, rng.uniform(0, width), rng.uniform(0, height),
+                                               width, height)
+            hit = picker.pick_ray(origin, direction)
+            inicio = time.perf_counter()
+            expected = brute_force(state, pickable, origin, direction)
+            brute_time += time.perf_counter() - inicio
+            if (hit is None) != (expected is None) or (hit is not None and abs(hit[1] - expected[1]) > 1e-3):
+                raise AssertionError(f"Seleção divergente: BVH {hit}, força bruta {expected}")
+            hits += hit is not None
+
+    bvh_time = picker.update_time + sum(picker.pick_times)
+    print(f"{len(scene)} corpos ({int(pickable.sum())} selecionáveis), {picks} seleções em {frames} frames, "
+          f"{hits} acertos:")
+    print(f"  {picker.report()}")
+    print(f"  por frame: BVH {1000.0 * bvh_time / frames:.3f} ms, "
+          f"força bruta em NumPy {1000.0 * brute_time / frames:.3f} ms "
+          f"({1000.0 * brute_time / max(picks, 1):.3f} ms por seleção)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência da seleção de corpos com BVH")
+    parser.add_argument("--bodies", type=int, nargs="*", default=[10000, 100000])
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--picks", type=int, nargs="*", default=[6, 600],
+                        help="seleções no total (poucos cliques e seleção contínua sob o cursor)")
+    args = parser.parse_args()
+
+    for count in args.bodies:
+        for picks in args.picks:
+            run(count, args.frames, picks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Importando bibliotecas
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import glm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asserts.camera import Camera
+from asserts.scene import Body, Scene, solar_system
+from asserts.viewport import Viewport
+from asserts.pipeline import FramePipeline
+
+
+def asteroid_scene(count: int, seed: int = 0) -> Scene:
+    """Sistema solar com um cinturão de asteroides, para tornar a avaliação pesada em NumPy."""
+    rng = np.random.default_rng(seed)
+    bodies = list(solar_system().bodies)
+    radius = rng.uniform(700, 1200, count)
+    angle = rng.uniform(0, 2 * np.pi, count)
+    bodies += [
+        Body(f"Asteroid{i}", "Moon", "light", scale=float(rng.uniform(0.5, 2.0)),
+             speed=float(rng.uniform(0.01, 0.1)), phase=float(angle[i]),
+             offset=(0.0, float(rng.normal(0, 10)), float(radius[i])))
+        for i in range(count)
+    ]
+    return Scene(bodies)
+
+
+def prepare_view(viewport, state, index, can_load):
+    """Lista de desenho vetorizada: corpos visíveis da frente para trás."""
+    visible = np.flatnonzero(viewport.visible)
+    return visible[np.argsort(viewport.distance[visible], kind="stable")], []
+
+
+def run(scene, threaded: bool, frames: int, submit_ms: float) -> float:
+    """
+    Executa os frames e retorna o tempo médio por frame (ms). A submissão ao
+    OpenGL é simulada por uma espera que libera o GIL, como as chamadas ao driver.
+    """
+    camera = Camera(glm.vec3(3750, 1500, -1000))
+    pipeline = FramePipeline(scene, [Viewport(camera)], prepare_view, threaded=threaded)
+    inicio = time.perf_counter()
+    for frame in range(frames):
+        camera.process_mouse_movement(1.0, 0.0)
+        packet = pipeline.advance(frame / 60.0, camera, 1200, 800)
+        time.sleep(submit_ms / 1000.0)
+        pipeline.recycle(packet)
+    elapsed = time.perf_counter() - inicio
+    pipeline.close()
+    print(f"  {pipeline.report()}")
+    return 1000.0 * elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a preparação de frames sequencial e em thread")
+    parser.add_argument("--bodies", type=int, nargs="*", default=[1000, 10000, 50000])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--submit-ms", type=float, default=8.0,
+                        help="tempo simulado de submissão ao OpenGL por frame")
+    args = parser.parse_args()
+
+    for count in args.bodies:
+        scene = asteroid_scene(count)
+        print(f"{len(scene)} corpos:")
+        sequential = run(scene, False, args.frames, args.submit_ms)
+        threaded = run(scene, True, args.frames, args.submit_ms)
+        print(f"  sequencial {sequential:.2f} ms/frame, pipeline {threaded:.2f} ms/frame, "
+              f"speedup {sequential / threaded:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
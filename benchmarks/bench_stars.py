@@ -0,0 +1,62 @@
+# Importando bibliotecas
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import glm
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from asserts.headless import configure_headless_environment
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de frame do catálogo de estrelas em pontos (contexto sem janela)")
+    parser.add_argument("--stars", type=int, nargs="*", default=[100000, 300000])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--width", type=int, default=1200)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--magnitude-limit", type=float, default=6.5)
+    args = parser.parse_args()
+
+    # O contexto precisa da plataforma EGL antes do primeiro import de OpenGL
+    configure_headless_environment(software_threads=os.cpu_count() or 1)
+    from OpenGL.GL import glClear, glFinish, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT
+    from asserts.headless import HeadlessContext
+    from asserts.camera import Camera
+    from asserts.shader import Shader
+    from asserts.star_catalog import StarCatalog, write_catalog, synthetic_catalog
+
+    os.chdir(RAIZ)
+    contexto = HeadlessContext(args.width, args.height)
+    shader = Shader("asserts/shaders/star.vert", "asserts/shaders/star.frag")
+    camera = Camera(glm.vec3(3750.0, 1500.0, -1000.0))
+    projection = glm.perspective(glm.radians(camera.Zoom), args.width / args.height, 0.1, 12000.0)
+
+    for count in args.stars:
+        path = os.path.join(tempfile.gettempdir(), f"stars-{count}.bin")
+        write_catalog(path, *synthetic_catalog(count))
+        for limit in (args.magnitude_limit, 99.0):
+            catalogo = StarCatalog(path, shader, magnitude_limit=limit)
+            times = []
+            for frame in range(args.frames):
+                camera.process_mouse_movement(30.0, 0.0)
+                inicio = time.perf_counter()
+                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                catalogo.draw(projection, camera.get_view_matrix())
+                glFinish()
+                times.append(time.perf_counter() - inicio)
+            times = np.array(times) * 1000.0
+            rotulo = f"limite {limit:g}" if limit < 99.0 else "sem limite"
+            print(f"{count} estrelas, {rotulo}: {times.mean():.2f} ms/frame ({1000.0 / times.mean():.0f} FPS), "
+                  f"p95 {np.percentile(times, 95):.2f} ms")
+            print(f"  {catalogo.report()}")
+            catalogo.release()
+        os.remove(path)
+    contexto.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Importando bibliotecas
+import os
+import sys
+import glob
+import time
+import argparse
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from asserts.headless import configure_headless_environment
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carregamento das texturas RGBA8 e comprimidas (contexto sem janela)")
+    parser.add_argument("--models", default=os.path.join(RAIZ, "asserts", "models"))
+    parser.add_argument("--repeat", type=int, default=3, help="medições por textura (vale a menor)")
+    args = parser.parse_args()
+
+    # Cache vazio: a primeira carga comprimida inclui a geração do arquivo
+    os.environ["SOLAR_SYSTEM_CACHE"] = tempfile.mkdtemp(prefix="bench-textures-")
+    configure_headless_environment()
+    from OpenGL.GL import glFinish
+    from asserts.headless import HeadlessContext
+    from asserts import utils
+    from asserts.texture_compress import s3tc_supported, load_compressed_texture
+
+    contexto = HeadlessContext(64, 64)
+    if not s3tc_supported():
+        print("S3TC indisponível neste driver")
+        return
+
+    def measure(load, path):
+        inicio = time.perf_counter()
+        texture_id = load(path)
+        glFinish()
+        elapsed = time.perf_counter() - inicio
+        utils.delete_texture(texture_id)
+        return elapsed
+
+    paths = sorted(glob.glob(os.path.join(args.models, "*", "*_texture.*")))
+    totals = {"RGBA8": 0.0, "geração": 0.0, "comprimida": 0.0}
+    print(f"{'textura':<32} {'RGBA8':>10} {'geração':>10} {'comprimida':>10}")
+    for path in paths:
+        utils.COMPRESS_TEXTURES = False
+        rgba = min(measure(utils.load_texture, path) for _ in range(args.repeat))
+        bake = measure(load_compressed_texture, path)
+        cached = min(measure(load_compressed_texture, path) for _ in range(args.repeat))
+        for name, seconds in zip(totals, (rgba, bake, cached)):
+            totals[name] += seconds
+        print(f"{os.path.basename(path):<32} {1000.0 * rgba:>8.1f}ms {1000.0 * bake:>8.1f}ms "
+              f"{1000.0 * cached:>8.1f}ms")
+    print(f"{'total':<32} " + " ".join(f"{1000.0 * seconds:>8.1f}ms" for seconds in totals.values()))
+    contexto.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Importando bibliotecas
+import os
+import glob
+import time
+import argparse
+from asserts.asset_pack import AssetPackWriter, AssetPack
+from asserts.obj_loader import load_obj
+from asserts.model import fallback_texture_path
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_args():
+    """
+    Lê os argumentos de linha de comando.
+    """
+    parser = argparse.ArgumentParser(description="Gera o pacote de assets (modelos, texturas e shaders) em um único arquivo")
+    parser.add_argument("--output", default="assets.pack", help="arquivo do pacote gerado")
+    parser.add_argument("--models", default="asserts/models/*/*.obj", help="padrão dos modelos incluídos")
+    parser.add_argument("--shaders", default="asserts/shaders/*", help="padrão dos shaders incluídos")
+    parser.add_argument("--verify", action="store_true", help="confere os hashes do pacote gerado")
+    return parser.parse_args()
+
+
+def main(args):
+    # Os nomes das entradas são relativos à raiz do projeto, como em tempo de execução
+    output = os.path.abspath(args.output)
+    os.chdir(RAIZ)
+    inicio = time.perf_counter()
+    writer = AssetPackWriter(output)
+
+    shaders = sorted(glob.glob(args.shaders))
+    for path in shaders:
+        writer.add_shader(path)
+
+    # Mesmo processamento do Model.load_obj_model, feito uma única vez aqui
+    models = sorted(glob.glob(args.models))
+    for path in models:
+        meshes = []
+        for obj_mesh in load_obj(path):
+            texture = obj_mesh.diffuse or fallback_texture_path(os.path.dirname(path))
+            textures = [(texture, "texture_diffuse")] if texture is not None else []
+            meshes.append((obj_mesh.vertices, obj_mesh.indices, textures))
+        writer.add_model(path, meshes)
+
+    size = writer.close()
+    print(f"Pacote {args.output}: {len(writer.entries)} entradas ({len(models)} modelos, "
+          f"{len(shaders)} shaders), {size / (1024 * 1024):.1f} MB em {time.perf_counter() - inicio:.2f} s")
+
+    if args.verify:
+        pack = AssetPack(output)
+        corrupted = pack.verify()
+        pack.close()
+        if corrupted:
+            raise SystemExit(f"Entradas corrompidas: {', '.join(corrupted)}")
+        print("Hashes conferidos")
+
+
+# Chama a função principal
+if __name__ == "__main__":
+    main(parse_args())
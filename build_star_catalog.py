@@ -0,0 +1,56 @@
+# Importando bibliotecas
+import csv
+import time
+import argparse
+import numpy as np
+from asserts.star_catalog import write_catalog, synthetic_catalog
+
+
+def read_csv(path: str):
+    """
+    Lê um catálogo em CSV no formato do HYG (colunas x, y, z em parsecs, mag e ci).
+
+    :return: Posições, magnitudes e índices de cor.
+    """
+    positions, magnitudes, color_indices = [], [], []
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            try:
+                position = (float(row["x"]), float(row["y"]), float(row["z"]))
+                magnitude = float(row["mag"])
+            except (KeyError, ValueError):
+                continue
+            positions.append(position)
+            magnitudes.append(magnitude)
+            # Estrelas sem índice de cor ficam brancas
+            color_indices.append(float(row["ci"]) if row.get("ci") else 0.6)
+    return np.array(positions), np.array(magnitudes), np.array(color_indices)
+
+
+def parse_args():
+    """
+    Lê os argumentos de linha de comando.
+    """
+    parser = argparse.ArgumentParser(description="Gera o catálogo binário de estrelas usado por --star-catalog")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", metavar="ARQUIVO", help="catálogo em CSV (formato HYG: x, y, z, mag, ci)")
+    source.add_argument("--synthetic", type=int, metavar="N", help="gera N estrelas sintéticas")
+    parser.add_argument("--output", default="stars.bin", help="arquivo do catálogo gerado")
+    parser.add_argument("--block-size", type=int, default=1024, help="estrelas por bloco")
+    return parser.parse_args()
+
+
+def main(args):
+    inicio = time.perf_counter()
+    if args.csv:
+        positions, magnitudes, color_indices = read_csv(args.csv)
+    else:
+        positions, magnitudes, color_indices = synthetic_catalog(args.synthetic)
+    blocks = write_catalog(args.output, positions, magnitudes, color_indices, args.block_size)
+    print(f"Catálogo {args.output}: {len(positions)} estrelas em {blocks} blocos "
+          f"({time.perf_counter() - inicio:.2f} s)")
+
+
+# Chama a função principal
+if __name__ == "__main__":
+    main(parse_args())
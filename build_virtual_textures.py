@@ -0,0 +1,31 @@
+# Importando bibliotecas
+import os
+import glob
+import time
+import argparse
+from asserts.virtual_texture import build_tile_cache, find_source_image
+
+
+def parse_args():
+    """
+    Lê os argumentos de linha de comando.
+    """
+    parser = argparse.ArgumentParser(
+        description="Gera com antecedência os caches de tiles usados por --virtual-textures")
+    parser.add_argument("--models", default="asserts/models", help="diretório dos modelos")
+    return parser.parse_args()
+
+
+def main(args):
+    # Sem o cache pronto, a primeira execução com --virtual-textures gera os tiles antes do primeiro frame
+    for model_path in sorted(glob.glob(os.path.join(args.models, "*", "*.obj"))):
+        image = find_source_image(model_path)
+        if image is None:
+            continue
+        inicio = time.perf_counter()
+        directory = build_tile_cache(image)
+        print(f"{image} -> {directory} ({time.perf_counter() - inicio:.1f} s)")
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -1,15 +1,61 @@
 # Importando bibliotecas
+import time
+from asserts.startup import startup_profiler
+_inicio_imports = time.perf_counter()
+import argparse
+import logging
+# glfw, PyOpenGL, glm e NumPy ficam no topo: todos são usados antes do
+# primeiro frame (contexto, câmera e cena), então adiá-los só moveria o tempo
+# de "import" para outra categoria. pyassimp e PIL são importados no primeiro
+# modelo e na primeira textura (asserts/model.py e asserts/utils.py)
 import glfw
 from OpenGL.GL import *
 import glm
+import numpy as np
 from asserts.camera import Camera
 from asserts.shader import Shader
-from asserts.model import Model
+from asserts.shader_cache import shader_cache
+from asserts import model as model_module
+from asserts import mesh as mesh_module
+from asserts.model import LazyModel
 from asserts.camera import CameraMovement
+from asserts.recorder import InputRecorder, InputReplayer
+from asserts.capture import FrameCapture, CAPTURE_FORMATS
+from asserts.scene import solar_system
+from asserts.viewport import layout_viewports
+from asserts.virtual_texture import VirtualTextureSystem, find_source_image
+from asserts import utils
+from asserts.texture_compress import texture_stats
+from asserts.resources import gpu_resources
+from asserts.render_queue import RenderQueue
+from asserts.pipeline import FramePipeline
+from asserts.occlusion import OcclusionCuller
+from asserts.skybox import Skybox
+from asserts import asset_pack
+from asserts.asset_pack import assets
+from asserts.picking import Picker, view_at
+from asserts.trails import OrbitTrails
+from asserts.star_catalog import StarCatalog
+from asserts.memory import memory_report
+startup_profiler.add("import", time.perf_counter() - _inicio_imports)
 
 # Configurações da tela
 WIDTH, HEIGHT = 1200, 800
 
+# Raios estimados dos modelos (usados no culling antes do carregamento)
+RAIO_ESFERA = 2.5
+RAIO_ORBITA = 1.0
+
+# Tamanho mínimo, em pixels, para um corpo visível ser carregado
+TAMANHO_MINIMO_PIXELS = 1.0
+
+# Intervalo, em frames, entre os passes de feedback das texturas virtuais
+VT_INTERVALO_FEEDBACK = 2
+
+# Fundo em cubemap e plano distante usado com ele (a órbita de Netuno tem raio 5300)
+IMAGEM_ESTRELAS = "asserts/models/Stars/Stars_texture.png"
+PLANO_DISTANTE_SKYBOX = 12000.0
+
 # Camera
 camera = Camera(glm.vec3(3750.0, 1500.0, -1000.0))
 ultimo_x = WIDTH / 2.0
@@ -21,6 +67,13 @@ intervalo_entre_frames = 0.0
 tempo_ultimo_frame = 0.0
 tempo = 0.0
 
+# Gravação e reprodução de entradas
+gravador = None
+reprodutor = None
+
+# Seleção de corpos: posição do último clique ainda não processado
+clique_pendente = None
+
 def framebuffer_size_callback(window, width, height):
     """
     Classe para quando a janela é redimensionada, atualizar a viewport do OpenGL
@@ -33,6 +86,10 @@ def mouse_callback(window, xpos, ypos):
     """
     global ultimo_x, ultimo_y, first_mouse
 
+    # Durante a reprodução a câmera é controlada pela gravação
+    if reprodutor is not None:
+        return
+
     # Verifica se o mouse foi movido
     if first_mouse:
         ultimo_x = xpos
@@ -46,12 +103,32 @@ def mouse_callback(window, xpos, ypos):
 
     # Processa o movimento do mouse
     camera.process_mouse_movement(xoffset, yoffset)
+    if gravador is not None:
+        gravador.record_mouse(glfw.get_time(), xoffset, yoffset)
 
 def scroll_callback(window, xoffset, yoffset):
     """
     Classe que processa o scroll do mouse.
     """
+    if reprodutor is not None:
+        return
     camera.process_mouse_scroll(yoffset)
+    if gravador is not None:
+        gravador.record_scroll(glfw.get_time(), yoffset)
+
+def mouse_button_callback(window, button, action, mods):
+    """
+    Classe que registra o clique para a seleção de corpos.
+    """
+    global clique_pendente
+    if button != glfw.MOUSE_BUTTON_LEFT or action != glfw.PRESS:
+        return
+    # Com o cursor preso, a seleção é feita pela mira no centro da janela
+    if glfw.get_input_mode(window, glfw.CURSOR) == glfw.CURSOR_DISABLED:
+        largura, altura = glfw.get_window_size(window)
+        clique_pendente = (largura / 2.0, altura / 2.0)
+    else:
+        clique_pendente = glfw.get_cursor_pos(window)
 
 def process_input(window):
     """
@@ -68,21 +145,179 @@ def process_input(window):
     if glfw.get_key(window, glfw.KEY_ESCAPE) == glfw.PRESS:
         glfw.set_window_should_close(window, True)
 
+    # Durante a reprodução a câmera é controlada pela gravação
+    if reprodutor is not None:
+        return
+
     # Movimentação WASD
-    if glfw.get_key(window, glfw.KEY_W) == glfw.PRESS:
-        camera.process_keyboard(CameraMovement.FORWARD, intervalo_entre_frames * multiplier)
-    if glfw.get_key(window, glfw.KEY_S) == glfw.PRESS:
-        camera.process_keyboard(CameraMovement.BACKWARD, intervalo_entre_frames * multiplier)
-    if glfw.get_key(window, glfw.KEY_A) == glfw.PRESS:
-        camera.process_keyboard(CameraMovement.LEFT, intervalo_entre_frames * multiplier)
-    if glfw.get_key(window, glfw.KEY_D) == glfw.PRESS:
-        camera.process_keyboard(CameraMovement.RIGHT, intervalo_entre_frames * multiplier)
-    
-
-def main():
-    global tempo_ultimo_frame, intervalo_entre_frames, tempo
+    teclas = (
+        (glfw.KEY_W, CameraMovement.FORWARD),
+        (glfw.KEY_S, CameraMovement.BACKWARD),
+        (glfw.KEY_A, CameraMovement.LEFT),
+        (glfw.KEY_D, CameraMovement.RIGHT),
+    )
+    for tecla, direcao in teclas:
+        if glfw.get_key(window, tecla) == glfw.PRESS:
+            camera.process_keyboard(direcao, intervalo_entre_frames * multiplier)
+            if gravador is not None:
+                gravador.record_key(glfw.get_time(), direcao, intervalo_entre_frames * multiplier)
+
+def prepara_vista(vista, estado, modelos, shaders, fila, pode_carregar):
+    """
+    Monta e ordena a lista de desenho de uma vista na fila de desenho, que
+    agrupa as submissões para minimizar as trocas de programa, VAO e texturas.
+
+    :param pode_carregar: Se False (fora da thread do OpenGL), os modelos que
+                          precisam ser carregados são apenas devolvidos como pendentes.
+    :return: Registros ordenados e modelos pendentes.
+    """
+    nomes_shaders = list(shaders)
+    pendentes = []
+    fila.clear()
+    for i in np.flatnonzero(vista.visible):
+        corpo = estado.scene.bodies[i]
+        modelo = modelos[corpo.model]
+
+        # Modelos são materializados quando o corpo aparece com tamanho suficiente na tela
+        if not modelo.loaded:
+            if vista.screen_radius[i] < TAMANHO_MINIMO_PIXELS:
+                continue
+            if not pode_carregar:
+                pendentes.append(corpo.model)
+                continue
+            modelo.load()
+            estado.scene.bind_models(modelos)
+
+        fila.submit(nomes_shaders.index(corpo.shader), modelo.model, i, vista.distance[i])
+    return fila.sort(vista.far), pendentes
+
+def desenha_vista(vista, estado, shaders, fila, vt_sistema=None, oclusao=None, altura=0):
+    """
+    Executa a lista de desenho já ordenada de uma vista, sem os corpos que o
+    teste de oclusão do frame anterior considerou ocultos.
+    """
+    registros = vista.records
+    if oclusao is not None:
+        ocultos = oclusao.begin(vista, estado)
+        registros = registros[~ocultos[registros["transform"]]]
+
+    def uniforms_vt(shader, i):
+        corpo = estado.scene.bodies[i]
+        if corpo.shader == "light":
+            vt_sistema.set_uniforms(shader, vt_sistema.by_model.get(corpo.model))
+
+    fila.execute(registros, list(shaders.values()), estado.matrices,
+                 vista.projection, vista.view, uniforms_vt if vt_sistema is not None else None)
+
+    # Consultas de oclusão contra a profundidade desta vista (lidas nos próximos frames)
+    if oclusao is not None:
+        oclusao.issue(vista, estado, vista.projection, vista.view, altura)
+
+def cria_shaders():
+    """
+    Compila os shaders da cena, indexados pela chave usada nos corpos.
+    """
+    with startup_profiler.section("shaders"):
+        planetas_shader = Shader("asserts/shaders/model_loading.vert", "asserts/shaders/model_loading.frag")
+        cor_shader      = Shader("asserts/shaders/model_loading.vert", "asserts/shaders/color.frag")
+        light_shader    = Shader("asserts/shaders/lightSun.vert", "asserts/shaders/lightSun.frag")
+    logging.info(shader_cache.report())
+
+    return {"planetas": planetas_shader, "cor": cor_shader, "light": light_shader}
+
+def cria_modelos():
+    """
+    Cria os handles dos modelos; cada um é carregado no primeiro uso.
+    """
+    return {
+        "Sun":      LazyModel("asserts/models/Sun/Sun.obj", radius=RAIO_ESFERA),
+        "Mercury":  LazyModel("asserts/models/Mercury/Mercury.obj", radius=RAIO_ESFERA),
+        "Venus":    LazyModel("asserts/models/Venus/Venus.obj", radius=RAIO_ESFERA),
+        "Earth":    LazyModel("asserts/models/Earth/Earth.obj", radius=RAIO_ESFERA),
+        "Moon":     LazyModel("asserts/models/Moon/Moon.obj", radius=RAIO_ESFERA),
+        "Mars":     LazyModel("asserts/models/Mars/Mars.obj", radius=RAIO_ESFERA),
+        "Jupiter":  LazyModel("asserts/models/Jupiter/Jupiter.obj", radius=RAIO_ESFERA),
+        "Saturn":   LazyModel("asserts/models/Saturn/Saturn.obj", radius=RAIO_ESFERA),
+        "Uranus":   LazyModel("asserts/models/Uranus/Uranus.obj", radius=RAIO_ESFERA),
+        "Neptune":  LazyModel("asserts/models/Neptune/Neptune.obj", radius=RAIO_ESFERA),
+
+        # Background
+        "Stars":    LazyModel("asserts/models/Stars/Stars.obj", radius=RAIO_ESFERA),
+        "Orbita":   LazyModel("asserts/models/Line/Line.obj", radius=RAIO_ORBITA),
+        "Orbita2":  LazyModel("asserts/models/Line2/Line2.obj", radius=RAIO_ORBITA),
+        "Orbita3":  LazyModel("asserts/models/Line3/Line3.obj", radius=RAIO_ORBITA),
+    }
+
+def parse_args():
+    """
+    Lê os argumentos de linha de comando.
+    """
+    parser = argparse.ArgumentParser(description="Sistema Solar em Python")
+    parser.add_argument("--record", metavar="ARQUIVO",
+                        help="grava as entradas e o caminho da câmera no arquivo")
+    parser.add_argument("--replay", metavar="ARQUIVO",
+                        help="reproduz uma gravação em passos fixos (modo benchmark)")
+    parser.add_argument("--fixed-dt", type=float, default=1.0 / 60.0,
+                        help="passo de tempo fixo usado na reprodução (padrão: 1/60 s)")
+    parser.add_argument("--capture", metavar="DIRETORIO",
+                        help="captura os frames renderizados para o diretório")
+    parser.add_argument("--capture-format", choices=CAPTURE_FORMATS, default="png",
+                        help="formato dos frames capturados (padrão: png)")
+    parser.add_argument("--layout", choices=("single", "split", "pip"), default="single",
+                        help="vistas: única, tela dividida ou picture-in-picture")
+    parser.add_argument("--follow", default="Earth",
+                        help="corpo seguido pela segunda vista (padrão: Earth)")
+    parser.add_argument("--loader", choices=model_module.LOADERS, default=model_module.DEFAULT_LOADER,
+                        help="leitor de modelos: nativo em NumPy para .obj (auto/obj) ou pyassimp")
+    parser.add_argument("--virtual-textures", action="store_true",
+                        help="usa streaming de texturas virtuais nos planetas (mapas de alta resolução)")
+    parser.add_argument("--vt-atlas-slots", type=int, default=16,
+                        help="slots por lado do atlas físico de tiles (padrão: 16)")
+    parser.add_argument("--eager-models", action="store_true",
+                        help="carrega todos os modelos antes do primeiro frame")
+    parser.add_argument("--low-memory", action="store_true", default=mesh_module.LOW_MEMORY,
+                        help="descarta as cópias de vértices e índices na CPU depois do upload")
+    parser.add_argument("--compress-textures", action="store_true", default=utils.COMPRESS_TEXTURES,
+                        help="usa texturas comprimidas BC1/BC3 geradas no primeiro uso (requer S3TC)")
+    parser.add_argument("--vram-budget", type=float, default=gpu_resources.budget_bytes / (1024 * 1024),
+                        help="orçamento de VRAM em MB para texturas e malhas (0 para ilimitado)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="prepara o próximo frame em uma thread enquanto o atual é submetido")
+    parser.add_argument("--star-catalog", metavar="ARQUIVO",
+                        help="desenha as estrelas do catálogo gerado por build_star_catalog.py como pontos")
+    parser.add_argument("--star-magnitude-limit", type=float, default=6.5,
+                        help="magnitude mais fraca desenhada do catálogo de estrelas")
+    parser.add_argument("--trails", action="store_true",
+                        help="desenha o rastro recente de planetas e luas")
+    parser.add_argument("--trail-samples", type=int, default=256,
+                        help="amostras guardadas por corpo no rastro")
+    parser.add_argument("--picking", action="store_true",
+                        help="seleciona com o clique o corpo sob o cursor (BVH atualizada a cada frame)")
+    parser.add_argument("--occlusion", action="store_true",
+                        help="descarta corpos escondidos atrás do Sol e dos gigantes gasosos (consultas de oclusão)")
+    parser.add_argument("--asset-pack", metavar="ARQUIVO", default=asset_pack.ASSET_PACK,
+                        help="lê modelos, texturas e shaders do pacote gerado por build_asset_pack.py")
+    parser.add_argument("--skybox", action=argparse.BooleanOptionalAction, default=True,
+                        help="fundo de estrelas em cubemap desenhado por último (--no-skybox usa a esfera antiga)")
+    return parser.parse_args()
+
+def main(args):
+    global tempo_ultimo_frame, intervalo_entre_frames, tempo, gravador, reprodutor, clique_pendente
+
+    model_module.DEFAULT_LOADER = args.loader
+    utils.COMPRESS_TEXTURES = args.compress_textures
+    mesh_module.LOW_MEMORY = args.low_memory
+    gpu_resources.budget_bytes = int(args.vram_budget * 1024 * 1024)
+    if args.asset_pack:
+        assets.open(args.asset_pack)
+
+    if args.replay:
+        reprodutor = InputReplayer(args.replay, args.fixed_dt)
+    elif args.record:
+        gravador = InputRecorder(args.record)
 
     # Inicializa o GLFW
+    inicio_contexto = time.perf_counter()
     if not glfw.init():
         print("Falha ao inicializar GLFW")
         return
@@ -100,9 +335,11 @@ def main():
         return
 
     glfw.make_context_current(window)
+    startup_profiler.add("contexto", time.perf_counter() - inicio_contexto)
     glfw.set_framebuffer_size_callback(window, framebuffer_size_callback)
     glfw.set_cursor_pos_callback(window, mouse_callback)
     glfw.set_scroll_callback(window, scroll_callback)
+    glfw.set_mouse_button_callback(window, mouse_button_callback)
 
     # Modo do mouse desabilitado => escondido e "preso" ao centro
     glfw.set_input_mode(window, glfw.CURSOR, glfw.CURSOR_DISABLED)
@@ -111,283 +348,234 @@ def main():
     glEnable(GL_DEPTH_TEST)
 
     # Carrega shaders
-    planetas_shader = Shader("asserts/shaders/model_loading.vert", "asserts/shaders/model_loading.frag")
-    cor_shader      = Shader("asserts/shaders/model_loading.vert", "asserts/shaders/color.frag")
-    light_shader    = Shader("asserts/shaders/lightSun.vert", "asserts/shaders/lightSun.frag")
-
-    # Carrega modelos
-    Sun      = Model("asserts/models/Sun/Sun.obj")
-    Mercury  = Model("asserts/models/Mercury/Mercury.obj")
-    Venus    = Model("asserts/models/Venus/Venus.obj")
-    Earth    = Model("asserts/models/Earth/Earth.obj")
-    Moon     = Model("asserts/models/Moon/Moon.obj")
-    Mars     = Model("asserts/models/Mars/Mars.obj")
-    Jupiter  = Model("asserts/models/Jupiter/Jupiter.obj")
-    Saturn   = Model("asserts/models/Saturn/Saturn.obj")
-    Uranus   = Model("asserts/models/Uranus/Uranus.obj")
-    Neptune  = Model("asserts/models/Neptune/Neptune.obj")
-
-    # Background
-    Stars    = Model("asserts/models/Stars/Stars.obj")
-    Orbita   = Model("asserts/models/Line/Line.obj")
-    Orbita2  = Model("asserts/models/Line2/Line2.obj")
-    Orbita3  = Model("asserts/models/Line3/Line3.obj")
+    shaders = cria_shaders()
+
+    # Modelos: apenas handles, o carregamento acontece no primeiro frame em que aparecem
+    memory_report.mark("antes dos modelos")
+    modelos = cria_modelos()
+    if args.eager_models:
+        for modelo in modelos.values():
+            modelo.load()
+        memory_report.mark("modelos carregados")
+
+    # Cena e vistas
+    # A esfera de fundo esconderia as estrelas do catálogo, desenhadas no infinito
+    cena = solar_system(background=not (args.skybox or args.star_catalog))
+    cena.bind_models(modelos)
+    vistas = layout_viewports(args.layout, camera, Camera(), args.follow)
+
+    # Fundo em cubemap: sem a esfera de 4000 unidades, o plano distante pode encolher
+    skybox = None
+    if args.skybox:
+        skybox = Skybox(IMAGEM_ESTRELAS, Shader("asserts/shaders/skybox.vert", "asserts/shaders/skybox.frag"))
+        for vista in vistas:
+            vista.far = PLANO_DISTANTE_SKYBOX
+    filas = [RenderQueue() for _ in vistas]
+
+    # Catálogo de estrelas em pontos, somado ao fundo
+    estrelas = None
+    if args.star_catalog:
+        for vista in vistas:
+            vista.far = PLANO_DISTANTE_SKYBOX
+        estrelas = StarCatalog(args.star_catalog, Shader("asserts/shaders/star.vert", "asserts/shaders/star.frag"),
+                               args.star_magnitude_limit)
+
+    # Rastros de planetas e luas (anéis, órbitas e fundo não deixam rastro)
+    rastros = None
+    if args.trails:
+        rastros = OrbitTrails(
+            [i for i, corpo in enumerate(cena.bodies)
+             if corpo.shader == "light" and not corpo.model.startswith("Orbita")],
+            Shader("asserts/shaders/trail.vert", "asserts/shaders/trail.frag"), args.trail_samples)
+
+    # A preparação dos frames (cena, câmeras, culling e ordenação) pode rodar
+    # em uma thread de trabalho, um frame à frente da submissão ao OpenGL
+    pipeline = FramePipeline(
+        cena, vistas,
+        lambda vista, estado, indice, pode_carregar: prepara_vista(
+            vista, estado, modelos, shaders, filas[indice], pode_carregar),
+        threaded=args.pipeline)
+
+    # Seleção de corpos (planetas, luas e anéis; órbitas e fundo ficam de fora)
+    selecao = None
+    if args.picking:
+        selecao = Picker(cena, cena.cull & np.array([corpo.shader != "cor" for corpo in cena.bodies]))
+
+    # Culling por oclusão (um conjunto de consultas por vista)
+    oclusores = [None] * len(vistas)
+    if args.occlusion:
+        solido = Shader("asserts/shaders/solid.vert", "asserts/shaders/solid.frag")
+        oclusores = [OcclusionCuller(cena, solido) for _ in vistas]
+
+    # Texturas virtuais para os corpos desenhados com o light_shader
+    vt_sistema = None
+    if args.virtual_textures:
+        vt_shader = Shader("asserts/shaders/lightSun.vert", "asserts/shaders/vt_feedback.frag")
+        vt_sistema = VirtualTextureSystem(args.vt_atlas_slots)
+        for chave in sorted({corpo.model for corpo in cena.bodies if corpo.shader == "light"}):
+            imagem = find_source_image(modelos[chave].path)
+            if imagem is not None:
+                vt_sistema.register(chave, imagem)
+
+    # Todos os programas foram linkados: os estágios compilados não são mais necessários
+    shader_cache.release_stages()
+
+    tempos_cpu = {"preparação": 0.0, "submissão": 0.0}
+
+    # Captura de frames
+    captura = None
+    if args.capture:
+        largura, altura = glfw.get_framebuffer_size(window)
+        captura = FrameCapture(largura, altura, args.capture, args.capture_format)
+    numero_frame = 0
 
     # Loop principal
     while not glfw.window_should_close(window):
         # Tempo e delta_time
         frame_atual = glfw.get_time()
-        intervalo_entre_frames = frame_atual - tempo_ultimo_frame
+        if reprodutor is not None:
+            # Relógio e câmera avançam em passos fixos a partir da gravação
+            if reprodutor.finished:
+                glfw.set_window_should_close(window, True)
+                break
+            tempo, intervalo_entre_frames = reprodutor.step(camera, frame_atual)
+        else:
+            intervalo_entre_frames = frame_atual - tempo_ultimo_frame
+            tempo += intervalo_entre_frames
         tempo_ultimo_frame = frame_atual
-        tempo += intervalo_entre_frames
+        gpu_resources.begin_frame()
 
         # Input
         process_input(window)
+        if gravador is not None:
+            gravador.record_frame(frame_atual, tempo, intervalo_entre_frames, camera)
+
+        # Frame a submeter (avaliação da cena feita uma única vez por frame)
+        largura, altura = glfw.get_framebuffer_size(window)
+        inicio = time.perf_counter()
+        pacote = pipeline.advance(tempo, camera, largura, altura)
+        estado = pacote.state
+        tempos_cpu["preparação"] += time.perf_counter() - inicio
 
         # Limpa buffers
+        inicio = time.perf_counter()
+        if rastros is not None:
+            rastros.update(estado)
+        glViewport(0, 0, largura, altura)
         glClearColor(1.0, 1.0, 1.0, 1.0)
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
-        # Configura matrizes de projeção e view
-        projecao = glm.perspective(glm.radians(camera.Zoom), float(WIDTH)/float(HEIGHT), 0.1, 25000.0)
-        visualizacao = camera.get_view_matrix()
-
-        # ----- Desenho do Background com planetas_shader -----
-        planetas_shader.use()
-        planetas_shader.set_mat4("projection", projecao)
-        planetas_shader.set_mat4("view", visualizacao)
-
-        # Background
-        background_mat = glm.mat4(1.0)
-        background_mat = glm.translate(background_mat, glm.vec3(0.0, 0.0, 0.0))
-        background_mat = glm.scale(background_mat, glm.vec3(4000, 4000, 4000))
-        planetas_shader.set_mat4("model", background_mat)
-        Stars.draw(planetas_shader)
-
-        # Sol
-        sun_mat = glm.mat4(1.0)
-        sun_mat = glm.scale(sun_mat, glm.vec3(50, 50, 50))
-        planetas_shader.set_mat4("model", sun_mat)
-        Sun.draw(planetas_shader)
-
-        # ----- Desenho dos planetas com light_shader -----
-        light_shader.use()
-        light_shader.set_mat4("projection", projecao)
-        light_shader.set_mat4("view", visualizacao)
-
-        # Mercury
-        mercury = glm.mat4(1.0)
-        mercury = glm.translate(mercury, glm.vec3(0.0, 0.0, 0.0))
-        mercury = glm.scale(mercury, glm.vec3(10, 10, 10))
-        mercury = glm.rotate(mercury, tempo, glm.vec3(0,1,0))
-        mercury = glm.translate(mercury, glm.vec3(0.0, 0.0, 17.5))
-        light_shader.set_mat4("model", mercury)
-        Mercury.draw(light_shader)
-
-        # Venus
-        venus = glm.mat4(1.0)
-        venus = glm.translate(venus, glm.vec3(0.0, 0.0, 0.0))
-        venus = glm.scale(venus, glm.vec3(15,15,15))
-        venus = glm.rotate(venus, tempo/2, glm.vec3(0,1,0))
-        venus = glm.translate(venus, glm.vec3(0,0,22))
-        light_shader.set_mat4("model", venus)
-        Venus.draw(light_shader)
-
-        # Earth
-        earth = glm.mat4(1.0)
-        earth = glm.translate(earth, glm.vec3(0.0, 0.0, 0.0))
-        earth = glm.scale(earth, glm.vec3(17,17,17))
-        earth = glm.rotate(earth, tempo/6, glm.vec3(0,1,0))
-        earth = glm.translate(earth, glm.vec3(0,0,26))
-        light_shader.set_mat4("model", earth)
-        Earth.draw(light_shader)
-        # Moon (da Terra)
-        earth = glm.scale(earth, glm.vec3(0.5,0.5,0.5))
-        earth = glm.rotate(earth, tempo/6, glm.vec3(0,1,0))
-        earth = glm.translate(earth, glm.vec3(-3,0,8))
-        light_shader.set_mat4("model", earth)
-        Moon.draw(light_shader)
-
-        # Mars
-        mars = glm.mat4(1.0)
-        mars = glm.translate(mars, glm.vec3(0,0,0))
-        mars = glm.scale(mars, glm.vec3(13,13,13))
-        mars = glm.rotate(mars, tempo / 6.5, glm.vec3(0,1,0))
-        mars = glm.translate(mars, glm.vec3(0,0,50))
-        light_shader.set_mat4("model", mars)
-        Mars.draw(light_shader)
-
-        # Jupiter
-        jupiter = glm.mat4(1.0)
-        jupiter = glm.translate(jupiter, glm.vec3(0,0,0))
-        jupiter = glm.scale(jupiter, glm.vec3(45,45,45))
-        jupiter = glm.rotate(jupiter, tempo/8, glm.vec3(0,1,0))
-        jupiter = glm.translate(jupiter, glm.vec3(0,0,30))
-        light_shader.set_mat4("model", jupiter)
-        Jupiter.draw(light_shader)
-
-        moon1 = jupiter
-        moon2 = jupiter
-        moon3 = jupiter
-        moon4 = jupiter
-        moon5 = jupiter
-        moon6 = jupiter
-        moon7 = jupiter
-        moon8 = jupiter
-
-        # Luas de Júpiter
-        jupiter = glm.scale(jupiter, glm.vec3(0.1,0.1,0.1))
-        jupiter = glm.rotate(jupiter, tempo/4, glm.vec3(0,1,0))
-        jupiter = glm.translate(jupiter, glm.vec3(-40,0,10))
-        light_shader.set_mat4("model", jupiter)
-        Moon.draw(light_shader)
-
-        moon1 = glm.scale(moon1, glm.vec3(0.1,0.1,0.1))
-        moon1 = glm.rotate(moon1, tempo/4, glm.vec3(0,1,0))
-        moon1 = glm.translate(moon1, glm.vec3(-30, 15, -20))
-        light_shader.set_mat4("model", moon1)
-        Moon.draw(light_shader)
-
-        moon2 = glm.scale(moon2, glm.vec3(0.1,0.1,0.1))
-        moon2 = glm.rotate(moon2, tempo/4, glm.vec3(0,1,0))
-        moon2 = glm.translate(moon2, glm.vec3(-25, -10, 10))
-        light_shader.set_mat4("model", moon2)
-        Moon.draw(light_shader)
-
-        moon3 = glm.scale(moon3, glm.vec3(0.1,0.1,0.1))
-        moon3 = glm.rotate(moon3, tempo/4, glm.vec3(0,1,0))
-        moon3 = glm.translate(moon3, glm.vec3(-25, 10, 20))
-        light_shader.set_mat4("model", moon3)
-        Moon.draw(light_shader)
-
-        moon4 = glm.scale(moon4, glm.vec3(0.1,0.1,0.1))
-        moon4 = glm.rotate(moon4, tempo/4, glm.vec3(0,1,0))
-        moon4 = glm.translate(moon4, glm.vec3(-40, -15, 10))
-        light_shader.set_mat4("model", moon4)
-        Moon.draw(light_shader)
-
-        moon5 = glm.scale(moon5, glm.vec3(0.1,0.1,0.1))
-        moon5 = glm.rotate(moon5, tempo / 4, glm.vec3(0,1,0))
-        moon5 = glm.translate(moon5, glm.vec3(-20, 5, 5))
-        light_shader.set_mat4("model", moon5)
-        Moon.draw(light_shader)
-
-        moon6 = glm.scale(moon6, glm.vec3(0.1,0.1,0.1))
-        moon6 = glm.rotate(moon6, tempo / 4, glm.vec3(0,1,0))
-        moon6 = glm.translate(moon6, glm.vec3(-22, -3, 3))
-        light_shader.set_mat4("model", moon6)
-        Moon.draw(light_shader)
-
-        moon7 = glm.scale(moon7, glm.vec3(0.1,0.1,0.1))
-        moon7 = glm.rotate(moon7, tempo / 4, glm.vec3(0,1,0))
-        moon7 = glm.translate(moon7, glm.vec3(-28, 2, 2))
-        light_shader.set_mat4("model", moon7)
-        Moon.draw(light_shader)
-
-        moon8 = glm.scale(moon8, glm.vec3(0.1,0.1,0.1))
-        moon8 = glm.rotate(moon8, tempo / 4, glm.vec3(0,1,0))
-        moon8 = glm.translate(moon8, glm.vec3(-30, -1, 1))
-        light_shader.set_mat4("model", moon8)
-        Moon.draw(light_shader)
-
-        # Saturn
-        saturn = glm.mat4(1.0)
-        saturn = glm.translate(saturn, glm.vec3(0,0,0))
-        saturn = glm.scale(saturn, glm.vec3(42,42,42))
-        saturn = glm.rotate(saturn, tempo/10, glm.vec3(0,1,0))
-        saturn = glm.translate(saturn, glm.vec3(0,0,60))
-        light_shader.set_mat4("model", saturn)
-        Saturn.draw(light_shader)
-        # Saturno (anéis)
-        saturn = glm.scale(saturn, glm.vec3(4,4,4))
-        saturn = glm.rotate(saturn, float(glfw.get_time())-60, glm.vec3(0,1,0))
-        saturn = glm.translate(saturn, glm.vec3(0,0,0))
-        light_shader.set_mat4("model", saturn)
-        Orbita3.draw(light_shader)
-
-        # Uranus
-        uranus = glm.mat4(1.0)
-        uranus = glm.translate(uranus, glm.vec3(0,0,0))
-        uranus = glm.scale(uranus, glm.vec3(30,30,30))
-        uranus = glm.rotate(uranus, tempo/12, glm.vec3(0,1,0))
-        uranus = glm.translate(uranus, glm.vec3(0,0,120))
-        light_shader.set_mat4("model", uranus)
-        Uranus.draw(light_shader)
-
-        # Neptune
-        neptune = glm.mat4(1.0)
-        neptune = glm.translate(neptune, glm.vec3(0,0,0))
-        neptune = glm.scale(neptune, glm.vec3(29,29,29))
-        neptune = glm.rotate(neptune, tempo/14, glm.vec3(0,1,0))
-        neptune = glm.translate(neptune, glm.vec3(0,0,180))
-        light_shader.set_mat4("model", neptune)
-        Neptune.draw(light_shader)
-        neptune = glm.scale(neptune, glm.vec3(4,4,4))
-        neptune = glm.rotate(neptune, tempo/4, glm.vec3(0,0,1))
-        neptune = glm.translate(neptune, glm.vec3(0,0,0))
-        light_shader.set_mat4("model", neptune)
-        Orbita3.draw(light_shader)
-
-        # as órbitas (cor_shader)
-        cor_shader.use()
-        cor_shader.set_mat4("projection", projecao)
-        cor_shader.set_mat4("view", visualizacao)
-        
-        orbitaMercurio = glm.mat4(1.0)
-        orbitaMercurio = glm.translate(orbitaMercurio, glm.vec3(0,0,0))
-        orbitaMercurio = glm.scale(orbitaMercurio, glm.vec3(180,180,180))
-        cor_shader.set_mat4("model", orbitaMercurio)
-        Orbita.draw(cor_shader)
-
-        orbitaVenus = glm.mat4(1.0)
-        orbitaVenus = glm.translate(orbitaVenus, glm.vec3(0,0,0))
-        orbitaVenus = glm.scale(orbitaVenus, glm.vec3(350,350,350))
-        cor_shader.set_mat4("model", orbitaVenus)
-        Orbita.draw(cor_shader)
-
-        orbitaTerra = glm.mat4(1.0)
-        orbitaTerra = glm.translate(orbitaTerra, glm.vec3(0,0,0))
-        orbitaTerra = glm.scale(orbitaTerra, glm.vec3(450,450,450))
-        cor_shader.set_mat4("model", orbitaTerra)
-        Orbita.draw(cor_shader)
-
-        orbitaMarte = glm.mat4(1.0)
-        orbitaMarte = glm.translate(orbitaMarte, glm.vec3(0,0,0))
-        orbitaMarte = glm.scale(orbitaMarte, glm.vec3(655,655,655))
-        cor_shader.set_mat4("model", orbitaMarte)
-        Orbita.draw(cor_shader)
-
-        orbitaJupiter = glm.mat4(1.0)
-        orbitaJupiter = glm.translate(orbitaJupiter, glm.vec3(0,0,0))
-        orbitaJupiter = glm.scale(orbitaJupiter, glm.vec3(1350,1350,1350))
-        cor_shader.set_mat4("model", orbitaJupiter)
-        Orbita.draw(cor_shader)
-
-        orbitaSaturno = glm.mat4(1.0)
-        orbitaSaturno = glm.translate(orbitaSaturno, glm.vec3(0,0,0))
-        orbitaSaturno = glm.scale(orbitaSaturno, glm.vec3(2550,2550,2550))
-        cor_shader.set_mat4("model", orbitaSaturno)
-        Orbita.draw(cor_shader)
-
-        orbitaUrano = glm.mat4(1.0)
-        orbitaUrano = glm.translate(orbitaUrano, glm.vec3(0,0,0))
-        orbitaUrano = glm.scale(orbitaUrano, glm.vec3(3650,3650,3650))
-        cor_shader.set_mat4("model", orbitaUrano)
-        Orbita.draw(cor_shader)
-
-        orbitaNetuno = glm.mat4(1.0)
-        orbitaNetuno = glm.translate(orbitaNetuno, glm.vec3(0,0,0))
-        orbitaNetuno = glm.scale(orbitaNetuno, glm.vec3(5300,5300,5300))
-        cor_shader.set_mat4("model", orbitaNetuno)
-        Orbita.draw(cor_shader)
+        # Desenha cada vista com sua câmera e seu culling
+        glEnable(GL_SCISSOR_TEST)
+        for vista, fila, oclusao in zip(pacote.views, filas, oclusores):
+            x, y, w, h = vista.pixel_rect(largura, altura)
+            glViewport(x, y, w, h)
+            glScissor(x, y, w, h)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            desenha_vista(vista, estado, shaders, fila, vt_sistema, oclusao, h)
+            if skybox is not None:
+                skybox.draw(vista.projection, vista.view, w * h)
+            if estrelas is not None:
+                estrelas.draw(vista.projection, vista.view)
+            # Translúcidos por último, depois do fundo
+            if rastros is not None:
+                rastros.draw(vista.projection, vista.view, estado.tempo)
+        glDisable(GL_SCISSOR_TEST)
+
+        # Modelos pedidos pela thread de trabalho são carregados aqui (contexto OpenGL)
+        pendentes = {chave for vista in pacote.views for chave in vista.pending}
+        for chave in pendentes:
+            modelos[chave].load()
+        if pendentes:
+            cena.bind_models(modelos)
+        tempos_cpu["submissão"] += time.perf_counter() - inicio
+
+        # Feedback das texturas virtuais (vista principal): a leitura é assíncrona,
+        # então os tiles pedidos chegam ao atlas um ou dois passes depois
+        if vt_sistema is not None and numero_frame % VT_INTERVALO_FEEDBACK == 0:
+            principal = pacote.views[0]
+            desenhos = [
+                (estado.matrices[i], modelos[corpo.model], vt_sistema.by_model[corpo.model])
+                for i, corpo in enumerate(cena.bodies)
+                if principal.visible[i] and corpo.model in vt_sistema.by_model and modelos[corpo.model].loaded
+            ]
+            pedidos = vt_sistema.feedback_pass(vt_shader, principal.projection, principal.view,
+                                               desenhos, largura, altura)
+            vt_sistema.update(pedidos)
+            glViewport(0, 0, largura, altura)
+
+        # Agenda a leitura assíncrona do frame antes da troca de buffers
+        if captura is not None:
+            captura.capture(numero_frame, largura, altura)
+        numero_frame += 1
+        # Seleção contra o estado do frame desenhado
+        if selecao is not None:
+            selecao.update(estado)
+            if clique_pendente is not None:
+                janela = glfw.get_window_size(window)
+                vista = view_at(pacote.views, *clique_pendente, *janela)
+                acerto = selecao.pick(vista, *clique_pendente, *janela) if vista is not None else None
+                if acerto is not None:
+                    corpo = cena.bodies[acerto[0]]
+                    print(f"Selecionado: {corpo.name} (vista {vista.name}, distância {acerto[1]:.1f}, "
+                          f"raio {estado.radii[acerto[0]]:.2f})")
+                clique_pendente = None
+        pipeline.recycle(pacote)
 
         # Limpa a tela e troca os buffers
         glfw.swap_buffers(window)
         glfw.poll_events()
 
+        if numero_frame == 1:
+            logging.info(startup_profiler.report("Inicialização até o primeiro frame"))
+            memory_report.mark("primeiro frame")
+
+    # Finaliza o pipeline, captura, gravação e reprodução
+    pipeline.close()
+    print(pipeline.report())
+    if captura is not None:
+        captura.close()
+        print(captura.report())
+    if gravador is not None:
+        gravador.close()
+    if reprodutor is not None:
+        print(reprodutor.report())
+    if vt_sistema is not None:
+        print(vt_sistema.report())
+    if texture_stats.count:
+        print(texture_stats.report())
+    print(gpu_resources.report())
+    print(assets.report())
+    print(memory_report.report())
+    if selecao is not None:
+        print(selecao.report())
+    if skybox is not None:
+        print(skybox.report())
+        skybox.release()
+    if estrelas is not None:
+        print(estrelas.report())
+        estrelas.release()
+    if rastros is not None:
+        print(rastros.report())
+        rastros.release()
+    for vista, fila in zip(vistas, filas):
+        print(f"{vista.name}: {fila.report()}")
+    for vista, oclusao in zip(vistas, oclusores):
+        if oclusao is not None:
+            print(f"{vista.name}: {oclusao.report()}")
+            oclusao.release()
+
+    # Devolve os recursos de todos os modelos; o que sobrar no relatório é vazamento
+    for modelo in modelos.values():
+        modelo.release()
+    logging.info(gpu_resources.report())
+    if numero_frame:
+        print("CPU por frame: " + ", ".join(
+            f"{nome} {1000.0 * total / numero_frame:.3f} ms" for nome, total in tempos_cpu.items()))
+
     # Pede para a GLFW destruir a janela
     glfw.terminate()
 
 # Chama a função principal
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(parse_args())
\ No newline at end of file
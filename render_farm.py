@@ -0,0 +1,289 @@
+# Importando bibliotecas
+import os
+import sys
+import time
+import argparse
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from asserts.frame_files import CAPTURE_FORMATS, frame_path
+
+# Nada de OpenGL neste módulo: cada processo de trabalho escolhe a plataforma
+# (EGL sem janela) antes do primeiro import, no inicializador
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+FORMATOS = CAPTURE_FORMATS
+
+# Renderizador do processo de trabalho (um contexto OpenGL por processo)
+_renderizador = None
+
+
+def divide_blocos(frames: list[int], tamanho: int) -> list[list[int]]:
+    """
+    Divide os frames em blocos contíguos; blocos pequenos equilibram melhor
+    a carga entre os processos, blocos grandes amortizam o custo por tarefa.
+    """
+    return [frames[i:i + tamanho] for i in range(0, len(frames), tamanho)]
+
+
+class RenderizadorOffline:
+    """
+    Renderiza frames isolados de um caminho de câmera gravado, em um
+    contexto OpenGL sem janela. Cada frame depende apenas do seu número
+    (tempo = início + frame * passo), então os processos não se comunicam.
+    """
+
+    def __init__(self, gravacao: str, passo: float, largura: int, altura: int, skybox: bool = True):
+        """
+        :param gravacao: Arquivo de gravação com o caminho da câmera.
+        :param passo: Passo fixo de tempo entre frames.
+        :param largura: Largura dos frames.
+        :param altura: Altura dos frames.
+        :param skybox: Usa o fundo em cubemap no lugar da esfera de estrelas.
+        """
+        from asserts.headless import HeadlessContext
+        self.contexto = HeadlessContext(largura, altura)
+
+        from OpenGL.GL import glEnable, GL_DEPTH_TEST
+        import main as app
+        from asserts.camera import Camera
+        from asserts.recorder import InputReplayer
+        from asserts.scene import solar_system
+        from asserts.viewport import Viewport
+        from asserts.render_queue import RenderQueue
+        from asserts.pipeline import FramePipeline
+        from asserts.shader import Shader
+        from asserts.shader_cache import shader_cache
+        from asserts.skybox import Skybox
+
+        self.app = app
+        self.largura = largura
+        self.altura = altura
+        self.passo = passo
+        glEnable(GL_DEPTH_TEST)
+
+        self.shaders = app.cria_shaders()
+        self.modelos = app.cria_modelos()
+        self.cena = solar_system(background=not skybox)
+        self.cena.bind_models(self.modelos)
+        self.camera = Camera()
+        self.vista = Viewport(self.camera)
+        self.skybox = None
+        if skybox:
+            self.skybox = Skybox(app.IMAGEM_ESTRELAS,
+                                 Shader("asserts/shaders/skybox.vert", "asserts/shaders/skybox.frag"))
+            self.vista.far = app.PLANO_DISTANTE_SKYBOX
+        shader_cache.release_stages()
+        self.fila = RenderQueue()
+        self.reprodutor = InputReplayer(gravacao, passo)
+        self.pipeline = FramePipeline(
+            self.cena, [self.vista],
+            lambda vista, estado, indice, pode_carregar: app.prepara_vista(
+                vista, estado, self.modelos, self.shaders, self.fila, pode_carregar),
+            threaded=False)
+
+    def render(self, frame: int):
+        """
+        Renderiza um frame.
+
+        :return: Pixels RGBA (altura, largura, 4), de cima para baixo.
+        """
+        from OpenGL.GL import (glViewport, glClearColor, glClear, glFinish,
+                               GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT)
+
+        relativo = frame * self.passo
+        self.camera.Position, self.camera.Yaw, self.camera.Pitch, self.camera.Zoom = \
+            self.reprodutor.state_at(relativo)
+        self.camera.update_camera_vectors()
+        tempo = float(self.reprodutor.frames["tempo"][0]) + relativo
+
+        pacote = self.pipeline.advance(tempo, self.camera, self.largura, self.altura)
+        glViewport(0, 0, self.largura, self.altura)
+        glClearColor(1.0, 1.0, 1.0, 1.0)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        for vista in pacote.views:
+            self.app.desenha_vista(vista, pacote.state, self.shaders, self.fila)
+            if self.skybox is not None:
+                self.skybox.draw(vista.projection, vista.view, self.largura * self.altura)
+        self.pipeline.recycle(pacote)
+        glFinish()
+        return self.contexto.read_pixels()
+
+    def release(self):
+        """Devolve os recursos e destrói o contexto."""
+        if self.skybox is not None:
+            self.skybox.release()
+        for modelo in self.modelos.values():
+            modelo.release()
+        self.contexto.release()
+
+
+def _inicia_processo(gravacao: str, passo: float, largura: int, altura: int, skybox: bool,
+                     pacote: str = ""):
+    """Inicializador de cada processo de trabalho: contexto, shaders e cena."""
+    global _renderizador
+    os.chdir(RAIZ)
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
+    from asserts.headless import configure_headless_environment
+    configure_headless_environment()
+    if pacote:
+        # O mmap do pacote é compartilhado pelos processos através do cache de páginas
+        from asserts.asset_pack import assets
+        assets.open(pacote)
+    _renderizador = RenderizadorOffline(gravacao, passo, largura, altura, skybox)
+
+
+def _aquece_caches(skybox: bool):
+    """
+    Gera no processo principal os caches em disco que não dependem do
+    contexto OpenGL (o cubemap do fundo), para que os processos de trabalho
+    não façam o mesmo trabalho ao mesmo tempo. Os binários de shader
+    precisam de um contexto e são gravados pelos processos com renomeação
+    atômica.
+    """
+    if not skybox:
+        return
+    diretorio = os.getcwd()
+    os.chdir(RAIZ)
+    try:
+        from asserts.headless import configure_headless_environment
+        configure_headless_environment()
+        from asserts.skybox import bake_cubemap
+        import main as app
+        bake_cubemap(app.IMAGEM_ESTRELAS)
+    finally:
+        os.chdir(diretorio)
+
+
+def _grava_frame(pixels, caminho: str, formato: str):
+    """
+    Grava o frame em um arquivo temporário e renomeia no final: uma
+    interrupção nunca deixa um frame pela metade com o nome definitivo.
+    """
+    temporario = caminho + ".tmp"
+    if formato == "png":
+        from PIL import Image
+        Image.fromarray(pixels, "RGBA").save(temporario, format="PNG", compress_level=1)
+    else:
+        with open(temporario, "wb") as file:
+            file.write(pixels.tobytes())
+    os.replace(temporario, caminho)
+
+
+def _renderiza_bloco(frames: list[int], saida: str, formato: str) -> tuple[int, int, float, float]:
+    """
+    Executada nos processos de trabalho: renderiza e grava um bloco de frames.
+
+    :return: PID, frames gravados, tempo de renderização e tempo de gravação.
+    """
+    renderizacao = gravacao = 0.0
+    gravados = 0
+    for frame in frames:
+        caminho = frame_path(saida, frame, formato)
+        if os.path.exists(caminho):
+            continue
+        inicio = time.perf_counter()
+        pixels = _renderizador.render(frame)
+        meio = time.perf_counter()
+        _grava_frame(pixels, caminho, formato)
+        renderizacao += meio - inicio
+        gravacao += time.perf_counter() - meio
+        gravados += 1
+    return os.getpid(), gravados, renderizacao, gravacao
+
+
+def renderiza_sequencia(gravacao: str, saida: str, frames: list[int], largura: int, altura: int,
+                        passo: float, processos: int, bloco: int, formato: str = "png",
+                        skybox: bool = True, pacote: str = "") -> str:
+    """
+    Renderiza os frames pedidos em vários processos, pulando os que já
+    existem em disco (retomada após interrupção).
+
+    :return: Relatório com o FPS agregado e por processo.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}")
+    os.makedirs(saida, exist_ok=True)
+    faltando = [f for f in frames if not os.path.exists(frame_path(saida, f, formato))]
+    existentes = len(frames) - len(faltando)
+    if existentes:
+        logging.info("Retomando: %d de %d frames já estão em %s", existentes, len(frames), saida)
+    if not faltando:
+        return f"Render farm: nenhum frame a renderizar ({existentes} já existentes)"
+
+    # Processos novos (spawn): o contexto EGL e o estado do OpenGL não sobrevivem a um fork
+    processos = max(1, min(processos, len(faltando)))
+    _aquece_caches(skybox)
+    blocos = divide_blocos(faltando, bloco)
+    por_processo = {}
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(processos, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_inicia_processo,
+                             initargs=(os.path.abspath(gravacao), passo, largura, altura, skybox,
+                                       os.path.abspath(pacote) if pacote else "")) as pool:
+        tarefas = [pool.submit(_renderiza_bloco, b, os.path.abspath(saida), formato) for b in blocos]
+        concluidos = 0
+        for tarefa in as_completed(tarefas):
+            pid, gravados, renderizacao, escrita = tarefa.result()
+            total = por_processo.setdefault(pid, [0, 0.0, 0.0])
+            total[0] += gravados
+            total[1] += renderizacao
+            total[2] += escrita
+            concluidos += gravados
+            logging.info("%d/%d frames", concluidos, len(faltando))
+    decorrido = time.perf_counter() - inicio
+
+    gravados = sum(t[0] for t in por_processo.values())
+    linhas = [f"Render farm: {gravados} frames {largura}x{altura} em {decorrido:.2f} s com "
+              f"{processos} processos ({gravados / decorrido:.2f} FPS agregado, incluindo a "
+              f"inicialização dos contextos), {existentes} já existentes"]
+    for pid, (n, renderizacao, escrita) in sorted(por_processo.items()):
+        fps = n / (renderizacao + escrita) if n else 0.0
+        linhas.append(f"  processo {pid}: {n} frames, {fps:.2f} FPS "
+                      f"(render {1000.0 * renderizacao / max(n, 1):.1f} ms, "
+                      f"gravação {1000.0 * escrita / max(n, 1):.1f} ms por frame)")
+    return "\n".join(linhas)
+
+
+def parse_args():
+    """
+    Lê os argumentos de linha de comando.
+    """
+    parser = argparse.ArgumentParser(description="Renderização offline de uma sequência de frames em vários processos")
+    parser.add_argument("recording", help="gravação de entradas (--record) com o caminho da câmera")
+    parser.add_argument("--output", default="frames", help="diretório de saída dos frames")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--fixed-dt", type=float, default=1.0 / 60.0,
+                        help="passo de tempo entre frames, em segundos")
+    parser.add_argument("--start", type=int, default=0, help="primeiro frame")
+    parser.add_argument("--end", type=int, default=None,
+                        help="último frame, exclusivo (padrão: fim da gravação)")
+    parser.add_argument("--chunk", type=int, default=8, help="frames por tarefa")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processos de renderização")
+    parser.add_argument("--format", choices=FORMATOS, default="png")
+    parser.add_argument("--asset-pack", metavar="ARQUIVO", default=os.environ.get("SOLAR_SYSTEM_ASSET_PACK", ""),
+                        help="lê modelos, texturas e shaders do pacote gerado por build_asset_pack.py")
+    parser.add_argument("--skybox", action=argparse.BooleanOptionalAction, default=True,
+                        help="fundo de estrelas em cubemap (--no-skybox usa a esfera antiga)")
+    return parser.parse_args()
+
+
+def main(args):
+    from asserts.recorder import read_recording
+    _, frames_gravados = read_recording(args.recording)
+    if len(frames_gravados) == 0:
+        raise ValueError(f"Gravação sem frames: {args.recording}")
+    duracao = float(frames_gravados["tempo"][-1] - frames_gravados["tempo"][0])
+    fim = args.end if args.end is not None else int(duracao / args.fixed_dt) + 1
+
+    print(renderiza_sequencia(args.recording, args.output, list(range(args.start, fim)),
+                              args.width, args.height, args.fixed_dt, args.workers, args.chunk,
+                              args.format, args.skybox, args.asset_pack))
+
+
+# Chama a função principal
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(parse_args())